@@ -0,0 +1,136 @@
+"""
+Benchmark `config_options()`/`configure()` of the boost recipe with every module enabled.
+
+The transitive closures of the modules are read from `dependencies-<version>.yml`, where
+`rebuild-dependencies.py` stores them, instead of being computed by iterating over the whole
+`dependencies` map until nothing changes. Both ways are timed, on a compiler old enough for
+the recipe to disable the modules requiring C++11 and those depending on them, along with the
+lookups of `package_info()`, and must give the very same options and closures.
+
+Runs the recipe with the Conan 1 client classes.
+
+    PYTHONPATH=. python -m linter.benchmarks.boost_dependencies
+"""
+
+import argparse
+import glob
+import io
+import os
+import re
+import time
+import yaml
+
+from conans.client.conf import get_default_settings_yml
+from conans.client.loader import _parse_conanfile
+from conans.client.output import ConanOutput
+from conans.model.env_info import EnvValues
+from conans.model.options import OptionsValues
+from conans.model.settings import Settings
+
+RECIPE_FOLDER = os.path.join("recipes", "boost", "all")
+
+
+def _fixed_point_dependent_modules(self, name):
+    """ The former implementation of `_all_dependent_modules` """
+    dependencies = {name}
+    while True:
+        new_dependencies = set()
+        for dependency in dependencies:
+            new_dependencies.update(set(self._dependencies["dependencies"][dependency]))
+            new_dependencies.update(dependencies)
+        if len(new_dependencies) > len(dependencies):
+            dependencies = new_dependencies
+        else:
+            break
+    return dependencies
+
+
+def _fixed_point_super_modules(self, name):
+    """ The former implementation of `_all_super_modules` """
+    dependencies = {name}
+    while True:
+        new_dependencies = set(dependencies)
+        for module in self._dependencies["dependencies"]:
+            if dependencies.intersection(set(self._dependencies["dependencies"][module])):
+                new_dependencies.add(module)
+        if len(new_dependencies) > len(dependencies):
+            dependencies = new_dependencies
+        else:
+            break
+    return dependencies
+
+
+def configured(conanfile_class, version, dependencies, settings):
+    """
+    Configure a recipe instance of `version` with every module enabled:
+    (options, closures, seconds spent in the recipe methods)
+    """
+    conanfile = conanfile_class(ConanOutput(io.StringIO()), None, f"boost/{version}")
+    conanfile.version = version
+    conanfile.recipe_folder = RECIPE_FOLDER
+    # Read once: the YAML parsing is not what is measured
+    conanfile._cached_dependencies = dependencies
+    conanfile.initialize(settings.copy(), EnvValues())
+    options = {f"without_{module}": False for module in dependencies["configure_options"]}
+    # Given, so that configure() does not run python to find its version
+    options.update(python_version="3.11", python_executable="/usr/bin/python3")
+    conanfile.options.initialize_upstream(OptionsValues(options), name="boost")
+    start = time.perf_counter()
+    conanfile.config_options()
+    conanfile.configure()
+    # As package_info() does for every module
+    closures = {module: conanfile._all_dependent_modules(module) for module in dependencies["dependencies"]}
+    elapsed = time.perf_counter() - start
+    return conanfile.options.values.dumps(), closures, elapsed
+
+
+def run(conanfile_class, versions, iterations):
+    """ ({version: (options, closures)}, seconds per iteration over all the versions) """
+    # A compiler old enough for the recipe to disable math, wave, locale and what depends on them
+    settings = Settings.loads(get_default_settings_yml())
+    settings.os = "Linux"
+    settings.arch = "x86_64"
+    settings.compiler = "gcc"
+    settings.compiler.version = "4.9"
+    settings.compiler.libcxx = "libstdc++11"
+    settings.build_type = "Release"
+    results = {}
+    total = 0
+    for _ in range(iterations):
+        for version, dependencies in versions.items():
+            options, closures, elapsed = configured(conanfile_class, version, dependencies, settings)
+            results[version] = options, closures
+            total += elapsed
+    return results, total / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    versions = {}
+    for path in sorted(glob.glob(os.path.join(RECIPE_FOLDER, "dependencies", "dependencies-*.yml"))):
+        with open(path, encoding="utf-8") as f:
+            versions[re.search(r"dependencies-(.*)\.yml", path).group(1)] = yaml.safe_load(f)
+
+    module, _ = _parse_conanfile(os.path.abspath(os.path.join(RECIPE_FOLDER, "conanfile.py")))
+    conanfile_class = module.BoostConan
+    precomputed, precomputed_time = run(conanfile_class, versions, args.iterations)
+
+    conanfile_class._all_dependent_modules = _fixed_point_dependent_modules
+    conanfile_class._all_super_modules = _fixed_point_super_modules
+    fixed_point, fixed_point_time = run(conanfile_class, versions, args.iterations)
+
+    different = [version for version in versions if precomputed[version] != fixed_point[version]]
+    print(f"{len(versions)} versions, {args.iterations} iterations")
+    print(f"fixed point:  {fixed_point_time * 1000:.1f} ms")
+    print(f"precomputed:  {precomputed_time * 1000:.1f} ms ({fixed_point_time / precomputed_time:.1f}x)")
+    if different:
+        print(f"different options or closures: {', '.join(different)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
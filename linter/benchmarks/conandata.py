@@ -0,0 +1,58 @@
+"""
+Benchmark the libyaml fast path of `linter/conandata_yaml_linter.py` against strictyaml alone.
+
+Every file is validated both ways, which must produce the very same annotations.
+
+    PYTHONPATH=. python -m linter.benchmarks.conandata
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# The YAML linters are scripts importing their siblings, not modules of the `linter` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import conandata_yaml_linter  # noqa: E402
+
+
+def run(paths, fast_path):
+    annotations = {}
+    times = {}
+    for path in paths:
+        start = time.perf_counter()
+        annotations[path] = conandata_yaml_linter.validate(path, fast_path=fast_path)
+        times[path] = time.perf_counter() - start
+    return annotations, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", default="recipes/*/*/conandata.yml", help="(default: %(default)s)")
+    parser.add_argument("--slowest", type=int, default=5, help="list the N slowest files with strictyaml (default: %(default)s)")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.files))
+    strict, strict_times = run(paths, fast_path=False)
+    fast, fast_times = run(paths, fast_path=True)
+    mismatches = [path for path in paths if strict[path] != fast[path]]
+    if mismatches:
+        raise SystemExit(f"Annotations differ for: {', '.join(mismatches)}")
+
+    clean = [path for path in paths if not fast[path]]
+    strict_total, fast_total = sum(strict_times.values()), sum(fast_times.values())
+    strict_clean, fast_clean = sum(strict_times[p] for p in clean), sum(fast_times[p] for p in clean)
+    print(f"{len(paths)} files, {len(paths) - len(clean)} with annotations (always validated with strictyaml)")
+    print(f"all files,        strictyaml only: {strict_total:7.2f} s, two-tier: {fast_total:7.2f} s"
+          f" ({strict_total / fast_total:.1f}x faster)")
+    print(f"files w/o annotations, strictyaml: {strict_clean:7.2f} s, two-tier: {fast_clean:7.2f} s"
+          f" ({strict_clean / fast_clean:.1f}x faster)")
+    print("Slowest files with strictyaml:")
+    for path in sorted(paths, key=strict_times.get, reverse=True)[:args.slowest]:
+        print(f"  {path}: {strict_times[path] * 1000:7.1f} ms -> {fast_times[path] * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
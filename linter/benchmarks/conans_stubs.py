@@ -0,0 +1,66 @@
+"""
+Benchmark the startup cost of `linter.transform_conanfile` with and without the pre-built Conan stubs.
+
+Each sample runs in a fresh interpreter, as a lint process would: it builds the
+`conans.model.conan_file` module (which applies the ConanFile transform) and,
+unless --no-pylint is given, lints a recipe end to end with pylint.
+
+    PYTHONPATH=. python -m linter.benchmarks.conans_stubs --samples 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from linter import conans_stubs
+
+
+TRANSFORM = """
+import time
+start = time.perf_counter()
+import astroid
+import linter.transform_conanfile
+astroid.MANAGER.ast_from_module_name("conans.model.conan_file").lookup("ConanFile")
+print(time.perf_counter() - start)
+"""
+
+
+def sample_transform(env):
+    output = subprocess.run([sys.executable, "-c", TRANSFORM], env=env, check=True, capture_output=True, text=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def sample_pylint(env, rcfile, recipe):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "pylint", f"--rcfile={rcfile}", recipe], env=env, capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5, help="fresh processes per measurement (default: %(default)s)")
+    parser.add_argument("--rcfile", default="linter/pylintrc_recipe", help="(default: %(default)s)")
+    parser.add_argument("--recipe", default="recipes/zlib/all/conanfile.py", help="recipe to lint (default: %(default)s)")
+    parser.add_argument("--no-pylint", action="store_true", help="only measure the ConanFile transform")
+    args = parser.parse_args()
+
+    print(f"Stub module: {conans_stubs.build()}")
+    stubs = dict(os.environ, CCI_LINTER_NO_STUBS="0")
+    live = dict(os.environ, CCI_LINTER_NO_STUBS="1")
+
+    measurements = [("ConanFile transform", sample_transform, ())]
+    if not args.no_pylint:
+        measurements.append((f"pylint {args.recipe}", sample_pylint, (args.rcfile, args.recipe)))
+    for name, sample, extra in measurements:
+        live_time = statistics.median(sample(live, *extra) for _ in range(args.samples))
+        stub_time = statistics.median(sample(stubs, *extra) for _ in range(args.samples))
+        print(f"{name}")
+        print(f"  live inference: {live_time * 1000:8.1f} ms")
+        print(f"  stub module:    {stub_time * 1000:8.1f} ms ({live_time - stub_time:+.3f} s saved)")
+
+
+if __name__ == "__main__":
+    main()
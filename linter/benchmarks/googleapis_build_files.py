@@ -0,0 +1,107 @@
+"""
+Benchmark the extraction of the proto libraries of a googleapis checkout by the googleapis recipe.
+
+The recipe reads the `proto_library`/`cc_proto_library` rules of every BUILD.bazel file under
+`google/` and `grafeas/`, then validates their sources and dependencies. `helpers.py` tokenizes
+each file once, validates the dependencies against a set and the sources against the files found
+while looking for the BUILD.bazel files, and keeps the parsed rules in a JSON file of the build
+folder, keyed by the sha256 of each file, for `package()` to reuse them in another process.
+
+The recipe of a git revision (`--base`, default HEAD~), with its former line-by-line parser, is
+timed against the current one without its cache file (`build()`), then with it (`package()`).
+Both must give the very same proto libraries.
+
+    PYTHONPATH=. python -m linter.benchmarks.googleapis_build_files --source ~/src/googleapis --base origin/master
+"""
+
+import argparse
+import glob
+import importlib.util
+import os
+import subprocess
+import tempfile
+import time
+
+HELPERS = os.path.join("recipes", "googleapis", "all", "helpers.py")
+
+
+def _load_helpers(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _error(message):
+    print(f"ERROR: {message}")
+
+
+def former_proto_libraries(helpers, source_folder):
+    """ What the recipe did before: glob, parse line by line, validate against a list and os.path.exists() """
+    libraries = []
+    for folder in ("google", "grafeas"):
+        for filename in glob.iglob(os.path.join(source_folder, folder, "**", "BUILD.bazel"), recursive=True):
+            libraries += helpers.parse_proto_libraries(filename, source_folder, _error)
+    all_deps = [f"{it.qname}:{it.name}" for it in libraries]
+    all_deps += ["protobuf::libprotobuf"]
+    for it in libraries:
+        it.validate(source_folder, all_deps)
+    return libraries
+
+
+def proto_libraries(helpers, source_folder, cache_file):
+    """ What the recipe does now, with the parsed rules cached in `cache_file` """
+    cache = helpers.BuildFileCache(cache_file)
+    build_files, source_files = helpers.find_build_files(source_folder, ["google", "grafeas"])
+    libraries = []
+    for filename in build_files:
+        libraries += helpers.parse_proto_libraries(filename, source_folder, _error, cache)
+    cache.save()
+    all_deps = {f"{it.qname}:{it.name}" for it in libraries}
+    all_deps.add("protobuf::libprotobuf")
+    for it in libraries:
+        it.validate(source_folder, all_deps, source_files)
+    return libraries
+
+
+def _comparable(libraries):
+    return [(it.qname, it.name, it.srcs, sorted(it.deps), it.is_cc) for it in libraries]
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", required=True, help="googleapis checkout, or extracted source archive")
+    parser.add_argument("--base", default="HEAD~", help="git revision of the former recipe (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_helpers = os.path.join(tmp, "base_helpers.py")
+        with open(base_helpers, "wb") as f:
+            f.write(subprocess.run(["git", "show", f"{args.base}:{HELPERS}"], check=True, capture_output=True).stdout)
+        former, former_time = _timed(former_proto_libraries, _load_helpers(base_helpers, "base_helpers"), args.source)
+
+        helpers = _load_helpers(HELPERS, "helpers")
+        cache_file = os.path.join(tmp, "proto_libraries.json")
+        cold, cold_time = _timed(proto_libraries, helpers, args.source, cache_file)
+        warm, warm_time = _timed(proto_libraries, helpers, args.source, cache_file)
+
+    build_files = sum(1 for folder in ("google", "grafeas")
+                      for _ in glob.iglob(os.path.join(args.source, folder, "**", "BUILD.bazel"), recursive=True))
+    print(f"{build_files} BUILD.bazel files, {len(cold)} proto libraries")
+    print(f"{args.base}: {former_time * 1000:.1f} ms")
+    print(f"without cache: {cold_time * 1000:.1f} ms ({former_time / cold_time:.1f}x)")
+    print(f"with cache:    {warm_time * 1000:.1f} ms ({former_time / warm_time:.1f}x)")
+    if not _comparable(former) == _comparable(cold) == _comparable(warm):
+        print("different proto libraries")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark `linter.check_imports.ImportAnalysis` against the per-message import checkers it replaced.
+
+Every recipe and test_package conanfile is parsed once with astroid, then each
+implementation visits all the `ImportFrom` nodes of every file. Both must
+report the very same messages.
+
+    PYTHONPATH=. python -m linter.benchmarks.import_checker --repeat 5
+"""
+
+import argparse
+import glob
+import re
+import time
+
+import astroid
+from astroid import nodes
+from pylint.lint import PyLinter
+
+from linter.check_imports import ImportAnalysis
+
+
+def legacy_visitors(add_message):
+    """ The visit_importfrom methods of ImportConanFile, ImportErrors*, and ImportTools, in registration order """
+
+    def import_conanfile(node):
+        basename = node.modname
+        if basename == 'conans':
+            names = [name for name, _ in node.names]
+            if 'ConanFile' in names:
+                add_message("conan-import-conanfile", node=node)
+
+    def import_errors(node):
+        basename = node.modname
+        if basename == 'conans':
+            names = [name for name, _ in node.names]
+            if 'errors' in names:
+                add_message("conan-import-errors", node=node)
+
+    def import_errors_conanexception(node):
+        basename = node.modname
+        if basename == 'conans.errors':
+            names = [name for name, _ in node.names]
+            if 'ConanException' in names:
+                add_message("conan-import-error-conanexception", node=node)
+
+    def import_errors_conaninvalidconfiguration(node):
+        basename = node.modname
+        if basename == 'conans.errors':
+            names = [name for name, _ in node.names]
+            if 'ConanInvalidConfiguration' in names:
+                add_message("conan-import-error-conaninvalidconfiguration", node=node)
+
+    def import_tools(node):
+        basename = node.modname
+        names = [name for name, _ in node.names]
+        if basename == 'conan' and 'tools' in names:
+            add_message("conan-import-tools", node=node)
+        elif re.match(r'conan\.tools\.[^.]+\..+', basename):
+            add_message("conan-import-tools", node=node)
+
+    return [import_conanfile, import_errors, import_errors_conanexception,
+            import_errors_conaninvalidconfiguration, import_tools]
+
+
+def collect_imports(pattern):
+    files = {}
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        try:
+            module = astroid.MANAGER.ast_from_file(path, source=True)
+        except astroid.AstroidBuildingError:
+            continue
+        files[path] = list(module.nodes_of_class(nodes.ImportFrom))
+        # Every recipe is named `conanfile`, keep the cache from returning the previous tree
+        astroid.MANAGER.astroid_cache.pop(module.name, None)
+    return files
+
+
+def run(files, visitors):
+    start = time.perf_counter()
+    for imports in files.values():
+        for node in imports:
+            for visit in visitors:
+                visit(node)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", default="recipes/*/*/**/conanfile.py", help="glob of files to visit (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="best of N runs (default: %(default)s)")
+    args = parser.parse_args()
+
+    files = collect_imports(args.files)
+    count = sum(len(imports) for imports in files.values())
+    print(f"{len(files)} files, {count} `from ... import` statements")
+
+    legacy_messages, fused_messages = [], []
+    legacy = legacy_visitors(lambda symbol, node: legacy_messages.append((node.root().file, node.lineno, symbol)))
+    checker = ImportAnalysis(PyLinter())
+    checker.add_message = lambda symbol, node: fused_messages.append((node.root().file, node.lineno, symbol))
+
+    legacy_time = min(run(files, legacy) for _ in range(args.repeat))
+    fused_time = min(run(files, [checker.visit_importfrom]) for _ in range(args.repeat))
+    if sorted(set(legacy_messages)) != sorted(set(fused_messages)):
+        raise SystemExit("Both implementations must report the same messages")
+
+    for name, elapsed in (("legacy (5 visitors)", legacy_time), ("fused (1 visitor)", fused_time)):
+        print(f"{name:>20}: {elapsed * 1000:8.2f} ms total, {elapsed / len(files) * 1e6:7.2f} us/file")
+    print(f"{'reduction':>20}: {100.0 * (1 - fused_time / legacy_time):.1f}% ({len(set(fused_messages))} messages)")
+
+
+if __name__ == "__main__":
+    main()
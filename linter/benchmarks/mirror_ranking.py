@@ -0,0 +1,109 @@
+"""
+Benchmark the mirror ranking of `linter/mirror_ranking.py` against local stand-in mirrors.
+
+Four HTTP servers on 127.0.0.1 play a dead mirror (never answers before the timeout), a failing
+one (503), a slow one and a fast one, listed in that order. The same archive is fetched several
+times, in list order like Conan does, then in the order ranked from the history of the previous
+fetches, and finally after probing every mirror once.
+
+    PYTHONPATH=. python -m linter.benchmarks.mirror_ranking
+"""
+
+import argparse
+import hashlib
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# The YAML linters are scripts importing their siblings, not modules of the `linter` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mirror_ranking  # noqa: E402
+
+CONTENT = os.urandom(256 * 1024)
+
+
+def mirror(behaviour, delay):
+    """ A threaded HTTP server behaving like a mirror which is dead, failing, slow or fast """
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if behaviour == "dead":
+                time.sleep(delay)
+                return
+            if behaviour == "failing":
+                self.send_error(503)
+                return
+            if behaviour == "slow":
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(CONTENT)))
+            self.end_headers()
+            self.wfile.write(CONTENT)
+
+        do_HEAD = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(urls, history, fetches, timeout, directory):
+    """ Seconds spent by each fetch """
+    times = []
+    for i in range(fetches):
+        start = time.perf_counter()
+        url = mirror_ranking.fetch(history, urls, os.path.join(directory, str(i)), hashlib.sha256(CONTENT).hexdigest(),
+                                   timeout)
+        assert url is not None
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fetches", type=int, default=10, help="(default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="(default: %(default)s)")
+    parser.add_argument("--slow", type=float, default=0.3, help="latency of the slow mirror (default: %(default)s)")
+    args = parser.parse_args()
+
+    servers = [mirror(behaviour, args.timeout * 2 if behaviour == "dead" else args.slow)
+               for behaviour in ("dead", "failing", "slow", "fast")]
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/archive.tar.gz" for server in servers]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_path = os.path.join(tmp, "history.json")
+        # No history kept between fetches: every fetch tries the URLs in list order
+        list_order = [run(urls, mirror_ranking.HostHistory(history_path), 1, args.timeout, tmp)[0]
+                      for _ in range(args.fetches)]
+        history = mirror_ranking.HostHistory(history_path)
+        ranked = run(urls, history, args.fetches, args.timeout, tmp)
+        probed_history = mirror_ranking.HostHistory(os.path.join(tmp, "probed.json"))
+        start = time.perf_counter()
+        mirror_ranking.probe_all(probed_history, urls, args.timeout)
+        probing = time.perf_counter() - start
+        probed = run(urls, probed_history, args.fetches, args.timeout, tmp)
+
+    for server in servers:
+        server.shutdown()
+    print(f"{args.fetches} fetches, mirrors listed as dead, failing, slow ({args.slow} s), fast;"
+          f" timeout {args.timeout} s")
+    print(f"list order: {sum(list_order):6.2f} s, {sum(list_order) / len(list_order):5.2f} s per fetch")
+    print(f"ranked:     {sum(ranked):6.2f} s, {sum(ranked) / len(ranked):5.2f} s per fetch"
+          f" (first {ranked[0]:.2f} s, last {ranked[-1]:.3f} s)")
+    print(f"probed:     {sum(probed):6.2f} s, {sum(probed) / len(probed):5.2f} s per fetch"
+          f" (after probing the mirrors in {probing:.2f} s)")
+    names = dict(zip(urls, ("dead", "failing", "slow", "fast")))
+    print("Order learnt from fetches:", ", ".join(names[url] for url in history.rank(urls, args.timeout)))
+    print("Order learnt from probes: ", ", ".join(names[url] for url in probed_history.rank(urls, args.timeout)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark `configure()` + `validate()` + `package_info()` of the opencv/4.x recipe.
+
+The modules of OpenCV and their internal dependency graph are a static table, OPENCV_MODULES,
+whose version of each recipe version is built once, along with the order of its modules resolving
+the mandatory options, and shared by the instances of the recipe. It is only evaluated, once per
+instance, for the final options in `package_info()`: `configure()` and `validate()` walk the static
+graph. Every version of opencv/4.x is instantiated `--instances` times with several sets of options
+and settings. With `--base`, the recipe of another git revision, like one still building the module
+dictionary every time it is accessed, is timed too and must give the very same options and components.
+
+Runs the recipe with the Conan 1 client classes.
+
+    PYTHONPATH=. python -m linter.benchmarks.opencv_modules --base origin/master
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import tempfile
+import time
+import yaml
+
+from conans.client.conf import get_default_settings_yml
+from conans.client.loader import _parse_conanfile
+from conans.client.output import ConanOutput
+from conans.model.build_info import CppInfo
+from conans.model.env_info import EnvValues
+from conans.model.options import OptionsValues
+from conans.model.settings import Settings
+
+RECIPE = os.path.join("recipes", "opencv")
+FOLDER = "4.x"
+
+# name: (settings, options)
+CONFIGURATIONS = {
+    "default": ({}, {}),
+    "shared": ({}, {"shared": True}),
+    "contrib": ({}, {"contrib": True}),
+    "world": ({}, {"contrib": True, "world": True}),
+    "cuda": ({}, {"with_cuda": True, "cudaarithm": True, "cudaoptflow": True, "cudacodec": True,
+                  "superres": True, "videostab": True}),
+    "sfm": ({}, {"sfm": True, "with_ipp": "opencv-icv"}),
+    # Modules requested with their mandatory options, or theirs, disabled
+    "mandatory": ({}, {"imgproc": False, "calib3d": False, "video": False, "stitching": True, "optflow": True,
+                       "tracking": True, "stereo": True}),
+    "macos": ({"os": "Macos", "compiler": "apple-clang", "compiler.version": "14", "compiler.libcxx": "libc++"},
+              {"with_opencl": True}),
+    "windows": ({"os": "Windows", "compiler": "msvc", "compiler.version": "193", "compiler.runtime": "dynamic"},
+                {"gapi": True}),
+}
+
+
+def _checkout(revision, destination):
+    """ The conanfile.py of the opencv/4.x folder at a git revision, written in `destination` """
+    os.makedirs(os.path.join(destination, FOLDER))
+    content = subprocess.run(["git", "show", f"{revision}:{RECIPE}/{FOLDER}/conanfile.py"], check=True,
+                             capture_output=True).stdout
+    with open(os.path.join(destination, FOLDER, "conanfile.py"), "wb") as f:
+        f.write(content)
+
+
+def _settings(values):
+    settings = Settings.loads(get_default_settings_yml())
+    settings.os = "Linux"
+    settings.arch = "x86_64"
+    settings.compiler = "gcc"
+    settings.compiler.version = "12"
+    settings.compiler.libcxx = "libstdc++11"
+    settings.build_type = "Release"
+    for name, value in values.items():
+        setting = settings
+        *parents, name = name.split(".")
+        for parent in parents:
+            setting = getattr(setting, parent)
+        setattr(setting, name, value)
+    return settings
+
+
+def _components(cpp_info):
+    """ The components of a cpp_info, comparable whatever the order of the sets they were built from """
+    return {
+        name: (sorted(component.requires), sorted(component.system_libs), sorted(component.frameworks),
+               component.libs, component.get_property("cmake_target_name"))
+        for name, component in cpp_info.components.items()
+    }
+
+
+def run(recipe_root, versions, instances):
+    """ ({(configuration, version): (options, components)}, seconds) of instantiating every version `instances` times """
+    recipe_folder = os.path.join(recipe_root, FOLDER)
+    module, _ = _parse_conanfile(os.path.abspath(os.path.join(recipe_folder, "conanfile.py")))
+    results = {}
+    elapsed = 0
+    for configuration, (settings, options) in CONFIGURATIONS.items():
+        settings = _settings(settings)
+        for version in versions:
+            for _ in range(instances):
+                conanfile = module.OpenCVConan(ConanOutput(io.StringIO()), None, f"opencv/{version}")
+                conanfile.version = version
+                conanfile.recipe_folder = recipe_folder
+                conanfile.initialize(settings.copy(), EnvValues())
+                conanfile.options.initialize_upstream(OptionsValues(options), name="opencv")
+                conanfile.cpp_info = CppInfo("opencv", None)
+                start = time.perf_counter()
+                conanfile.config_options()
+                conanfile.configure()
+                conanfile.validate()
+                conanfile.package_info()
+                elapsed += time.perf_counter() - start
+            results[configuration, version] = (conanfile.options.values.dumps(), _components(conanfile.cpp_info))
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=10, help="instances of every version (default: 10)")
+    parser.add_argument("--base", help="git revision whose recipe is compared to the current one")
+    args = parser.parse_args()
+
+    with open(os.path.join(RECIPE, "config.yml"), encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    versions = [str(version) for version, entry in config["versions"].items() if entry["folder"] == FOLDER]
+
+    current, current_time = run(RECIPE, versions, args.instances)
+    print(f"{len(CONFIGURATIONS)} configurations x {len(versions)} versions x {args.instances} instances:"
+          f" {current_time * 1000:.1f} ms")
+    if not args.base:
+        return 0
+
+    with tempfile.TemporaryDirectory() as base_root:
+        _checkout(args.base, base_root)
+        base, base_time = run(base_root, versions, args.instances)
+    print(f"{args.base}: {base_time * 1000:.1f} ms ({base_time / current_time:.1f}x)")
+    different = [f"{configuration} {version}" for configuration, version in current
+                 if current[configuration, version] != base[configuration, version]]
+    if different:
+        print(f"different options or components: {', '.join(different)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark `configure()` + `requirements()` of the Qt recipes for a default build.
+
+The recipes read the module tree of their version from qtmodules<version>.json, compiled from
+the qtmodules<version>.conf files by `linter/compile_qtmodules.py` with the transitive
+`depends` of every module, and shared by the instances of a recipe. Every version of qt/5.x.x and
+qt/6.x.x is instantiated `--instances` times. With `--base`, the recipes of another git revision,
+like one still parsing the .conf files with configparser, are timed too and must give the very same
+options and requirements.
+
+Runs the recipes with the Conan 1 client classes.
+
+    PYTHONPATH=. python -m linter.benchmarks.qt_module_tree --base origin/master
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import tempfile
+import time
+import yaml
+
+from conans.client.conf import get_default_settings_yml
+from conans.client.loader import _parse_conanfile
+from conans.client.output import ConanOutput
+from conans.model.env_info import EnvValues
+from conans.model.options import OptionsValues
+from conans.model.settings import Settings
+
+RECIPE = os.path.join("recipes", "qt")
+FOLDERS = ("5.x.x", "6.x.x")
+
+
+def _checkout(revision, destination):
+    """ The recipe files of the Qt folders at a git revision, written in `destination` """
+    for folder in FOLDERS:
+        os.makedirs(os.path.join(destination, folder))
+        names = subprocess.run(["git", "ls-tree", "--name-only", revision, f"{RECIPE}/{folder}/"], check=True,
+                               capture_output=True, text=True).stdout.split()
+        for name in names:
+            if os.path.basename(name) == "conanfile.py" or os.path.basename(name).startswith("qtmodules"):
+                content = subprocess.run(["git", "show", f"{revision}:{name}"], check=True, capture_output=True).stdout
+                with open(os.path.join(destination, folder, os.path.basename(name)), "wb") as f:
+                    f.write(content)
+
+
+def _settings():
+    settings = Settings.loads(get_default_settings_yml())
+    settings.os = "Linux"
+    settings.arch = "x86_64"
+    settings.compiler = "gcc"
+    settings.compiler.version = "10"
+    settings.compiler.libcxx = "libstdc++11"
+    settings.build_type = "Release"
+    return settings
+
+
+def run(recipe_root, versions, instances):
+    """ ({version: (options, requirements)}, seconds) of instantiating every version `instances` times """
+    settings = _settings()
+    results = {}
+    elapsed = 0
+    for folder in FOLDERS:
+        recipe_folder = os.path.join(recipe_root, folder)
+        module, _ = _parse_conanfile(os.path.abspath(os.path.join(recipe_folder, "conanfile.py")))
+        for version in versions[folder]:
+            for _ in range(instances):
+                conanfile = module.QtConan(ConanOutput(io.StringIO()), None, f"qt/{version}")
+                conanfile.version = version
+                conanfile.recipe_folder = recipe_folder
+                conanfile.initialize(settings.copy(), EnvValues())
+                conanfile.options.initialize_upstream(OptionsValues({}), name="qt")
+                start = time.perf_counter()
+                conanfile.config_options()
+                conanfile.configure()
+                conanfile.requirements()
+                elapsed += time.perf_counter() - start
+            results[version] = (conanfile.options.values.dumps(),
+                                [str(requirement) for requirement in conanfile.requires.values()])
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=10, help="instances of every version (default: 10)")
+    parser.add_argument("--base", help="git revision whose recipes are compared to the current ones")
+    args = parser.parse_args()
+
+    with open(os.path.join(RECIPE, "config.yml"), encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    versions = {folder: [] for folder in FOLDERS}
+    for version, entry in config["versions"].items():
+        versions[entry["folder"]].append(str(version))
+    count = sum(len(folder_versions) for folder_versions in versions.values())
+
+    current, current_time = run(RECIPE, versions, args.instances)
+    print(f"{count} versions x {args.instances} instances: {current_time * 1000:.1f} ms")
+    if not args.base:
+        return 0
+
+    with tempfile.TemporaryDirectory() as base_root:
+        _checkout(args.base, base_root)
+        base, base_time = run(base_root, versions, args.instances)
+    print(f"{args.base}: {base_time * 1000:.1f} ms ({base_time / current_time:.1f}x)")
+    different = [version for version in current if current[version] != base[version]]
+    if different:
+        print(f"different options or requirements: {', '.join(different)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+"""
+Benchmark the parsed-YAML cache of the recipes reading a `dependencies/dependencies-<version>.yml`.
+
+While Conan resolves a large graph or lockfile, the same recipe version is instantiated again and
+again. boost, moltenvk, vulkan-validationlayers and openvino keep their parsed dependency files in a
+module-level cache (`_load_yaml()`, keyed by path and modification time, parsing with libyaml),
+instead of parsing them with the pure Python loader for every instance. Every version of these
+recipes is instantiated `--instances` times, running `config_options()`, `configure()` and
+`requirements()`, first as they did before, then with the cache, which must give the very same
+requirements.
+
+Runs the recipes with the Conan 1 client classes.
+
+    PYTHONPATH=. python -m linter.benchmarks.recipe_yaml_cache
+"""
+
+import argparse
+import glob
+import io
+import os
+import re
+import time
+import yaml
+
+from conan import ConanFile
+from conans.client.conf import get_default_settings_yml
+from conans.client.loader import _parse_conanfile
+from conans.client.output import ConanOutput
+from conans.model.env_info import EnvValues
+from conans.model.options import OptionsValues
+from conans.model.settings import Settings
+
+# recipe: (settings, options)
+RECIPES = {
+    "boost": ({"os": "Linux", "compiler": "gcc", "compiler.version": "12", "compiler.libcxx": "libstdc++11"},
+              # Given, so that configure() does not run python to find its version
+              {"python_version": "3.11"}),
+    "moltenvk": ({"os": "Macos", "compiler": "apple-clang", "compiler.version": "14", "compiler.libcxx": "libc++"},
+                 {}),
+    "vulkan-validationlayers": ({"os": "Linux", "compiler": "gcc", "compiler.version": "12",
+                                 "compiler.libcxx": "libstdc++11"}, {}),
+    "openvino": ({"os": "Linux", "compiler": "gcc", "compiler.version": "12", "compiler.libcxx": "libstdc++11"}, {}),
+}
+
+
+def _former_load_yaml(path):
+    """ How the recipes read their dependency files before: parsed for every instance """
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _settings(values):
+    settings = Settings.loads(get_default_settings_yml())
+    settings.arch = "x86_64"
+    settings.build_type = "Release"
+    for name, value in values.items():
+        setting = settings
+        *parents, name = name.split(".")
+        for parent in parents:
+            setting = getattr(setting, parent)
+        setattr(setting, name, value)
+    return settings
+
+
+def _recipe_class(module):
+    return next(value for value in vars(module).values()
+                if isinstance(value, type) and issubclass(value, ConanFile) and value is not ConanFile)
+
+
+def run(recipe, module, versions, settings, options, instances):
+    """ ({version: [requirement]}, seconds) of instantiating every version `instances` times """
+    conanfile_class = _recipe_class(module)
+    requirements = {}
+    elapsed = 0
+    for version in versions:
+        for _ in range(instances):
+            conanfile = conanfile_class(ConanOutput(io.StringIO()), None, f"{recipe}/{version}")
+            conanfile.version = version
+            conanfile.recipe_folder = os.path.join("recipes", recipe, "all")
+            conanfile.initialize(settings.copy(), EnvValues())
+            conanfile.options.initialize_upstream(OptionsValues(options), name=recipe)
+            start = time.perf_counter()
+            conanfile.config_options()
+            conanfile.configure()
+            conanfile.requirements()
+            elapsed += time.perf_counter() - start
+            requirements[version] = [str(requirement) for requirement in conanfile.requires.values()]
+    return requirements, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--instances", type=int, default=10, help="instances of every version (default: 10)")
+    args = parser.parse_args()
+
+    failed = False
+    for recipe, (settings, options) in RECIPES.items():
+        folder = os.path.join("recipes", recipe, "all")
+        versions = [re.search(r"dependencies-(.*)\.yml", path).group(1)
+                    for path in sorted(glob.glob(os.path.join(folder, "dependencies", "dependencies-*.yml")))]
+        settings = _settings(settings)
+        module, _ = _parse_conanfile(os.path.abspath(os.path.join(folder, "conanfile.py")))
+
+        cached_load_yaml = module._load_yaml
+        module._load_yaml = _former_load_yaml
+        former, former_time = run(recipe, module, versions, settings, options, args.instances)
+        module._load_yaml = cached_load_yaml
+        cached, cached_time = run(recipe, module, versions, settings, options, args.instances)
+
+        print(f"{recipe}: {len(versions)} versions x {args.instances} instances:"
+              f" {former_time * 1000:.1f} ms -> {cached_time * 1000:.1f} ms ({former_time / cached_time:.1f}x)")
+        different = [version for version in versions if former[version] != cached[version]]
+        if different:
+            print(f"  different requirements: {', '.join(different)}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
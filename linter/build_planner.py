@@ -0,0 +1,169 @@
+"""
+Plan the builds a change needs: the recipe versions it affects, times the configurations of C3I.
+
+Changed paths are mapped to the versions of config.yml they affect:
+
+- a patch only affects the versions listing it in conandata.yml, every version of its folder when none does
+- conandata.yml and config.yml only affect the versions whose entries changed, when the base
+  revision of the change is known (--base), every version of the folder or recipe otherwise
+- any other file of a recipe folder (conanfile.py, test_package, ...) affects every version built from it
+
+The build matrix is these versions for every configuration of `.c3i/config_v2.yml`, as JSON.
+
+    python3 linter/build_planner.py --base origin/master
+    git diff --name-only origin/master | python3 linter/build_planner.py
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import subprocess
+import sys
+import yaml
+from recipe_index import RecipeVersions, recipe_folders
+
+DEFAULT_CONFIGURATION = os.path.join(".c3i", "config_v2.yml")
+
+
+def _expand(settings):
+    """ Every combination of a C3I settings mapping: {setting: [value or {value: nested settings}]} """
+    combinations = [{}]
+    for setting, values in settings.items():
+        expanded = []
+        for value in values if isinstance(values, list) else [values]:
+            nested = [{}]
+            if isinstance(value, dict):
+                (value, nested_settings), = value.items()
+                nested = _expand(nested_settings or {})
+            expanded += [dict({setting: str(value)}, **others) for others in nested]
+        combinations = [dict(combination, **other) for combination in combinations for other in expanded]
+    return combinations
+
+
+def configurations(path):
+    """ [(configuration id, settings)] of the `configurations` of a C3I configuration file """
+    with open(path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    matrix = []
+    for configuration in config.get("configurations", []):
+        for content in configuration.get("content", []):
+            platform = {key: value for key, value in content.items() if key != "compiler"}
+            for compiler in content.get("compiler", []):
+                (name, settings), = compiler.items()
+                for combination in _expand(dict(platform, compiler=[{name: settings}])):
+                    matrix.append((configuration["id"], combination))
+    return matrix
+
+
+def _git_show(base, path):
+    """ Content of `path` at revision `base`, None when it did not exist """
+    result = subprocess.run(["git", "show", f"{base}:{path}"], capture_output=True)
+    return result.stdout.decode("utf-8") if result.returncode == 0 else None
+
+
+def _changed_entries(base, path, section):
+    """ Keys of a YAML section whose value changed since `base`, or None when unknown """
+    old = _git_show(base, path) if base else None
+    if old is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            new = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+        old = yaml.load(old, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+    except (OSError, yaml.YAMLError):
+        return None
+    old, new = old.get(section) or {}, new.get(section) or {}
+    return {str(key) for key in set(old) | set(new) if old.get(key) != new.get(key)}
+
+
+def affected_versions(changed, base=None, recipes_root="recipes"):
+    """ ({(recipe, version): [changed paths causing the build]}, [paths not affecting any build]) """
+    affected = {}
+    ignored = []
+    recipes = {}
+    for path in sorted(set(changed)):
+        parts = path.replace(os.sep, "/").split("/")
+        if len(parts) < 3 or parts[0] != recipes_root:
+            ignored.append(path)
+            continue
+        recipe_dir = os.path.join(recipes_root, parts[1])
+        if not os.path.isdir(recipe_dir):
+            ignored.append(path)
+            continue
+        if recipe_dir not in recipes:
+            recipes[recipe_dir] = RecipeVersions(recipe_dir, recipe_folders(recipe_dir))
+        recipe = recipes[recipe_dir]
+
+        if parts[2:] == ["config.yml"]:
+            changed_versions = _changed_entries(base, path, "versions")
+            versions = [version for version in recipe.config
+                        if changed_versions is None or version in changed_versions]
+        elif parts[2] in recipe.folders and len(parts) > 3:
+            folder, inner = parts[2], "/".join(parts[3:])
+            if inner == "conandata.yml":
+                changed_versions = None
+                if base:
+                    sources = _changed_entries(base, path, "sources")
+                    patches = _changed_entries(base, path, "patches")
+                    changed_versions = None if sources is None else sources | patches
+                versions = [version for version in recipe.versions(folder)
+                            if changed_versions is None or version in changed_versions]
+            elif inner.endswith((".patch", ".diff")) and inner.startswith("patches/"):
+                versions = [version for version, patch_file, _ in recipe.patch_files.get(folder, [])
+                            if posixpath.normpath(patch_file.replace("\\", "/")) == inner]
+                # A patch no conandata.yml entry lists may still be used by the recipe: build every version
+                versions = [version for version in recipe.versions(folder) if not versions or version in versions]
+            else:
+                versions = recipe.versions(folder)
+        else:
+            # Files of removed folders or at the root of the recipe, like its README
+            versions = []
+
+        if not versions:
+            ignored.append(path)
+        for version in versions:
+            affected.setdefault((recipe.name, version), []).append(path)
+    return affected, ignored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan the builds needed by a change, as a JSON build matrix.")
+    parser.add_argument("paths", nargs="*", help="changed paths. Read from stdin, one per line, when none is given.")
+    parser.add_argument(
+        "--base",
+        help="git revision the change is based on: when no path is given, the changes since then are planned,"
+             " and only the versions whose config.yml/conandata.yml entries changed are built.",
+    )
+    parser.add_argument(
+        "--configuration",
+        default=DEFAULT_CONFIGURATION,
+        help="C3I configuration listing the build configurations (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    paths = list(args.paths)
+    if not paths and args.base:
+        diff = subprocess.run(["git", "diff", "--name-only", f"{args.base}...HEAD"], check=True,
+                              capture_output=True, text=True)
+        paths = diff.stdout.split()
+    elif not paths:
+        paths = [line.strip() for line in sys.stdin if line.strip()]
+
+    affected, ignored = affected_versions(paths, args.base)
+    matrix = configurations(args.configuration)
+    builds = [
+        {"reference": f"{recipe}/{version}", "configuration": configuration_id, "settings": settings}
+        for recipe, version in sorted(affected)
+        for configuration_id, settings in matrix
+    ]
+    print(json.dumps({
+        "references": {f"{recipe}/{version}": causes for (recipe, version), causes in sorted(affected.items())},
+        "builds": builds,
+        "ignored": ignored,
+    }, indent=2))
+    print(f"{len(paths)} changed paths, {len(affected)} references, {len(builds)} builds", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+The CCI messages and the tables of the checkers, without any pylint or astroid import.
+
+Shared by the pylint checkers (`linter/check_*.py`) and `linter.prescan`, which finds the
+same messages with the `ast` module and must not pay for importing pylint.
+"""
+
+import re
+
+
+# pylint's `parseable` format, which `linter/recipe_linter.json` matches in GitHub Actions
+MESSAGE_FORMAT = "{path}:{line}: [{msg_id}({symbol}), {obj}] {msg}"
+
+PACKAGE_NAME_MESSAGES = {
+    "E9004": (
+        "Reference name should be all lowercase",
+        "conan-bad-name",
+        "Use only lower-case on the package name: `name = 'foobar'`."
+    ),
+    "E9005": (
+        "Missing name attribute",
+        "conan-missing-name",
+        "The member attribute `name` must be declared: `name = 'foobar'`."
+    ),
+    "E9007": (
+        "No 'name' attribute in test_package conanfile",
+        "conan-test-no-name",
+        "No 'name' attribute in test_package conanfile."
+    ),
+}
+
+IMPORT_MESSAGES = {
+    "E9006": (
+        "Import ConanFile from new module: `from conan import ConanFile`. Old import is deprecated in Conan v2.",
+        "conan-import-conanfile",
+        "Import ConanFile from new module: `from conan import ConanFile`. Old import is deprecated in Conan v2.",
+    ),
+    "E9008": (
+        "Import errors from new module: `from conan import errors`. Old import is deprecated in Conan v2.",
+        "conan-import-errors",
+        "Import errors from new module: `from conan import errors`. Old import is deprecated in Conan v2.",
+    ),
+    "E9009": (
+        "Import ConanException from new module: `from conan.errors import ConanException`. Old import is deprecated in Conan v2.",
+        "conan-import-error-conanexception",
+        "Import ConanException from new module: `from conan.errors import ConanException`. Old import is deprecated in Conan v2.",
+    ),
+    "E9010": (
+        "Import ConanInvalidConfiguration from new module: `from conan.errors import ConanInvalidConfiguration`. Old import is deprecated in Conan v2.",
+        "conan-import-error-conaninvalidconfiguration",
+        "Import ConanInvalidConfiguration from new module: `from conan.errors import ConanInvalidConfiguration`. Old import is deprecated in Conan v2.",
+    ),
+    "E9011": (
+        "Import tools following pattern 'from conan.tools.xxxx import yyyyy' (https://docs.conan.io/en/latest/reference/conanfile/tools.html).",
+        "conan-import-tools",
+        "Import tools following pattern 'from conan.tools.xxxx import yyyyy' (https://docs.conan.io/en/latest/reference/conanfile/tools.html).",
+    ),
+}
+
+# Import messages are emitted in this order when a single import raises several of them
+IMPORT_MESSAGES_ORDER = [symbol for _, symbol, _ in IMPORT_MESSAGES.values()]
+
+# Deprecated `from <module> import <name>` statements, and the message each one raises
+DEPRECATED_IMPORTS = {
+    "conans": {
+        "ConanFile": "conan-import-conanfile",
+        "errors": "conan-import-errors",
+    },
+    "conans.errors": {
+        "ConanException": "conan-import-error-conanexception",
+        "ConanInvalidConfiguration": "conan-import-error-conaninvalidconfiguration",
+    },
+    "conan": {
+        "tools": "conan-import-tools",
+    },
+}
+
+# Private modules below the public `conan.tools.xxxx` ones
+PRIVATE_TOOLS_MODULE = re.compile(r'conan\.tools\.[^.]+\..+')
+
+WHY_SRC_FOLDER = "Setting the `src_folder` for layouts will help keep an organized and clean workspace when developing recipes locally. " \
+                 "The extra folder will help ensure there are no collisions between the upstream sources and recipe's exports - which " \
+                 "also extends to what happens in the cache when creating packages"
+
+# The built-in layouts which take a `src_folder`
+LAYOUTS = ["cmake_layout", "bazel_layout", "basic_layout"]
+
+LAYOUT_SRC_FOLDER_MESSAGES = {
+    "E9012": (
+        "layout is missing `src_folder` argument which should be to `src`",
+        "conan-missing-layout-src-folder",
+        WHY_SRC_FOLDER,
+    ),
+    "E9013": (
+        "layout should set `src_folder` to `src`",
+        "conan-layout-src-folder-is-src",
+        WHY_SRC_FOLDER,
+    ),
+}
+
+VERSION_ATTRIBUTE_MESSAGES = {
+    "E9014": (
+        "Recipe should not contain version attribute",
+        "conan-forced-version",
+        "Do not enforce a specific version in your recipe. Keep it generic for any version."
+    ),
+}
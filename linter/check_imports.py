@@ -0,0 +1,27 @@
+from pylint.checkers import BaseChecker
+from pylint.interfaces import IAstroidChecker
+from astroid import nodes
+
+from linter.cci_messages import DEPRECATED_IMPORTS, IMPORT_MESSAGES, IMPORT_MESSAGES_ORDER, PRIVATE_TOOLS_MODULE
+
+
+class ImportAnalysis(BaseChecker):
+    """
+       Imports must use the new 'conan' module and the public 'conan.tools.xxxx' modules
+    """
+
+    __implements__ = IAstroidChecker
+
+    name = "conan-imports"
+    msgs = IMPORT_MESSAGES
+
+    def visit_importfrom(self, node: nodes.ImportFrom) -> None:
+        basename = node.modname
+        deprecated = DEPRECATED_IMPORTS.get(basename)
+        if deprecated is not None:
+            found = {deprecated[name] for name, _ in node.names if name in deprecated}
+            for symbol in IMPORT_MESSAGES_ORDER:
+                if symbol in found:
+                    self.add_message(symbol, node=node)
+        elif basename.startswith("conan.tools.") and PRIVATE_TOOLS_MODULE.match(basename):
+            self.add_message("conan-import-tools", node=node)
@@ -2,9 +2,7 @@ from pylint.checkers import BaseChecker
 from pylint.interfaces import IAstroidChecker
 from astroid import nodes
 
-WHY_SRC_FOLDER = "Setting the `src_folder` for layouts will help keep an organized and clean workspace when developing recipes locally. " \
-                 "The extra folder will help ensure there are no collisions between the upstream sources and recipe's exports - which " \
-                 "also extends to what happens in the cache when creating packages"
+from linter.cci_messages import LAYOUTS, LAYOUT_SRC_FOLDER_MESSAGES
 
 
 class LayoutSrcFolder(BaseChecker):
@@ -15,24 +13,13 @@ class LayoutSrcFolder(BaseChecker):
     __implements__ = IAstroidChecker
 
     name = "conan-layout-src-folder"
-    msgs = {
-        "E9012": (
-            "layout is missing `src_folder` argument which should be to `src`",
-            "conan-missing-layout-src-folder",
-            WHY_SRC_FOLDER,
-        ),
-        "E9013": (
-            "layout should set `src_folder` to `src`",
-            "conan-layout-src-folder-is-src",
-            WHY_SRC_FOLDER,
-        ),
-    }
+    msgs = LAYOUT_SRC_FOLDER_MESSAGES
 
     def visit_call(self, node: nodes.Call) -> None:
         if not isinstance(node.func, nodes.Name):
             return
 
-        if node.func.name in ["cmake_layout", "bazel_layout", "basic_layout"]:
+        if node.func.name in LAYOUTS:
             for kw in node.keywords:
                 if kw.arg == "src_folder":
                     if not kw.value or kw.value.as_string().strip("\"'") != "src":
@@ -3,6 +3,8 @@ from pylint.interfaces import IAstroidChecker
 from astroid import nodes, Const, AssignName
 from pathlib import Path
 
+from linter.cci_messages import PACKAGE_NAME_MESSAGES
+
 
 class PackageName(BaseChecker):
     """
@@ -12,23 +14,7 @@ class PackageName(BaseChecker):
     __implements__ = IAstroidChecker
 
     name = "conan-package-name"
-    msgs = {
-        "E9004": (
-            "Reference name should be all lowercase",
-            "conan-bad-name",
-            "Use only lower-case on the package name: `name = 'foobar'`."
-        ),
-        "E9005": (
-            "Missing name attribute",
-            "conan-missing-name",
-            "The member attribute `name` must be declared: `name = 'foobar'`."
-        ),
-        "E9007": (
-            "No 'name' attribute in test_package conanfile",
-            "conan-test-no-name",
-            "No 'name' attribute in test_package conanfile."
-        ),
-    }
+    msgs = PACKAGE_NAME_MESSAGES
 
     def visit_classdef(self, node: nodes) -> None:
         filename = Path(node.root().file)
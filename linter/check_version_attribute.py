@@ -2,6 +2,8 @@ from pylint.checkers import BaseChecker
 from pylint.interfaces import IAstroidChecker
 from astroid import nodes, Const, AssignName
 
+from linter.cci_messages import VERSION_ATTRIBUTE_MESSAGES
+
 
 class VersionAttribute(BaseChecker):
     """
@@ -11,13 +13,7 @@ class VersionAttribute(BaseChecker):
     __implements__ = IAstroidChecker
 
     name = "conan-attr-version"
-    msgs = {
-        "E9014": (
-            "Recipe should not contain version attribute",
-            "conan-forced-version",
-            "Do not enforce a specific version in your recipe. Keep it generic for any version."
-        ),
-    }
+    msgs = VERSION_ATTRIBUTE_MESSAGES
 
     def visit_classdef(self, node: nodes) -> None:
         if node.basenames == ['ConanFile']:
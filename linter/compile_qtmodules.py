@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""
+Compile the qtmodules<version>.conf files of the Qt recipes into qtmodules<version>.json.
+
+The .conf files are the `.gitmodules` of the qt5 super repository (qt/qt5.git) of each version.
+The recipes read the compiled module tree instead: no parsing nor checks are needed, and the
+transitive `depends` of every module are already computed. Re-run this script whenever a .conf
+file is added or updated; `--check`, run by the YAML linter workflow, tells whether the .json files
+are up to date.
+
+    python3 linter/compile_qtmodules.py
+    python3 linter/compile_qtmodules.py --check
+"""
+
+import argparse
+import configparser
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+RECIPE = Path(__file__).resolve().parent.parent / "recipes" / "qt"
+RECIPE_FOLDERS = ("5.x.x", "6.x.x")
+
+
+def parse_modules(path: Path) -> Dict[str, dict]:
+    config = configparser.ConfigParser()
+    config.read_string(path.read_text())
+    if not config.sections():
+        raise ValueError(f"{path}: no submodule")
+    modules = {}
+    for section in config.sections():
+        if not section.startswith("submodule ") or section.count('"') != 2:
+            raise ValueError(f"{path}: unexpected section [{section}]")
+        name = section[section.find('"') + 1:section.rfind('"')]
+        modules[name] = {
+            "status": config.get(section, "status"),
+            "path": config.get(section, "path"),
+            "depends": config.get(section, "depends", fallback="").split(),
+        }
+    return modules
+
+
+def transitive_depends(modules: Dict[str, dict]) -> Dict[str, List[str]]:
+    closures = {}
+
+    def closure(name, visiting):
+        if name not in closures:
+            if name in visiting:
+                raise ValueError(f"dependency cycle: {' -> '.join(visiting + [name])}")
+            if name not in modules:
+                raise ValueError(f"unknown module {name}, required by {visiting[-1]}")
+            depends = set()
+            for dependency in modules[name]["depends"]:
+                depends.add(dependency)
+                depends.update(closure(dependency, visiting + [name]))
+            closures[name] = sorted(depends)
+        return closures[name]
+
+    for name in modules:
+        closure(name, [])
+    return closures
+
+
+def compile_modules(path: Path) -> str:
+    modules = parse_modules(path)
+    for name, closure in transitive_depends(modules).items():
+        modules[name]["all_depends"] = closure
+    return json.dumps({
+        "conf_sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+        "modules": modules,
+    }, indent=2) + "\n"
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description="Compile the qtmodules<version>.conf files of the Qt recipes.")
+    parser.add_argument("confs", nargs="*", type=Path, help="qtmodules<version>.conf files (default: all)")
+    parser.add_argument("--check", action="store_true", help="only tell which .json files are not up to date")
+    ns = parser.parse_args(args)
+
+    confs = ns.confs or sorted(path for folder in RECIPE_FOLDERS
+                               for path in (RECIPE / folder).glob("qtmodules*.conf"))
+    outdated = 0
+    for conf in confs:
+        compiled = compile_modules(conf)
+        json_path = conf.with_suffix(".json")
+        if json_path.is_file() and json_path.read_text() == compiled:
+            continue
+        if ns.check:
+            print(f"::error file={os.path.relpath(conf)},title=qtmodules not compiled::{json_path.name} is not up to date,"
+                  f" run linter/{Path(__file__).name}")
+            outdated += 1
+        else:
+            print(f"Writing {json_path}")
+            json_path.write_text(compiled)
+    return 1 if outdated else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
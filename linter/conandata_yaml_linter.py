@@ -1,4 +1,8 @@
 import argparse
+import glob
+import multiprocessing
+import os
+import sys
 from strictyaml import (
     load,
     Map,
@@ -10,61 +14,137 @@ from strictyaml import (
     Enum,
     Any,
 )
-from yaml_linting import file_path
+from yaml_linting import fast_load, file_path
 
 
 CONANDATA_YAML_URL = "https://github.com/conan-io/conan-center-index/blob/master/docs/adding_packages/conandata_yml_format.md"
 
 
+PATCH_TYPES = ["official", "conan", "portability", "bugfix", "vulnerability"]
+# Patch types expected to have a `patch_source`
+SOURCED_PATCH_TYPES = ["official", "bugfix", "vulnerability"]
+PATCH_FIELDS = Map(
+    {
+        "patch_file": Str(),
+        "patch_description": Str(),
+        "patch_type": Enum(PATCH_TYPES),
+        Optional("patch_source"): Str(),
+        # No longer required for v2 recipes with layouts
+        Optional("base_path"): Str(),
+    }
+)
+REQUIRED_PATCH_FIELDS = {"patch_file", "patch_description", "patch_type"}
+ALL_PATCH_FIELDS = REQUIRED_PATCH_FIELDS | {"patch_source", "base_path"}
+SCHEMA = Map(
+    {
+        "sources": MapPattern(Str(), Any(), minimum_keys=1),
+        Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
+    }
+)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate Conan's 'conandata.yaml' file to ConanCenterIndex's requirements."
     )
     parser.add_argument(
         "path",
-        nargs="?",
+        nargs="*",
         type=file_path,
-        help="file to validate.",
+        help="files to validate. Read from stdin, one per line, when none is given.",
     )
-    args = parser.parse_args()
-
-    patch_fields = Map(
-        {
-            "patch_file": Str(),
-            "patch_description": Str(),
-            "patch_type": Enum(
-                ["official", "conan", "portability", "bugfix", "vulnerability"]
-            ),
-            Optional("patch_source"): Str(),
-            # No longer required for v2 recipes with layouts
-            Optional("base_path"): Str(),
-        }
+    parser.add_argument(
+        "--glob",
+        action="append",
+        default=[],
+        help="validate the files matching this pattern, e.g. 'recipes/*/*/conandata.yml'.",
     )
-    schema = Map(
-        {
-            "sources": MapPattern(Str(), Any(), minimum_keys=1),
-            Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
-        }
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count).",
     )
+    args = parser.parse_args()
 
-    with open(args.path, encoding="utf-8") as f:
+    paths = list(args.path)
+    for pattern in args.glob:
+        paths.extend(sorted(glob.glob(pattern)))
+    if not args.path and not args.glob:
+        paths = [file_path(line.strip()) for line in sys.stdin if line.strip()]
+
+    # Annotations are printed as soon as each file is validated, in completion order
+    jobs = min(args.jobs or os.cpu_count() or 1, len(paths))
+    if jobs <= 1:
+        for annotations in map(validate, paths):
+            print_annotations(annotations)
+    else:
+        with multiprocessing.Pool(jobs) as pool:
+            for annotations in pool.imap_unordered(validate, paths):
+                print_annotations(annotations)
+
+
+def print_annotations(annotations):
+    for annotation in annotations:
+        print(annotation)
+    sys.stdout.flush()
+
+
+def follows_schema(content):
+    """
+    True when libyaml alone proves that `content` follows the schema and raises no warning.
+
+    Any other file, including the ones libyaml cannot tell apart from what strictyaml reads,
+    goes through strictyaml to produce line-accurate annotations.
+    """
+    parsed = fast_load(content)
+    if not isinstance(parsed, dict) or "sources" not in parsed or not set(parsed) <= {"sources", "patches"}:
+        return False
+    if not isinstance(parsed["sources"], dict) or not parsed["sources"]:
+        return False
+    if "patches" not in parsed:
+        return True
+    if not isinstance(parsed["patches"], dict) or not parsed["patches"]:
+        return False
+    for version, patches in parsed["patches"].items():
+        if version not in parsed["sources"] or not isinstance(patches, list) or not patches:
+            return False
+        for patch in patches:
+            if not isinstance(patch, dict) or not REQUIRED_PATCH_FIELDS <= set(patch) <= ALL_PATCH_FIELDS:
+                return False
+            if not all(isinstance(value, str) for value in patch.values()):
+                return False
+            if patch["patch_type"] not in PATCH_TYPES or \
+               patch["patch_type"] in SOURCED_PATCH_TYPES and "patch_source" not in patch:
+                return False
+    return True
+
+
+def validate(path, fast_path=True):
+    """ Return the GitHub annotations for a single conandata.yml file """
+    with open(path, encoding="utf-8") as f:
         content = f.read()
 
+    if fast_path and follows_schema(content):
+        return []
+
+    annotations = []
     try:
-        parsed = load(content, schema)
+        parsed = load(content, SCHEMA)
     except YAMLValidationError as error:
-        pretty_print_yaml_validate_error(args, error) # Error when "source" is missing or when "patches" has no versions
-        return
+        annotations.append(format_yaml_validate_error(path, error)) # Error when "source" is missing or when "patches" has no versions
+        return annotations
     except BaseException as error:
-        pretty_print_yaml_validate_error(args, error) # YAML could not be parsed
-        return
+        annotations.append(format_yaml_validate_error(path, error)) # YAML could not be parsed
+        return annotations
 
     if "patches" in parsed:
         for version in parsed["patches"]:
             patches = parsed["patches"][version]
             if version not in parsed["sources"]:
-                print(
-                    f"::warning file={args.path},line={patches.start_line},endline={patches.end_line},"
+                annotations.append(
+                    f"::warning file={path},line={patches.start_line},endline={patches.end_line},"
                     f"title=conandata.yml inconsistency"
                     f"::Patch(es) are listed for version `{version}`, but there is source for this version."
                     f" You should either remove `{version}` from the `patches` section, or add it to the"
@@ -73,38 +153,39 @@ def main():
             for i, patch in enumerate(patches):
                 # Individual report errors for each patch object
                 try:
-                    parsed["patches"][version][i].revalidate(patch_fields)
+                    parsed["patches"][version][i].revalidate(PATCH_FIELDS)
                 except YAMLValidationError as error:
-                    pretty_print_yaml_validate_warning(args, error) # Warning when patch fields are not followed
+                    annotations.append(format_yaml_validate_warning(path, error)) # Warning when patch fields are not followed
                     continue
 
                 # Make sure `patch_source` exists where it's encouraged
                 type = parsed["patches"][version][i]["patch_type"]
                 if (
-                    type in ["official", "bugfix", "vulnerability"]
+                    type in SOURCED_PATCH_TYPES
                     and not "patch_source" in patch
                 ):
-                    print(
-                        f"::warning file={args.path},line={type.start_line},endline={type.end_line},"
+                    annotations.append(
+                        f"::warning file={path},line={type.start_line},endline={type.end_line},"
                         f"title=conandata.yml schema warning"
                         f"::'patch_type' should have 'patch_source' as per {CONANDATA_YAML_URL}#patch_type"
                         " it is expected to have a source (e.g. a URL) to where it originates from to help with"
                         " reviewing and consumers to evaluate patches"
                     )
+    return annotations
 
 
-def pretty_print_yaml_validate_error(args, error):
+def format_yaml_validate_error(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema error"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
     
-def pretty_print_yaml_validate_warning(args, error):
+def format_yaml_validate_warning(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::warning file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::warning file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema warning"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
@@ -0,0 +1,258 @@
+"""
+Requirements of a conanfile.py, read statically with `ast`: the recipe is never imported nor run.
+
+Found are the `self.requires("name/version")` like calls anywhere in the recipe, the `requires`
+like class attributes, and the "name/version" strings of the tables recipes keep their
+requirements in (ncbi-cxx-toolkit-public's NCBI_to_Conan_requires). Requirements only taken
+under some condition (options, settings, loops, tables) are flagged as such. The comparisons of
+the recipe version, like `if Version(self.version) < "0.24.0":`, they are taken under are kept as
+a version range without brackets, e.g. `<0.24.0` or `>=1.2 <2 || =3`.
+"""
+
+import ast
+import re
+from collections import namedtuple
+
+KINDS = ("requires", "build_requires", "tool_requires", "test_requires")
+# The methods where an unconditional call always adds the requirement
+REQUIREMENTS_METHODS = ("requirements", "build_requirements")
+
+# name/version[@user/channel][#revision], the version possibly being a [range]
+REFERENCE = re.compile(r"([a-z0-9_][a-z0-9_+.-]*)/(\[[^\]]*\]|[^@#\s/]+)(?:@[^#\s]*)?(?:#\S*)?")
+# Stricter, for the strings of tables which may hold anything: versions start like versions do
+TABLE_REFERENCE = re.compile(r"([a-z0-9_][a-z0-9_+.-]*)/(\[[^\]]*\]|(?:\d|cci\.)[^@#\s/]*)(?:@[^#\s]*)?(?:#\S*)?")
+
+# `version` is None when it is computed (f-strings, variables), `name` too when the whole reference is.
+# `version_condition` is None when the requirement does not depend on the recipe version, or in an unknown way.
+Requirement = namedtuple("Requirement", ["kind", "name", "version", "reference", "conditional", "version_condition",
+                                         "line"])
+
+_CONDITIONAL = (ast.If, ast.IfExp, ast.For, ast.While, ast.Try, ast.With, ast.BoolOp, ast.comprehension)
+
+# A version condition is a list of alternatives, each a tuple of (operator, version) all to be met, or None
+# when unknown: it is then assumed to be met. Beyond that many alternatives, it is given up on.
+_MAX_ALTERNATIVES = 16
+_COMPARISONS = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "="}
+_REVERSED = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "=": "="}
+_NEGATED = {"<": [">="], "<=": [">"], ">": ["<="], ">=": ["<"], "=": ["<", ">"]}
+
+
+def _both(condition, other):
+    """ The condition met when both are """
+    if condition is None or other is None:
+        return other if condition is None else condition
+    both = [first + second for first in condition for second in other]
+    return both if len(both) <= _MAX_ALTERNATIVES else None
+
+
+def _either(conditions):
+    """ The condition met when any of `conditions` is """
+    if any(condition is None for condition in conditions):
+        return None
+    either = [alternative for condition in conditions for alternative in condition]
+    return either if len(either) <= _MAX_ALTERNATIVES else None
+
+
+def _negated(condition):
+    """ The condition met when `condition` is not """
+    if condition is None:
+        return None
+    negated = [()]
+    for alternative in condition:
+        negated = _both(negated, [((operator, version),) for atom_operator, version in alternative
+                                  for operator in _NEGATED[atom_operator]])
+    return negated
+
+
+def _is_recipe_version(node):
+    """ Whether an expression is `self.version`, or `Version(self.version)` """
+    if isinstance(node, ast.Call) and len(node.args) == 1:
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        return name == "Version" and _is_recipe_version(node.args[0])
+    return (isinstance(node, ast.Attribute) and node.attr == "version" and isinstance(node.value, ast.Name)
+            and node.value.id == "self")
+
+
+def _version(node):
+    """ The version of a "1.2" or Version("1.2") expression, or None """
+    if isinstance(node, ast.Call) and len(node.args) == 1:
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        return _version(node.args[0]) if name == "Version" else None
+    if isinstance(node, ast.Constant) and isinstance(node.value, (str, int, float)):
+        version = str(node.value)
+        return version if version and not any(c.isspace() or c in "[]|," for c in version) else None
+    return None
+
+
+def _comparison(node):
+    """ The version condition of a comparison of the recipe version, or None """
+    if len(node.ops) != 1:
+        return None
+    left, operator, right = node.left, node.ops[0], node.comparators[0]
+    if isinstance(operator, (ast.In, ast.NotIn)) and _is_recipe_version(left) \
+            and isinstance(right, (ast.Tuple, ast.List, ast.Set)):
+        versions = [_version(element) for element in right.elts]
+        if not versions or None in versions:
+            return None
+        condition = [(("=", version),) for version in versions]
+        return condition if isinstance(operator, ast.In) else _negated(condition)
+    if isinstance(operator, ast.NotEq):
+        return _negated(_comparison(ast.Compare(left=left, ops=[ast.Eq()], comparators=[right])))
+    if type(operator) not in _COMPARISONS:
+        return None
+    symbol = _COMPARISONS[type(operator)]
+    if _is_recipe_version(right):
+        left, right, symbol = right, left, _REVERSED[symbol]
+    version = _version(right)
+    return [((symbol, version),)] if _is_recipe_version(left) and version else None
+
+
+def _version_conditions(node):
+    """ (condition when the expression is true, condition when it is false) on the recipe version """
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        if_true, if_false = _version_conditions(node.operand)
+        return if_false, if_true
+    if isinstance(node, ast.BoolOp):
+        conditions = [_version_conditions(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            if_true = None
+            for condition, _ in conditions:
+                if_true = _both(if_true, condition)
+            return if_true, _either([condition for _, condition in conditions])
+        if_false = None
+        for _, condition in conditions:
+            if_false = _both(if_false, condition)
+        return _either([condition for condition, _ in conditions]), if_false
+    if isinstance(node, ast.Compare):
+        condition = _comparison(node)
+        return condition, _negated(condition)
+    return None, None
+
+
+def _text(condition):
+    """ A condition as a version range without brackets """
+    if condition is None:
+        return None
+    return " || ".join(" ".join(f"{operator}{version}" for operator, version in alternative)
+                       for alternative in condition)
+
+
+def _reference(node, source):
+    """ (name, version, reference text) of the expression given as a reference """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        match = REFERENCE.fullmatch(node.value.strip())
+        return (match.group(1), match.group(2), node.value) if match else (None, None, node.value)
+    text = ast.get_source_segment(source, node) or ""
+    if isinstance(node, ast.JoinedStr) and node.values and isinstance(node.values[0], ast.Constant):
+        # f"zlib/{self._zlib_version}": the name is known, not the version
+        name, slash, _ = str(node.values[0].value).partition("/")
+        if slash and re.fullmatch(r"[a-z0-9_][a-z0-9_+.-]*", name):
+            return name, None, text
+    return None, None, text
+
+
+class _Extractor(ast.NodeVisitor):
+
+    def __init__(self, source):
+        self.source = source
+        self.requirements = []
+        self._function = None
+        self._conditions = 0
+        self._version_condition = None
+
+    def _add(self, kind, node, conditional):
+        name, version, reference = _reference(node, self.source)
+        self.requirements.append(Requirement(kind, name, version, reference, conditional,
+                                             _text(self._version_condition), node.lineno))
+
+    def visit_ClassDef(self, node):
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                for target in statement.targets:
+                    if isinstance(target, ast.Name):
+                        self._attribute(target.id, statement.value)
+        self.generic_visit(node)
+
+    def visit_Module(self, node):
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                for target in statement.targets:
+                    if isinstance(target, ast.Name) and "require" in target.id.lower():
+                        self._table(statement.value)
+        self.generic_visit(node)
+
+    def _attribute(self, name, value):
+        if name in KINDS:
+            values = value.elts if isinstance(value, (ast.Tuple, ast.List)) else [value]
+            for element in values:
+                self._add(name, element, conditional=False)
+        elif "require" in name.lower():
+            self._table(value)
+
+    def _table(self, value):
+        for node in ast.walk(value):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                match = TABLE_REFERENCE.fullmatch(node.value.strip())
+                if match:
+                    self.requirements.append(
+                        Requirement("requires", match.group(1), match.group(2), node.value, True, None,
+                                    node.lineno))
+
+    def visit_FunctionDef(self, node):
+        function, conditions, version_condition = self._function, self._conditions, self._version_condition
+        self._function, self._conditions, self._version_condition = node.name, 0, None
+        self.generic_visit(node)
+        self._function, self._conditions, self._version_condition = function, conditions, version_condition
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def generic_visit(self, node):
+        conditional = isinstance(node, _CONDITIONAL)
+        self._conditions += conditional
+        super().generic_visit(node)
+        self._conditions -= conditional
+
+    def visit_If(self, node):
+        self._branches(node, node.body, node.orelse)
+
+    def visit_IfExp(self, node):
+        self._branches(node, [node.body], [node.orelse])
+
+    def _branches(self, node, body, orelse):
+        """ Visit an if statement or expression, its branches with their condition on the recipe version """
+        if_true, if_false = _version_conditions(node.test)
+        version_condition = self._version_condition
+        self._conditions += 1
+        self.visit(node.test)
+        for branch, condition in ((body, if_true), (orelse, if_false)):
+            self._version_condition = _both(version_condition, condition)
+            for statement in branch:
+                self.visit(statement)
+        self._version_condition = version_condition
+        self._conditions -= 1
+
+    def visit_Call(self, node):
+        func = node.func
+        if (isinstance(func, ast.Attribute) and func.attr in KINDS and isinstance(func.value, ast.Name)
+                and func.value.id == "self" and node.args):
+            conditional = bool(self._conditions) or self._function not in REQUIREMENTS_METHODS
+            self._add(func.attr, node.args[0], conditional)
+        self.generic_visit(node)
+
+
+def extract(source):
+    """ [Requirement] of the source of a conanfile.py, in file order. Raises SyntaxError. """
+    extractor = _Extractor(source)
+    extractor.visit(ast.parse(source))
+    return sorted(extractor.requirements, key=lambda requirement: requirement.line)
+
+
+def extract_file(path):
+    """ extract() of a file, [] when it cannot be read or parsed """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return extract(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return []
@@ -0,0 +1,105 @@
+"""
+Pre-built stub module for the Conan classes `linter.transform_conanfile` injects into ConanFile.
+
+Looking those classes up with `astroid.MANAGER.ast_from_module_name` parses five
+modules of the installed Conan package in every lint process. Instead, their
+class definitions (together with the imports and constants of the modules they
+come from) are extracted once into a single stub module, stored in the linter
+cache directory and keyed by the Conan version.
+
+    python -m linter.conans_stubs  # (re)build the stub module and print its location
+
+Set CCI_LINTER_NO_STUBS=1 to look the classes up in the Conan package instead.
+"""
+
+import ast
+import hashlib
+import importlib.util
+import os
+
+from linter.lint_cache import default_cache_dir
+
+
+STUB_MODULE_NAME = "cci_conans_stubs"
+
+# module -> classes used by `linter.transform_conanfile`
+CLASSES = {
+    "conans.model.info": ["ConanInfo"],
+    "conans.client.graph.graph_manager": ["_RecipeBuildRequires"],
+    "conans.client.file_copier": ["FileCopier"],
+    "conans.client.importer": ["_FileImporter"],
+    "conans.client.graph.python_requires": ["PyRequires"],
+}
+
+
+def enabled():
+    return os.environ.get("CCI_LINTER_NO_STUBS", "") in ("", "0")
+
+
+def conan_version():
+    spec = importlib.util.find_spec("conans")
+    if spec is None:
+        return None
+    with open(spec.origin, encoding="utf-8") as f:
+        for node in ast.parse(f.read()).body:
+            if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "__version__" for t in node.targets):
+                return ast.literal_eval(node.value)
+    return None
+
+
+def stub_path():
+    with open(__file__, "rb") as f:
+        generator = hashlib.sha256(f.read()).hexdigest()[:12]
+    return os.path.join(default_cache_dir(), f"conans-stubs-{conan_version()}-{generator}.py")
+
+
+def build_source():
+    """ Source code of a module with the imports, constants and requested classes of every module in CLASSES """
+    imports, constants, classes = [], [], []
+    for module, names in CLASSES.items():
+        with open(importlib.util.find_spec(module).origin, encoding="utf-8") as f:
+            source = f.read()
+        for node in ast.parse(source).body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                if isinstance(node, ast.ImportFrom) and node.level:
+                    # Relative imports would be resolved against the stub module, make them absolute
+                    package = module.rsplit(".", node.level)[0]
+                    aliases = ", ".join(f"{a.name} as {a.asname}" if a.asname else a.name for a in node.names)
+                    statement = f"from {'.'.join(filter(None, [package, node.module]))} import {aliases}"
+                else:
+                    statement = ast.get_source_segment(source, node)
+                if statement not in imports:
+                    imports.append(statement)
+            elif isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) for t in node.targets):
+                constants.append(ast.get_source_segment(source, node))
+            elif isinstance(node, ast.ClassDef) and node.name in names:
+                classes.append(f"# {module}.{node.name}\n{ast.get_source_segment(source, node)}")
+    return "\n".join([f"# Generated by linter/conans_stubs.py for Conan {conan_version()}", *imports, "",
+                      *constants, "", *("\n\n" + c for c in classes), ""])
+
+
+def build():
+    path = stub_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(build_source())
+    os.replace(tmp, path)
+    return path
+
+
+def load():
+    """ astroid module with the stubbed classes, built on first use; None if Conan is not installed """
+    import astroid
+    from astroid.builder import AstroidBuilder
+
+    if conan_version() is None:
+        return None
+    path = stub_path()
+    if not os.path.isfile(path):
+        build()
+    return AstroidBuilder(astroid.MANAGER).file_build(path, STUB_MODULE_NAME)
+
+
+if __name__ == "__main__":
+    print(build())
@@ -1,6 +1,15 @@
 import argparse
+import glob
+import os
+import sys
 from strictyaml import load, Map, Str, YAMLValidationError, MapPattern
-from yaml_linting import file_path
+from yaml_linting import fast_load, file_path
+from recipe_index import index_recipe_folders
+
+
+SCHEMA = Map(
+    {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
+)
 
 
 def main():
@@ -9,28 +18,84 @@ def main():
     )
     parser.add_argument(
         "path",
-        nargs="?",
+        nargs="*",
         type=file_path,
-        help="file to validate.",
+        help="files to validate. Read from stdin, one per line, when none is given.",
+    )
+    parser.add_argument(
+        "--glob",
+        action="append",
+        default=[],
+        help="validate the files matching this pattern, e.g. 'recipes/*/config.yml'.",
     )
     args = parser.parse_args()
 
-    schema = Map(
-        {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
+    paths = list(args.path)
+    for pattern in args.glob:
+        paths.extend(sorted(glob.glob(pattern)))
+    if not args.path and not args.glob:
+        paths = [file_path(line.strip()) for line in sys.stdin if line.strip()]
+
+    # List the folders of every recipe once, up front
+    folders = index_recipe_folders(os.path.dirname(os.path.abspath(path)) for path in paths)
+    for path in paths:
+        for annotation in validate(path, folders.get(os.path.dirname(os.path.abspath(path)), {})):
+            print(annotation)
+
+
+def follows_schema(parsed):
+    """ True when the libyaml parse of a config.yml follows SCHEMA """
+    if not isinstance(parsed, dict) or set(parsed) != {"versions"}:
+        return False
+    versions = parsed["versions"]
+    if not isinstance(versions, dict) or not versions:
+        return False
+    return all(
+        isinstance(entry, dict) and set(entry) == {"folder"} and isinstance(entry["folder"], str)
+        for entry in versions.values()
     )
 
-    with open(args.path) as f:
+
+def validate(path, folders):
+    """ Return the GitHub annotations for a config.yml, `folders` being its recipe_index.recipe_folders() """
+    with open(path) as f:
         content = f.read()
 
-    try:
-        load(content, schema)
-    except YAMLValidationError as error:
-        e = error.__str__().replace("\n", "%0A")
-        print(
-            f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line},"
-            f"title=config.yml schema error"
-            f"::{e}\n"
+    parsed = fast_load(content)
+    strict = None
+    if not follows_schema(parsed):
+        try:
+            strict = load(content, SCHEMA)
+        except YAMLValidationError as error:
+            e = error.__str__().replace("\n", "%0A")
+            return [
+                f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line},"
+                f"title=config.yml schema error"
+                f"::{e}\n"
+            ]
+        parsed = strict.data
+
+    problems = []
+    for version, entry in parsed["versions"].items():
+        folder = entry["folder"]
+        if folder not in folders:
+            problems.append((version, f"Version `{version}` points to folder `{folder}`, which does not exist"))
+        elif not folders[folder]:
+            problems.append((version, f"Version `{version}` points to folder `{folder}`, which has no conanfile.py"))
+    if not problems:
+        return []
+
+    # Only files with problems are parsed again, to know where to report them
+    strict = strict or load(content, SCHEMA)
+    annotations = []
+    for version, message in problems:
+        folder = strict["versions"][version]["folder"]
+        annotations.append(
+            f"::error file={path},line={folder.start_line},endline={folder.end_line},"
+            f"title=config.yml folder error"
+            f"::{message}"
         )
+    return annotations
 
 
 if __name__ == "__main__":
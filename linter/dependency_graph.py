@@ -0,0 +1,140 @@
+"""
+Static dependency graph of the recipes, from the requirements of recipe_database.py.
+
+Answers "what must be rebuilt if openssl changes": the recipes requiring it, transitively.
+Edges are recipe names, whatever the versions, and include the requirements of option branches.
+The adjacency index is pickled next to the database and only built again when the database
+changed, so that a query does not have to read the requirements again.
+
+    python3 linter/dependency_graph.py dependents openssl
+    python3 linter/dependency_graph.py requires ffmpeg --build
+"""
+
+import argparse
+import glob
+import json
+import os
+import pickle
+import sys
+import time
+from recipe_database import connect, default_database_path, update
+
+RUN_KINDS = ("requires",)
+BUILD_KINDS = ("requires", "build_requires", "tool_requires")
+
+
+class DependencyGraph:
+    """
+       Recipes and the names they require, with the reverse adjacency
+    """
+
+    def __init__(self, requires, required_by):
+        # {kind: {recipe: {name: whether conditional}}} and {kind: {name: {recipe: whether conditional}}}
+        self.requires = requires
+        self.required_by = required_by
+
+    @classmethod
+    def from_edges(cls, edges):
+        """ The graph of [(recipe, kind, name, conditional)] """
+        requires = {}
+        required_by = {}
+        for recipe, kind, name, conditional in edges:
+            names = requires.setdefault(kind, {}).setdefault(recipe, {})
+            # An edge is conditional only if every requirement behind it is
+            names[name] = names.get(name, True) and bool(conditional)
+            required_by.setdefault(kind, {}).setdefault(name, {})[recipe] = names[name]
+        return cls(requires, required_by)
+
+    @classmethod
+    def from_database(cls, connection):
+        return cls.from_edges(connection.execute(
+            "SELECT recipe, kind, name, conditional FROM requirements WHERE name IS NOT NULL AND name != recipe"
+        ))
+
+    def _closure(self, adjacency, start, kinds, unconditional):
+        """ {recipe: (distance, parent)} of the recipes reached from `start`, breadth first """
+        reached = {start: (0, None)}
+        frontier = [start]
+        while frontier:
+            following = []
+            for current in frontier:
+                for kind in kinds:
+                    for neighbour, conditional in adjacency.get(kind, {}).get(current, {}).items():
+                        if neighbour not in reached and not (unconditional and conditional):
+                            reached[neighbour] = (reached[current][0] + 1, current)
+                            following.append(neighbour)
+            frontier = following
+        del reached[start]
+        return reached
+
+    def dependents(self, name, kinds=RUN_KINDS, unconditional=False):
+        """ Recipes requiring `name`, transitively: {recipe: (distance, the recipe it requires on the way)} """
+        return self._closure(self.required_by, name, kinds, unconditional)
+
+    def dependencies(self, recipe, kinds=RUN_KINDS, unconditional=False):
+        """ Names required by `recipe`, transitively: {name: (distance, the recipe requiring it on the way)} """
+        return self._closure(self.requires, recipe, kinds, unconditional)
+
+
+def _state(connection):
+    """ Changes whenever a file of the database is added, removed or updated """
+    return connection.execute("SELECT COUNT(*), TOTAL(mtime_ns), TOTAL(size) FROM files").fetchone()
+
+
+def load(connection, cache_path):
+    """ The DependencyGraph of the database, from its pickled adjacency index when still valid """
+    state = _state(connection)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_state, requires, required_by = pickle.load(f)
+        if cached_state == state:
+            return DependencyGraph(requires, required_by)
+    except (OSError, pickle.PickleError, EOFError, ValueError):
+        pass
+    graph = DependencyGraph.from_database(connection)
+    partial = f"{cache_path}.{os.getpid()}.partial"
+    with open(partial, "wb") as f:
+        pickle.dump((state, graph.requires, graph.required_by), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial, cache_path)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the static dependency graph of the recipes.")
+    parser.add_argument("--database", default=default_database_path(), help="(default: %(default)s)")
+    parser.add_argument("--no-update", action="store_true", help="query the database as it is.")
+    parser.add_argument("--build", action="store_true", help="also follow build and tool requirements.")
+    parser.add_argument("--unconditional", action="store_true",
+                        help="only follow the requirements not depending on options, settings or loops.")
+    parser.add_argument("--json", action="store_true", help="print a JSON document.")
+    parser.add_argument("command", choices=["dependents", "requires"],
+                        help="'dependents': what must be rebuilt if the recipe changes; 'requires': what it needs.")
+    parser.add_argument("recipe", help="recipe name, e.g. 'openssl'.")
+    args = parser.parse_args()
+
+    connection = connect(args.database)
+    if not args.no_update:
+        recipe_dirs = sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+        update(connection, recipe_dirs, complete=True)
+
+    start = time.perf_counter()
+    graph = load(connection, f"{args.database}.graph.pickle")
+    kinds = BUILD_KINDS if args.build else RUN_KINDS
+    if args.command == "dependents":
+        closure = graph.dependents(args.recipe, kinds, args.unconditional)
+    else:
+        closure = graph.dependencies(args.recipe, kinds, args.unconditional)
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(closure.items(), key=lambda item: (item[1][0], item[0]))
+    if args.json:
+        print(json.dumps([{"recipe": name, "distance": distance, "through": parent}
+                          for name, (distance, parent) in ordered], indent=2))
+    else:
+        for name, (distance, parent) in ordered:
+            print(f"{distance}  {name}" + (f"  (through {parent})" if distance > 1 else ""))
+    print(f"{len(closure)} recipes in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
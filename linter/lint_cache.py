@@ -0,0 +1,166 @@
+"""
+On-disk result cache for the CCI pylint plugins.
+
+Only the CCI E90xx/W90xx messages depend on nothing but a file's content: what
+astroid infers, behind the no-member or import-error messages, also depends on the
+Python version, on the installed Conan the transforms read and on the modules the
+recipe imports from its folder, like `helpers.py`. The messages pylint reports for
+a file are reused as long as neither the file, the other modules of its folder,
+the plugins in `linter/`, pylint/astroid, Conan, Python nor the rcfile changed.
+Entries are JSON files keyed by a hash of all of those, and the least recently used
+ones are evicted once the cache grows over its size limit.
+
+    python -m linter.lint_cache stats
+    python -m linter.lint_cache clear
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cci-linter")
+
+
+def plugin_version():
+    """ Hash of the Python, pylint/astroid and Conan versions and of every module in `linter/` """
+    import astroid
+    import pylint
+    from linter.conans_stubs import conan_version
+
+    python = ".".join(map(str, sys.version_info))
+    digest = hashlib.sha256(f"python={python};pylint={pylint.__version__};astroid={astroid.__version__};"
+                            f"conan={conan_version()}".encode())
+    for module in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        with open(module, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+       Messages per (content of a file and its folder's modules, path, plugin version, rcfile) stored under
+       `directory`
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    @property
+    def _stats_path(self):
+        return os.path.join(self.directory, "stats.json")
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, "results", key[:2], f"{key}.json")
+
+    @staticmethod
+    def key(sources_digest, path, plugins, rcfile_digest):
+        return hashlib.sha256("\n".join([sources_digest, os.path.normpath(path), plugins, rcfile_digest]).encode()).hexdigest()
+
+    def get(self, key):
+        entry = self._entry_path(key)
+        try:
+            with open(entry, encoding="utf-8") as f:
+                messages = [tuple(m) for m in json.load(f)]
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(entry)  # Keep track of recently used entries for eviction
+        self.hits += 1
+        return messages
+
+    def put(self, key, messages):
+        entry = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(messages, f)
+        os.replace(tmp, entry)
+        self._dirty = True
+
+    def entries(self):
+        """ Yield (mtime, size, path) for every stored entry """
+        for entry in glob.glob(os.path.join(self.directory, "results", "*", "*.json")):
+            try:
+                stat = os.stat(entry)
+            except OSError:
+                continue
+            yield stat.st_mtime, stat.st_size, entry
+
+    def evict(self):
+        """ Remove the least recently used entries until the cache fits in `max_bytes` """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry)
+            except OSError:
+                continue
+            total -= size
+        return total
+
+    def stats(self):
+        try:
+            with open(self._stats_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def flush(self):
+        """ Persist the hit/miss counters and enforce the size limit """
+        if self._dirty:
+            self.evict()
+            self._dirty = False
+        if not self.hits and not self.misses:
+            return
+        stats = self.stats()
+        stats["hits"] = stats.get("hits", 0) + self.hits
+        stats["misses"] = stats.get("misses", 0) + self.misses
+        self.hits = self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._stats_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+
+    def clear(self):
+        for _, _, entry in list(self.entries()):
+            os.remove(entry)
+        if os.path.exists(self._stats_path):
+            os.remove(self._stats_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the on-disk result cache of the CCI pylint plugins.")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="cache location (default: %(default)s)")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir)
+    if args.command == "clear":
+        cache.clear()
+        return
+
+    stats = cache.stats()
+    entries = list(cache.entries())
+    lookups = stats["hits"] + stats["misses"]
+    ratio = f" ({100.0 * stats['hits'] / lookups:.1f}% hit rate)" if lookups else ""
+    print(f"Cache directory: {cache.directory}")
+    print(f"Entries: {len(entries)} ({sum(size for _, size, _ in entries) / 1024:.1f} KiB)")
+    print(f"Hits: {stats['hits']}, misses: {stats['misses']}{ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Lint the whole repository with a pool of long-lived pylint workers.
+
+Recipe directories (`recipes/<name>`) are sharded across worker processes.
+Every worker initializes a single `linter.lint_server.LintSession`, so pylint,
+the CCI plugins and the astroid cache are set up once per process instead of
+once per recipe. Messages from all workers are merged and sorted, so the output
+does not depend on scheduling and is matched by `linter/recipe_linter.json`.
+
+    python -m linter.lint_parallel --rcfile=linter/pylintrc_recipe
+    python -m linter.lint_parallel --rcfile=linter/pylintrc_testpackage --files "test_package/conanfile.py"
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+
+from linter.lint_cache import ResultCache, default_cache_dir
+from linter.lint_server import LintSession, format_message
+
+
+_session = None
+
+
+def _init_worker(rcfile, cache_dir):
+    global _session
+    _session = LintSession(rcfile, cache=ResultCache(cache_dir) if cache_dir else None)
+
+
+def _lint_shard(paths):
+    return _session.messages(paths)
+
+
+def shard(recipe_dirs, pattern, size):
+    """ Group the files matching `pattern` below each `recipes/<name>/<folder>/` in shards of `size` recipes """
+    shards = []
+    for i in range(0, len(recipe_dirs), size):
+        paths = []
+        for recipe_dir in recipe_dirs[i:i + size]:
+            paths.extend(sorted(glob.glob(os.path.join(recipe_dir, "*", pattern))))
+        if paths:
+            shards.append(paths)
+    return shards
+
+
+def lint(recipe_dirs, rcfile, pattern="conanfile.py", jobs=None, shard_size=8, cache_dir=None):
+    """ Sorted (path, (line, msg_id, symbol, obj, msg)) for every file matching `pattern` in `recipe_dirs` """
+    shards = shard(sorted(recipe_dirs), pattern, shard_size)
+    jobs = min(jobs or os.cpu_count() or 1, len(shards) or 1)
+    messages = []
+    if jobs == 1:
+        _init_worker(rcfile, cache_dir)
+        for paths in shards:
+            messages.extend(_lint_shard(paths))
+    else:
+        with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(rcfile, cache_dir)) as pool:
+            for result in pool.imap_unordered(_lint_shard, shards):
+                messages.extend(result)
+    messages.sort(key=lambda m: (m[0], m[1][0], m[1][1], m[1][3], m[1][4]))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lint every recipe in parallel, with one initialized pylint per worker process."
+    )
+    parser.add_argument("--rcfile", required=True, help="pylint configuration, e.g. linter/pylintrc_recipe")
+    parser.add_argument("--files", default="conanfile.py",
+                        help="files to lint, relative to each recipe folder (default: %(default)s)")
+    parser.add_argument("--recipes", nargs="*", default=None,
+                        help="recipe directories to lint (default: every directory in recipes/)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=8, help="recipes handed to a worker at once (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="on-disk result cache (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the on-disk result cache")
+    parser.add_argument("--output", help="write the results to this file instead of stdout")
+    args = parser.parse_args()
+
+    recipe_dirs = args.recipes if args.recipes is not None else [
+        d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d)
+    ]
+    messages = lint(recipe_dirs, args.rcfile, pattern=args.files, jobs=args.jobs, shard_size=args.shard_size,
+                    cache_dir=None if args.no_cache else args.cache_dir)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for path, message in messages:
+            print(format_message(path, message), file=out)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
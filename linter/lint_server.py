@@ -0,0 +1,215 @@
+"""
+Long-lived lint server for ConanCenterIndex recipes.
+
+Starting pylint, loading the CCI plugins and letting astroid infer the Conan
+classes used by `linter.transform_conanfile` dominates the cost of linting a
+single recipe. This module keeps one initialized PyLinter (and therefore the
+astroid MANAGER cache and its registered transforms) alive between requests,
+and only lints again those files whose content, or that of the other modules of
+their folder, changed since the last request.
+
+Results use pylint's `parseable` format, so `linter/recipe_linter.json` matches
+them exactly as it does in GitHub Actions.
+
+    # Serve requests read from stdin: one line of paths in, results + empty line out
+    python -m linter.lint_server --rcfile=linter/pylintrc_recipe
+
+    # Serve requests over a Unix socket, and query it from another shell
+    python -m linter.lint_server --rcfile=linter/pylintrc_recipe --socket /tmp/cci-lint.sock
+    python -m linter.lint_server --connect /tmp/cci-lint.sock recipes/fmt/all/conanfile.py
+
+    # Lint once, reusing the on-disk results of `linter.lint_cache` for unchanged files
+    python -m linter.lint_server --rcfile=linter/pylintrc_recipe recipes/*/*/conanfile.py
+
+Changes to the plugins in `linter/` are not picked up by a running server, restart it instead.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import socket
+import socketserver
+import sys
+
+import astroid
+from pylint.config.config_initialization import _config_initialization
+from pylint.lint import PyLinter
+from pylint.reporters import CollectingReporter
+
+from linter.cci_messages import MESSAGE_FORMAT
+from linter.lint_cache import ResultCache, default_cache_dir, plugin_version
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def sources_digest(path):
+    """ Digest of a file and of the other modules of its folder, which it may import like `helpers.py` """
+    digest = hashlib.sha256(file_digest(path).encode())
+    for module in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(path)), "*.py"))):
+        if os.path.abspath(module) != os.path.abspath(path):
+            digest.update(f"\n{os.path.basename(module)}:{file_digest(module)}".encode())
+    return digest.hexdigest()
+
+
+def format_message(path, message):
+    line, msg_id, symbol, obj, msg = message
+    return MESSAGE_FORMAT.format(path=path, line=line, msg_id=msg_id, symbol=symbol, obj=obj, msg=msg)
+
+
+class LintSession:
+    """
+       One PyLinter configured from an rcfile, reused for every request
+    """
+
+    def __init__(self, rcfile, cache=None):
+        self.rcfile = rcfile
+        self.cache = cache
+        if cache is not None:
+            self._plugins = plugin_version()
+            self._rcfile_digest = file_digest(rcfile)
+        self.reporter = CollectingReporter()
+        self.linter = PyLinter(pylintrc=rcfile)
+        self.linter.load_default_plugins()
+        _config_initialization(self.linter, [], self.reporter, config_file=rcfile)
+        self.linter.disable("I")
+        # Reported across files: it depends on which files are linted together, not on their content.
+        # GitHub Actions lints one recipe per pylint call, where it never triggers either
+        self.linter.disable("duplicate-code")
+        # abspath -> (sources digest, [(line, msg_id, symbol, obj, msg), ...])
+        self._results = {}
+
+    def lint(self, paths):
+        """ Return the parseable lines for `paths`, linting only the files that changed """
+        return [format_message(path, m) for path, m in self.messages(paths)]
+
+    def messages(self, paths):
+        """ Return (path, (line, msg_id, symbol, obj, msg)) for `paths`, linting only the files that changed """
+        digests = {}
+        stale = []
+        for path in paths:
+            abspath = os.path.abspath(path)
+            if abspath in digests:
+                continue
+            digests[abspath] = sources_digest(path) if os.path.isfile(path) else None
+            if digests[abspath] is None:
+                stale.append(path)
+                continue
+            cached = self._results.get(abspath)
+            if cached is not None and cached[0] == digests[abspath]:
+                continue
+            messages = self.cache.get(self._cache_key(path, digests[abspath])) if self.cache else None
+            if messages is None:
+                stale.append(path)
+            else:
+                self._results[abspath] = (digests[abspath], messages)
+
+        fresh = self.check(stale) if stale else {}
+        for path in stale:
+            abspath = os.path.abspath(path)
+            # Files which could not be read are reported, but never cached
+            if digests[abspath] is not None:
+                self._results[abspath] = (digests[abspath], fresh[abspath])
+                if self.cache:
+                    self.cache.put(self._cache_key(path, digests[abspath]), fresh[abspath])
+        if self.cache:
+            self.cache.flush()
+
+        result = []
+        for path in paths:
+            abspath = os.path.abspath(path)
+            if abspath in fresh:
+                messages = fresh[abspath]
+            else:
+                messages = self._results.get(abspath, (None, []))[1]
+            result.extend((path, m) for m in messages)
+        return result
+
+    def _cache_key(self, path, digest):
+        return ResultCache.key(digest, path, self._plugins, self._rcfile_digest)
+
+    def check(self, paths):
+        """ Run pylint over `paths` and group the messages by absolute file path """
+        abspaths = {os.path.abspath(p) for p in paths}
+        # Modules are cached by name (every recipe is `conanfile`), drop any stale tree for these files
+        for name, module in list(astroid.MANAGER.astroid_cache.items()):
+            if module.file and os.path.abspath(module.file) in abspaths:
+                del astroid.MANAGER.astroid_cache[name]
+
+        self.reporter.messages = []
+        self.linter.check(list(paths))
+        grouped = {abspath: [] for abspath in abspaths}
+        for m in self.reporter.messages:
+            grouped.setdefault(os.path.abspath(m.abspath), []).append(
+                (m.line, m.msg_id, m.symbol, m.obj, m.msg))
+        return grouped
+
+
+def serve_stdio(session, stdin=sys.stdin, stdout=sys.stdout):
+    for message in stdin:
+        paths = message.split()
+        if paths:
+            for line in session.lint(paths):
+                print(line, file=stdout)
+        print(file=stdout, flush=True)
+
+
+def serve_socket(session, address):
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            paths = self.rfile.read().decode("utf-8").split()
+            lines = session.lint(paths)
+            self.wfile.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+
+    if os.path.exists(address):
+        os.unlink(address)
+    # Requests are served one at a time: pylint and astroid are not thread-safe
+    with socketserver.UnixStreamServer(address, _Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(address)
+
+
+def request(address, paths):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(address)
+        client.sendall("\n".join(paths).encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("r", encoding="utf-8") as response:
+            for line in response:
+                sys.stdout.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep pylint and the CCI plugins warm, re-linting only the recipes that changed."
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--rcfile", help="pylint configuration, e.g. linter/pylintrc_recipe")
+    group.add_argument("--connect", metavar="SOCKET", help="send `paths` to a running server and print the results")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of reading requests from stdin")
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="on-disk result cache (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the on-disk result cache")
+    parser.add_argument("paths", nargs="*", help="files to lint once (or to send to a server with --connect)")
+    args = parser.parse_args()
+
+    if args.connect:
+        request(args.connect, args.paths)
+        return
+
+    session = LintSession(args.rcfile, cache=None if args.no_cache else ResultCache(args.cache_dir))
+    if args.paths:
+        for line in session.lint(args.paths):
+            print(line)
+    elif args.socket:
+        serve_socket(session, args.socket)
+    else:
+        serve_stdio(session)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Rank the mirror URLs of conandata.yml sources from what was observed of their hosts.
+
+Sources like qt/6.x.x list many mirrors, which Conan tries in list order: a dead first mirror
+costs a timeout on every download. A per-host history of latencies and failures is kept in the
+linter cache directory, fed by probing the mirrors or by fetching archives through this tool,
+and used to order the URLs by the time they are expected to cost:
+
+    failure rate * timeout + (1 - failure rate) * latency
+
+Both are moving averages, so that a host recovers from failures once it works again. Hosts never
+seen get PRIOR_LATENCY and PRIOR_FAILURE_RATE, and equally ranked URLs keep their list order.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from lint_cache import default_cache_dir
+from recipe_index import index_sources, index_versions
+from source_archives import CHUNK_SIZE
+
+
+DEFAULT_TIMEOUT = 30.0
+PRIOR_LATENCY = 1.0
+PRIOR_FAILURE_RATE = 0.1
+# Weight of the latest observation in the moving averages
+SMOOTHING = 0.3
+
+
+def host(url):
+    return urlsplit(url).netloc.lower()
+
+
+class HostHistory:
+    """
+       Latency and failure rate of every host seen, persisted as JSON
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.hosts = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.hosts = {}
+
+    def record(self, url, latency=None, failed=False):
+        """ Record a request to the host of `url`: its latency when it succeeded, or its failure """
+        entry = self.hosts.setdefault(host(url), {
+            "latency": PRIOR_LATENCY, "failure_rate": PRIOR_FAILURE_RATE, "successes": 0, "failures": 0,
+        })
+        entry["failure_rate"] += SMOOTHING * ((1.0 if failed else 0.0) - entry["failure_rate"])
+        if failed:
+            entry["failures"] += 1
+        else:
+            entry["successes"] += 1
+            entry["latency"] += SMOOTHING * (latency - entry["latency"])
+        entry["last_seen"] = time.time()
+
+    def host_cost(self, name, timeout=DEFAULT_TIMEOUT):
+        """ Seconds a request to host `name` is expected to cost, failures counting for a whole timeout """
+        entry = self.hosts.get(name, {"latency": PRIOR_LATENCY, "failure_rate": PRIOR_FAILURE_RATE})
+        return entry["failure_rate"] * timeout + (1.0 - entry["failure_rate"]) * entry["latency"]
+
+    def rank(self, urls, timeout=DEFAULT_TIMEOUT):
+        """ `urls` from the cheapest to the most expensive, in list order when they cost the same """
+        return sorted(urls, key=lambda url: self.host_cost(host(url), timeout))
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        partial = f"{self.path}.{os.getpid()}.partial"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(self.hosts, f, indent=1, sort_keys=True)
+        os.replace(partial, self.path)
+
+
+def default_history_path():
+    return os.path.join(default_cache_dir(), "mirror-history.json")
+
+
+def probe(url, timeout=DEFAULT_TIMEOUT):
+    """ Seconds until `url` answers a HEAD request successfully, or None when it fails """
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=timeout):
+            return time.perf_counter() - start
+    except urllib.error.HTTPError as e:
+        # Some servers only answer GET requests: the host is alive all the same
+        return time.perf_counter() - start if e.code == 405 else None
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+def probe_all(history, urls, timeout=DEFAULT_TIMEOUT, jobs=16):
+    """ Probe every URL at the same time and record the outcomes """
+    with ThreadPoolExecutor(jobs) as pool:
+        for url, latency in zip(urls, pool.map(lambda url: probe(url, timeout), urls)):
+            history.record(url, latency=latency, failed=latency is None)
+
+
+def fetch(history, urls, destination, sha256=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Download the first of the ranked `urls` which works, and whose content matches `sha256` when given.
+    Every attempt is recorded in `history`. Returns the URL used, or None when they all failed.
+    """
+    for url in history.rank(urls, timeout):
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        partial = f"{destination}.partial"
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response, open(partial, "wb") as f:
+                latency = time.perf_counter() - start
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"{url}: {e}", file=sys.stderr)
+            history.record(url, failed=True)
+            continue
+        if sha256 and digest.hexdigest() != sha256:
+            print(f"{url}: content hashes to {digest.hexdigest()}, {sha256} expected", file=sys.stderr)
+            history.record(url, failed=True)
+            continue
+        history.record(url, latency=latency)
+        os.replace(partial, destination)
+        return url
+    if os.path.exists(f"{destination}.partial"):
+        os.remove(f"{destination}.partial")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the mirror URLs of conandata.yml sources.")
+    parser.add_argument(
+        "--history",
+        default=default_history_path(),
+        help="JSON file of the host history (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="seconds before a request is considered failed (default: %(default)s).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    rank_parser = commands.add_parser("rank", help="print the ranked URLs of the sources listing several.")
+    rank_parser.add_argument("recipes", nargs="*", help="recipe directories (default: every recipe in recipes/).")
+    rank_parser.add_argument("--probe", action="store_true", help="probe every URL first.")
+    rank_parser.add_argument("--json", action="store_true", help="print a JSON document.")
+    fetch_parser = commands.add_parser("fetch", help="download the sources of a version, trying the best URLs first.")
+    fetch_parser.add_argument("recipe", help="recipe directory, e.g. 'recipes/qt'.")
+    fetch_parser.add_argument("version")
+    fetch_parser.add_argument("--store", required=True, help="source store to download to, see source_store.py.")
+    commands.add_parser("hosts", help="print the history of every host, best first.")
+    args = parser.parse_args()
+
+    history = HostHistory(args.history)
+    if args.command == "hosts":
+        for name, entry in sorted(history.hosts.items(), key=lambda item: history.host_cost(item[0], args.timeout)):
+            print(f"{name}: {history.host_cost(name, args.timeout):7.2f} s expected,"
+                  f" latency {entry['latency']:.2f} s, failure rate {entry['failure_rate']:.2f}"
+                  f" ({entry['successes']} successes, {entry['failures']} failures)")
+        return
+
+    if args.command == "fetch":
+        import tempfile
+        from source_store import SourceStore
+
+        store = SourceStore(args.store)
+        sources = index_sources(index_versions([args.recipe]).values())
+        failed = False
+        for sha256, refs in sorted(sources.items()):
+            urls = [url for ref in refs if ref.version == args.version for url in ref.urls]
+            if not urls or sha256 in store:
+                continue
+            os.makedirs(store.directory, exist_ok=True)
+            # Downloaded next to the store, so that adding the archive is a rename
+            with tempfile.TemporaryDirectory(prefix=".download-", dir=store.directory) as tmp:
+                destination = os.path.join(tmp, os.path.basename(urlsplit(urls[0]).path) or sha256)
+                url = fetch(history, urls, destination, sha256, args.timeout)
+                history.save()
+                if url is None:
+                    failed = True
+                    continue
+                store.add(destination, sha256, os.path.getsize(destination),
+                          {f"{ref.recipe}/{ref.version}" for ref in refs}, move=True)
+            store.save()
+            print(f"{sha256} {url}")
+        sys.exit(1 if failed else 0)
+
+    recipe_dirs = args.recipes or sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+    sources = index_sources(index_versions(recipe_dirs).values())
+    entries = [(ref, sha256) for sha256, refs in sources.items() for ref in refs if len(ref.urls) > 1]
+    if args.probe:
+        probe_all(history, sorted({url for ref, _ in entries for url in ref.urls}), args.timeout)
+        history.save()
+
+    plan = [
+        {
+            "recipe": ref.recipe,
+            "version": ref.version,
+            "where": "/".join(ref.where),
+            "sha256": sha256,
+            "urls": history.rank(ref.urls, args.timeout),
+        }
+        for ref, sha256 in sorted(entries, key=lambda entry: (entry[0].recipe, entry[0].version, entry[0].where))
+    ]
+    if args.json:
+        print(json.dumps(plan, indent=2))
+        return
+    for entry in plan:
+        where = f" ({entry['where']})" if entry["where"] else ""
+        print(f"{entry['recipe']}/{entry['version']}{where}:")
+        for url in entry["urls"]:
+            print(f"  {history.host_cost(host(url), args.timeout):7.2f} s  {url}")
+
+
+if __name__ == "__main__":
+    main()
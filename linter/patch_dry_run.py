@@ -0,0 +1,214 @@
+"""
+Check that the patches of conandata.yml apply to their sources, without building anything.
+
+Every version listing patches is checked against the archive of its `sources` entry, found by
+its `sha256` in a local directory (see source_archives.py): no network access is needed.
+Patches are applied in order with patch_ng, like `apply_conandata_patches()` does, to a scratch
+copy of the files they touch. Versions sharing an archive are checked by the same worker, which
+reads the archive only once.
+"""
+
+import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import posixpath
+import shutil
+import sys
+import tempfile
+import patch_ng
+from recipe_index import index_versions
+from source_archives import extract, index_archives
+from yaml_linting import print_findings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dry-run the patches of conandata.yml against local source archives."
+    )
+    parser.add_argument(
+        "recipes",
+        nargs="*",
+        help="recipe directories to check, e.g. 'recipes/fmt' (default: every recipe in recipes/).",
+    )
+    parser.add_argument(
+        "--archives",
+        required=True,
+        help="directory of source archives named after their sha256, e.g. '<sha256>.tar.gz'.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print the findings as a JSON document instead of GitHub annotations.",
+    )
+    args = parser.parse_args()
+
+    recipe_dirs = args.recipes or sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+    by_archive, skipped = collect(index_versions(recipe_dirs).values())
+    archives = index_archives(args.archives)
+    missing = sorted(sha256 for sha256 in by_archive if sha256 not in archives)
+    tasks = [(archives[sha256], versions) for sha256, versions in by_archive.items() if sha256 in archives]
+    # Archives shared by the most versions first, so that the longest tasks do not start last
+    tasks.sort(key=lambda task: len(task[1]), reverse=True)
+
+    findings = []
+    with multiprocessing.Pool(max(1, min(args.jobs, len(tasks)))) as pool:
+        for result in pool.imap_unordered(dry_run, tasks):
+            findings.extend(result)
+    findings.sort(key=lambda finding: (finding["file"], finding["line"] or 0))
+
+    checked = sum(len(versions) for _, versions in tasks)
+    print_findings(findings, as_json=args.json, recipes=len(recipe_dirs), checked=checked,
+                   archives=len(tasks), missing_archives=len(missing), skipped=skipped)
+    print(f"{checked} versions checked against {len(tasks)} archives, {len(missing)} archives not found,"
+          f" {len(skipped)} versions skipped", file=sys.stderr)
+
+
+def collect(recipes):
+    """
+    ({sha256: [versions to check]}, [skipped versions]) for the versions of `recipes` with patches.
+
+    Each version to check is a dict with the conandata.yml path and its patches as
+    (patch_file, base_path, line in conandata.yml). Versions whose sources are not a single archive
+    (several archives, or per-platform entries) are skipped: their layout is decided by the recipe.
+    """
+    by_archive = {}
+    skipped = []
+    for recipe in recipes:
+        for folder, data in recipe.conandata.items():
+            patches = data.get("patches")
+            sources = data.get("sources")
+            if not isinstance(patches, dict) or not isinstance(sources, dict):
+                continue
+            lines = recipe.patch_lines.get(folder, {})
+            for version, entries in patches.items():
+                source = sources.get(version)
+                if not isinstance(source, dict) or not isinstance(source.get("sha256"), str):
+                    skipped.append(f"{recipe.name}/{version}")
+                    continue
+                # Paired with their line by their position in the list: the patch_file of the others is not a
+                # path, which the schema linter reports
+                entries = [(entry, lines.get((version, position))) for position, entry in enumerate(entries)
+                           if isinstance(entry, dict) and isinstance(entry.get("patch_file"), str)] \
+                    if isinstance(entries, list) else []
+                if not entries:
+                    continue
+                by_archive.setdefault(source["sha256"].lower(), []).append({
+                    "recipe": recipe.name,
+                    "folder": folder,
+                    "version": version,
+                    "directory": os.path.join(recipe.recipe_dir, folder),
+                    "conandata": recipe.conandata_path(folder),
+                    "patches": [(entry["patch_file"], entry.get("base_path", ""), line) for entry, line in entries],
+                })
+    return by_archive, skipped
+
+
+class _Messages(logging.Handler):
+    """ Keeps the warnings and errors patch_ng logs, to explain why a patch does not apply """
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _candidates(patchset):
+    """ Paths patch_ng may look for when applying `patchset` with strip=0 """
+    paths = set()
+    for item in patchset.items:
+        for path in (item.source, item.target):
+            path = path.decode("utf-8", "replace").replace("\\", "/")
+            if path != "/dev/null":
+                paths.add(path)
+                if path.startswith(("a/", "b/")):
+                    paths.add(path[2:])
+    return paths
+
+
+def dry_run(task):
+    """ Findings for the versions sharing an archive, `task` being (archive path, versions) """
+    archive, versions = task
+    findings = []
+    patchsets = {}
+    wanted = set()
+    for version in versions:
+        for patch_file, base_path, line in version["patches"]:
+            path = os.path.join(version["directory"], patch_file)
+            if path in patchsets:
+                continue
+            # Missing files are reported by patch_files_linter.py
+            patchsets[path] = patch_ng.fromfile(path) if os.path.isfile(path) else None
+            if patchsets[path] is False:
+                findings.append(_finding(version, line, "patch-unparsable", f"Patch `{patch_file}` cannot be parsed."))
+            elif patchsets[path]:
+                base = posixpath.normpath(base_path.replace("\\", "/")) if base_path else ""
+                wanted.update(posixpath.normpath(posixpath.join(base, candidate))
+                              for candidate in _candidates(patchsets[path]))
+
+    with tempfile.TemporaryDirectory(prefix="cci-patch-dry-run-") as tmp:
+        try:
+            root = extract(archive, os.path.join(tmp, "archive"), wanted)
+        except Exception as e:  # corrupted or unsupported archives
+            return findings + [_finding(versions[0], None, "archive-unreadable", f"Cannot read `{archive}`: {e}")]
+
+        messages = _Messages()
+        logger = logging.getLogger("patch_ng")
+        logger.addHandler(messages)
+
+        for i, version in enumerate(versions):
+            scratch = os.path.join(tmp, str(i))
+            if os.path.isdir(root):
+                shutil.copytree(root, scratch)
+            else:
+                os.makedirs(scratch)
+            for patch_file, base_path, line in version["patches"]:
+                # fromfile() again: apply() consumes the items it creates or deletes
+                path = os.path.join(version["directory"], patch_file)
+                if not patchsets.get(path):
+                    continue
+                messages.messages.clear()
+                patchset = patch_ng.fromfile(path)
+                target = os.path.join(scratch, *base_path.replace("\\", "/").split("/")) if base_path else scratch
+                cwd = os.getcwd()
+                try:
+                    applied = os.path.isdir(target) and patchset.apply(root=target)
+                finally:
+                    os.chdir(cwd)
+                if not applied:
+                    details = "\n".join(messages.messages) or f"`{base_path}` does not exist in the sources."
+                    findings.append(_finding(version, line, "patch-failed",
+                                             f"Patch `{patch_file}` does not apply to the sources of version"
+                                             f" `{version['version']}`:\n{details}"))
+                    # The following patches would be applied to a half-patched tree
+                    break
+        logger.removeHandler(messages)
+    return findings
+
+
+def _finding(version, line, kind, message):
+    return {
+        "kind": kind,
+        "level": "error",
+        "title": "conandata.yml patch error",
+        "recipe": version["recipe"],
+        "folder": version["folder"],
+        "version": version["version"],
+        "file": version["conandata"],
+        "line": line,
+        "message": message,
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import glob
+import os
+import posixpath
+from recipe_index import index_patch_files, index_versions
+from yaml_linting import print_findings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the patches listed in conandata.yml exist, and that every patch file is listed."
+    )
+    parser.add_argument(
+        "recipes",
+        nargs="*",
+        help="recipe directories to check, e.g. 'recipes/fmt' (default: every recipe in recipes/).",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print the findings as a JSON document instead of GitHub annotations.",
+    )
+    args = parser.parse_args()
+
+    recipe_dirs = args.recipes or sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+    findings = []
+    for recipe in index_versions(recipe_dirs).values():
+        findings.extend(check(recipe, index_patch_files(recipe.recipe_dir, recipe.folders)))
+
+    print_findings(findings, as_json=args.json, recipes=len(recipe_dirs))
+
+
+def check(recipe, patch_files):
+    """ Findings for a recipe_index.RecipeVersions, given the patch files on disk of each of its folders """
+    findings = []
+    for folder, on_disk in patch_files.items():
+        referenced = set()
+        for version, patch_file, line in recipe.patch_files.get(folder, []):
+            patch_file = posixpath.normpath(patch_file.replace("\\", "/"))
+            referenced.add(patch_file)
+            if patch_file not in on_disk and not os.path.isfile(os.path.join(recipe.recipe_dir, folder, patch_file)):
+                findings.append({
+                    "kind": "missing-patch",
+                    "level": "error",
+                    "title": "conandata.yml patch not found",
+                    "recipe": recipe.name,
+                    "folder": folder,
+                    "version": version,
+                    "file": recipe.conandata_path(folder),
+                    "line": line,
+                    "message": f"Patch `{patch_file}` of version `{version}` does not exist in folder `{folder}`.",
+                })
+
+        for patch_file in sorted(on_disk - referenced):
+            findings.append({
+                "kind": "orphan-patch",
+                "level": "warning",
+                "title": "Unused patch file",
+                "recipe": recipe.name,
+                "folder": folder,
+                "version": None,
+                "file": os.path.join(recipe.recipe_dir, folder, patch_file),
+                "line": None,
+                "message": f"Patch `{patch_file}` is not listed for any version in `{folder}/conandata.yml`."
+                           f" You should either remove it, or add it to the `patches` section.",
+            })
+    return findings
+
+
+if __name__ == "__main__":
+    main()
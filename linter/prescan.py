@@ -0,0 +1,202 @@
+"""
+Pre-scan recipes for the CCI messages without running pylint.
+
+The CCI checkers only look at the syntax of a conanfile: class attributes,
+`from ... import` statements and calls to the built-in layouts. They can be
+evaluated with the standard `ast` module in a fraction of the time it takes
+pylint to build and infer astroid trees, so most files (which already follow
+the rules) can be discarded before running pylint.
+
+    # Files which can produce any CCI message, to be linted with pylint
+    python -m linter.prescan --rcfile=linter/pylintrc_recipe recipes/*/*/conanfile.py
+
+    # The CCI messages pylint would report, in pylint's parseable format
+    python -m linter.prescan --rcfile=linter/pylintrc_recipe --findings recipes/*/*/conanfile.py
+
+Files the pre-scan cannot decide on (syntax errors, `# pylint:` pragmas) are
+always listed as candidates for pylint, and never reported by `--findings`.
+"""
+
+import argparse
+import ast
+import configparser
+from pathlib import Path
+
+# Never the checkers themselves: they import pylint, which this module exists to avoid
+from linter.cci_messages import (DEPRECATED_IMPORTS, IMPORT_MESSAGES, IMPORT_MESSAGES_ORDER, LAYOUTS,
+                                 LAYOUT_SRC_FOLDER_MESSAGES, MESSAGE_FORMAT, PACKAGE_NAME_MESSAGES,
+                                 PRIVATE_TOOLS_MODULE, VERSION_ATTRIBUTE_MESSAGES)
+
+
+# symbol -> (msg_id, msg)
+MESSAGES = {
+    symbol: (msg_id, msg)
+    for table in (PACKAGE_NAME_MESSAGES, IMPORT_MESSAGES, LAYOUT_SRC_FOLDER_MESSAGES, VERSION_ATTRIBUTE_MESSAGES)
+    for msg_id, (msg, symbol, _) in table.items()
+}
+
+
+class Undecidable(Exception):
+    pass
+
+
+def enabled_messages(rcfile):
+    """ CCI message symbols left enabled by the `[MESSAGES CONTROL]` section of the rcfile """
+    config = configparser.ConfigParser(inline_comment_prefixes=("#",))
+    config.read(rcfile)
+    disabled = {n.strip() for n in config.get("MESSAGES CONTROL", "disable", fallback="").split(",")}
+    enabled = {n.strip() for n in config.get("MESSAGES CONTROL", "enable", fallback="").split(",")}
+    result = set()
+    for symbol, (msg_id, _) in MESSAGES.items():
+        names = {symbol, msg_id, msg_id[0], "all"}
+        if names & enabled or not names & disabled:
+            result.add(symbol)
+    return result
+
+
+def _attribute_value(attr, name):
+    """ The constant assigned to `name` by a class body statement, the way the checkers see it """
+    # Mirrors `len(children) == 2 and isinstance(children[0], AssignName) and isinstance(children[1], Const)`
+    if isinstance(attr, ast.Assign):
+        if len(attr.targets) != 1:
+            return None
+        target, value = attr.targets[0], attr.value
+    elif isinstance(attr, ast.AugAssign):
+        target, value = attr.target, attr.value
+    elif isinstance(attr, ast.AnnAssign) and attr.value is None:
+        target, value = attr.target, attr.annotation
+    else:
+        return None
+    if isinstance(target, ast.Name) and target.id == name and isinstance(value, ast.Constant):
+        return "..." if value.value is Ellipsis else repr(value.value)
+    return None
+
+
+class _Scanner(ast.NodeVisitor):
+    def __init__(self, is_test):
+        self.is_test = is_test
+        self.frames = []
+        self.findings = []
+
+    def report(self, symbol, line):
+        self.findings.append((line, symbol, ".".join(self.frames)))
+
+    def _visit_frame(self, node, name):
+        self.frames.append(name)
+        self.generic_visit(node)
+        self.frames.pop()
+
+    def visit_FunctionDef(self, node):
+        self._visit_frame(node, node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self._visit_frame(node, "<lambda>")
+
+    def visit_ClassDef(self, node):
+        self.frames.append(node.name)
+        if len(node.bases) == 1 and isinstance(node.bases[0], ast.Name) and node.bases[0].id == "ConanFile":
+            self._check_name(node)
+            self._check_version(node)
+        self.generic_visit(node)
+        self.frames.pop()
+
+    def _check_name(self, node):
+        for attr in node.body:
+            value = _attribute_value(attr, "name")
+            if value is not None:
+                if self.is_test:
+                    self.report("conan-test-no-name", attr.lineno)
+                elif value.lower() != value:
+                    self.report("conan-bad-name", attr.lineno)
+                return
+        if not self.is_test:
+            self.report("conan-missing-name", node.lineno)
+
+    def _check_version(self, node):
+        for attr in node.body:
+            value = _attribute_value(attr, "version")
+            if value is not None:
+                value = value.replace('"', "").replace("'", "")
+                if value and value != "system":
+                    self.report("conan-forced-version", attr.lineno)
+                return
+
+    def visit_ImportFrom(self, node):
+        basename = node.module or ""
+        deprecated = DEPRECATED_IMPORTS.get(basename)
+        if deprecated is not None:
+            found = {deprecated[alias.name] for alias in node.names if alias.name in deprecated}
+            for symbol in IMPORT_MESSAGES_ORDER:
+                if symbol in found:
+                    self.report(symbol, node.lineno)
+        elif basename.startswith("conan.tools.") and PRIVATE_TOOLS_MODULE.match(basename):
+            self.report("conan-import-tools", node.lineno)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in LAYOUTS:
+            for kw in node.keywords:
+                if kw.arg == "src_folder":
+                    if _as_string(kw.value).strip("\"'") != "src":
+                        self.report("conan-layout-src-folder-is-src", node.lineno)
+                    break
+            else:
+                self.report("conan-missing-layout-src-folder", node.lineno)
+        self.generic_visit(node)
+
+
+def _as_string(node):
+    """ Enough of astroid's `as_string()` to tell whether an expression reads `src` """
+    if isinstance(node, ast.Constant):
+        return "..." if node.value is Ellipsis else repr(node.value)
+    if isinstance(node, ast.Name):
+        return node.id
+    return "<expression>"
+
+
+def scan(path):
+    """ [(line, symbol, obj), ...] for all the CCI messages in `path`, regardless of the rcfile """
+    with open(path, "rb") as f:
+        source = f.read()
+    if b"pylint:" in source:
+        raise Undecidable(f"{path} contains pylint pragmas")
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except (SyntaxError, ValueError) as error:
+        raise Undecidable(f"{path} cannot be parsed: {error}")
+    scanner = _Scanner(is_test=Path(path).match("test_*/*.py"))
+    scanner.visit(tree)
+    return scanner.findings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find the recipes which can raise CCI messages, without running pylint."
+    )
+    parser.add_argument("--rcfile", required=True, help="pylint configuration, e.g. linter/pylintrc_recipe")
+    parser.add_argument("--findings", action="store_true",
+                        help="print the CCI messages pylint would report instead of the candidate files")
+    parser.add_argument("paths", nargs="+", help="files to scan")
+    args = parser.parse_args()
+
+    enabled = enabled_messages(args.rcfile)
+    for path in args.paths:
+        try:
+            findings = [f for f in scan(path) if f[1] in enabled]
+        except (Undecidable, OSError):
+            if not args.findings:
+                print(path)
+            continue
+        if not args.findings:
+            if findings:
+                print(path)
+            continue
+        for line, symbol, obj in findings:
+            msg_id, msg = MESSAGES[symbol]
+            print(MESSAGE_FORMAT.format(path=path, line=line, msg_id=msg_id, symbol=symbol, obj=obj, msg=msg))
+
+
+if __name__ == "__main__":
+    main()
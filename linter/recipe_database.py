@@ -0,0 +1,247 @@
+"""
+SQLite index of the metadata of every recipe: versions, sources, patches and requirements.
+
+Built from config.yml, conandata.yml and conanfile.py (read statically, see conanfile_requirements.py),
+and updated incrementally: only the files whose modification time or size changed since the last
+update are parsed again. Every row belongs to the file it was read from.
+
+    python3 linter/recipe_database.py update
+    python3 linter/recipe_database.py dependents zlib/1.2.13
+    python3 linter/recipe_database.py patches --type vulnerability
+    python3 linter/recipe_database.py sql "SELECT recipe, COUNT(*) FROM versions GROUP BY recipe"
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from conanfile_requirements import extract_file
+from lint_cache import default_cache_dir
+from recipe_index import key_lines, load_yaml, patch_lines, source_archives
+
+# Bumped whenever the tables or the way they are filled change: the database is then built again
+SCHEMA_VERSION = 3
+SCHEMA = """
+CREATE TABLE files (path TEXT PRIMARY KEY, recipe TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL);
+CREATE TABLE versions (recipe TEXT, version TEXT, folder TEXT, line INTEGER, file TEXT);
+CREATE TABLE sources (recipe TEXT, folder TEXT, version TEXT, location TEXT, position INTEGER, url TEXT,
+                      sha256 TEXT, file TEXT);
+CREATE TABLE patches (recipe TEXT, folder TEXT, version TEXT, patch_file TEXT, patch_type TEXT,
+                      patch_description TEXT, patch_source TEXT, base_path TEXT, line INTEGER, file TEXT);
+CREATE TABLE requirements (recipe TEXT, folder TEXT, kind TEXT, name TEXT, version TEXT, reference TEXT,
+                           conditional INTEGER, version_condition TEXT, line INTEGER, file TEXT);
+CREATE INDEX files_recipe ON files (recipe);
+CREATE INDEX versions_recipe ON versions (recipe);
+CREATE INDEX versions_file ON versions (file);
+CREATE INDEX sources_file ON sources (file);
+CREATE INDEX sources_sha256 ON sources (sha256);
+CREATE INDEX patches_file ON patches (file);
+CREATE INDEX patches_type ON patches (patch_type);
+CREATE INDEX requirements_file ON requirements (file);
+CREATE INDEX requirements_name ON requirements (name);
+"""
+DATA_TABLES = ("versions", "sources", "patches", "requirements")
+
+
+def default_database_path(recipes_root="recipes"):
+    """ One database per checkout, in the linter cache directory """
+    checkout = hashlib.sha256(os.path.abspath(recipes_root).encode()).hexdigest()[:16]
+    return os.path.join(default_cache_dir(), f"recipes-{checkout}.sqlite3")
+
+
+def connect(path):
+    """ Open the database, creating its tables if needed or if they are from another SCHEMA_VERSION """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path)
+    if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        tables = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            connection.execute(f"DROP TABLE {table}")
+        connection.executescript(SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+    return connection
+
+
+def recipe_files(recipe_dir):
+    """ The files of a recipe the database is built from, existing or not """
+    files = [os.path.join(recipe_dir, "config.yml")]
+    with os.scandir(recipe_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                files.append(os.path.join(entry.path, "conandata.yml"))
+                files.append(os.path.join(entry.path, "conanfile.py"))
+    return files
+
+
+def _rows_config(path, recipe):
+    data, node = load_yaml(path)
+    if not isinstance(data, dict) or not isinstance(data.get("versions"), dict):
+        return {}
+    lines = key_lines(node, "versions")
+    return {"versions": [
+        (recipe, version, entry.get("folder"), lines.get(version), path)
+        for version, entry in data["versions"].items() if isinstance(entry, dict)
+    ]}
+
+
+def _text(value):
+    """ A YAML value as text: the schema linters report the fields which are not plain strings """
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _rows_conandata(path, recipe, folder):
+    data, node = load_yaml(path)
+    if not isinstance(data, dict):
+        return {}
+    tables = {"sources": [], "patches": []}
+    if isinstance(data.get("sources"), dict):
+        for version, entry in data["sources"].items():
+            for where, urls, sha256 in source_archives(entry):
+                for position, url in enumerate(urls or [None]):
+                    tables["sources"].append(
+                        (recipe, folder, version, "/".join(where), position, url, _text(sha256), path))
+    if isinstance(data.get("patches"), dict):
+        lines = patch_lines(node)
+        for version, entries in data["patches"].items():
+            entries = entries if isinstance(entries, list) else []
+            for position, entry in enumerate(entries):
+                if not isinstance(entry, dict) or "patch_file" not in entry:
+                    continue
+                fields = [_text(entry.get(field)) for field in
+                          ("patch_file", "patch_type", "patch_description", "patch_source", "base_path")]
+                tables["patches"].append((recipe, folder, version, *fields, lines.get((version, position)), path))
+    return tables
+
+
+def _rows_conanfile(path, recipe, folder):
+    return {"requirements": [
+        (recipe, folder, requirement.kind, requirement.name, requirement.version, requirement.reference,
+         int(requirement.conditional), requirement.version_condition, requirement.line, path)
+        for requirement in extract_file(path)
+    ]}
+
+
+def rows(path):
+    """ {table: [row]} for a file of a recipe """
+    folder_dir, filename = os.path.split(path)
+    if filename == "config.yml":
+        return _rows_config(path, os.path.basename(folder_dir))
+    recipe, folder = os.path.basename(os.path.dirname(folder_dir)), os.path.basename(folder_dir)
+    if filename == "conandata.yml":
+        return _rows_conandata(path, recipe, folder)
+    return _rows_conanfile(path, recipe, folder)
+
+
+def update(connection, recipe_dirs, complete=False):
+    """
+    Parse again the files of `recipe_dirs` which changed since the last update. With `complete`,
+    `recipe_dirs` are all the recipes, and those not among them anymore are removed.
+    Returns the paths parsed again or removed.
+    """
+    recipe_dirs = [os.path.normpath(recipe_dir) for recipe_dir in recipe_dirs]
+    names = {os.path.basename(recipe_dir): recipe_dir for recipe_dir in recipe_dirs}
+    if complete:
+        stored = connection.execute("SELECT path, recipe, mtime_ns, size FROM files").fetchall()
+    else:
+        stored = []
+        for name in names:
+            stored += connection.execute("SELECT path, recipe, mtime_ns, size FROM files WHERE recipe = ?",
+                                         (name,)).fetchall()
+    stored = {path: (mtime_ns, size) for path, _, mtime_ns, size in stored}
+
+    current = {}
+    for name, recipe_dir in names.items():
+        if not os.path.isdir(recipe_dir):
+            continue
+        for path in recipe_files(recipe_dir):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            current[path.replace(os.sep, "/")] = (name, stat.st_mtime_ns, stat.st_size)
+
+    changed = [path for path, (_, mtime_ns, size) in current.items() if stored.get(path) != (mtime_ns, size)]
+    removed = [path for path in stored if path not in current]
+    with connection:
+        for path in changed + removed:
+            for table in DATA_TABLES:
+                connection.execute(f"DELETE FROM {table} WHERE file = ?", (path,))
+        connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+        for path in changed:
+            for table, values in rows(path).items():
+                if values:
+                    placeholders = ", ".join("?" * len(values[0]))
+                    connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", values)
+            connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, *current[path]))
+    return changed + removed
+
+
+def print_rows(cursor):
+    names = [column[0] for column in cursor.description]
+    results = cursor.fetchall()
+    widths = [max([len(name)] + [len(str(row[i])) for row in results]) for i, name in enumerate(names)]
+    print("  ".join(name.ljust(width) for name, width in zip(names, widths)).rstrip())
+    for row in results:
+        print("  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query an SQLite index of the metadata of every recipe.")
+    parser.add_argument("--database", default=default_database_path(), help="(default: %(default)s)")
+    parser.add_argument("--no-update", action="store_true", help="query the database as it is.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    update_parser = commands.add_parser("update", help="update the database, only for some recipes if given.")
+    update_parser.add_argument("recipes", nargs="*", help="recipe directories, e.g. 'recipes/zlib'.")
+    dependents_parser = commands.add_parser("dependents", help="list the recipes requiring a reference.")
+    dependents_parser.add_argument("reference", help="'name' or 'name/version'.")
+    patches_parser = commands.add_parser("patches", help="list the patches, of a type or a recipe.")
+    patches_parser.add_argument("recipe", nargs="?")
+    patches_parser.add_argument("--type", help="e.g. 'vulnerability'.")
+    versions_parser = commands.add_parser("versions", help="list the versions of a recipe.")
+    versions_parser.add_argument("recipe")
+    sql_parser = commands.add_parser("sql", help="run an SQL query.")
+    sql_parser.add_argument("query")
+    args = parser.parse_args()
+
+    connection = connect(args.database)
+    if not args.no_update:
+        start = time.perf_counter()
+        if args.command == "update" and args.recipes:
+            updated = update(connection, args.recipes)
+        else:
+            recipe_dirs = sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+            updated = update(connection, recipe_dirs, complete=True)
+        print(f"{len(updated)} files updated in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+    if args.command == "dependents":
+        name, _, version = args.reference.partition("/")
+        query = ("SELECT recipe, folder, kind, reference, conditional, version_condition, file, line"
+                 " FROM requirements WHERE name = ?")
+        parameters = [name]
+        if version:
+            query += " AND version = ?"
+            parameters.append(version)
+        print_rows(connection.execute(query + " ORDER BY recipe, folder, line", parameters))
+    elif args.command == "patches":
+        query = "SELECT recipe, version, patch_type, patch_file, patch_source FROM patches WHERE 1"
+        parameters = []
+        if args.type:
+            query += " AND patch_type = ?"
+            parameters.append(args.type)
+        if args.recipe:
+            query += " AND recipe = ?"
+            parameters.append(args.recipe)
+        print_rows(connection.execute(query + " ORDER BY recipe, version, line", parameters))
+    elif args.command == "versions":
+        print_rows(connection.execute("SELECT version, folder FROM versions WHERE recipe = ? ORDER BY line",
+                                      (args.recipe,)))
+    elif args.command == "sql":
+        print_rows(connection.execute(args.query))
+
+
+if __name__ == "__main__":
+    main()
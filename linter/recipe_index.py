@@ -0,0 +1,206 @@
+"""
+In-memory index of the recipes in the repository, built with a single pass over the file system.
+
+Used by the linters which cross-check several files of a recipe, so that a
+whole-repository run lists every directory exactly once.
+"""
+
+import os
+from collections import namedtuple
+
+
+def recipe_folders(recipe_dir):
+    """ {folder: whether it has a conanfile.py} for every `recipes/<name>/<folder>/` """
+    folders = {}
+    with os.scandir(recipe_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                folders[entry.name] = os.path.isfile(os.path.join(entry.path, "conanfile.py"))
+    return folders
+
+
+def index_recipe_folders(recipe_dirs):
+    """ {recipe_dir: recipe_folders(recipe_dir)} for every directory in `recipe_dirs` """
+    index = {}
+    for recipe_dir in recipe_dirs:
+        if recipe_dir not in index and os.path.isdir(recipe_dir):
+            index[recipe_dir] = recipe_folders(recipe_dir)
+    return index
+
+
+def load_yaml(path):
+    """
+    (data, root node) of a YAML file, every scalar read as a string like strictyaml does.
+
+    Returns (None, None) when the file does not exist or cannot be parsed; the schema
+    linters are the ones reporting invalid files.
+    """
+    import yaml
+
+    loader_class = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+    try:
+        with open(path, encoding="utf-8") as f:
+            loader = loader_class(f)
+            try:
+                node = loader.get_single_node()
+                return (loader.construct_document(node) if node is not None else None), node
+            finally:
+                loader.dispose()
+    except (OSError, yaml.YAMLError):
+        return None, None
+
+
+def key_lines(node, *keys):
+    """ {key: line} for the mapping found below `keys` in a YAML node tree, lines starting at 1 """
+    for key in keys:
+        if node is None or node.id != "mapping":
+            return {}
+        node = next((value for k, value in node.value if k.value == key), None)
+    if node is None or node.id != "mapping":
+        return {}
+    return {k.value: k.start_mark.line + 1 for k, _ in node.value}
+
+
+def _patch_file_nodes(node):
+    """ Yield (version, position in its list, `patch_file` value node) for the `patches` of a conandata.yml node """
+    patches = next((value for k, value in node.value if k.value == "patches"), None) if node.id == "mapping" else None
+    if patches is None or patches.id != "mapping":
+        return
+    for version, items in patches.value:
+        if items.id != "sequence":
+            continue
+        for position, item in enumerate(items.value):
+            if item.id != "mapping":
+                continue
+            for k, value in item.value:
+                if k.value == "patch_file":
+                    yield version.value, position, value
+
+
+def patch_files(node):
+    """ [(version, patch_file, line)] for every `patch_file` listed in the `patches` of a conandata.yml node """
+    return [(version, value.value, value.start_mark.line + 1)
+            for version, _, value in _patch_file_nodes(node) if value.id == "scalar"]
+
+
+def patch_lines(node):
+    """
+    {(version, position): line} of the `patch_file` of the entries of the `patches` of a conandata.yml node,
+    `position` being the index of the entry in the list of its version, whatever its value
+    """
+    return {(version, position): value.start_mark.line + 1 for version, position, value in _patch_file_nodes(node)}
+
+
+class RecipeVersions:
+    """
+       The versions of a recipe, as listed in its config.yml and in the conandata.yml of each folder
+    """
+
+    def __init__(self, recipe_dir, folders):
+        self.recipe_dir = recipe_dir
+        self.name = os.path.basename(os.path.normpath(recipe_dir))
+        self.folders = folders
+        self.config_path = os.path.join(recipe_dir, "config.yml")
+        # version -> (folder, line in config.yml)
+        self.config = {}
+        # folder -> parsed conandata.yml, for the folders which have one
+        self.conandata = {}
+        # folder -> {version: line in conandata.yml}, for the `sources` and `patches` sections
+        self.sources = {}
+        self.patches = {}
+        # folder -> [(version, patch_file, line in conandata.yml)]
+        self.patch_files = {}
+        # folder -> {(version, position in its list of patches): line of its patch_file in conandata.yml}
+        self.patch_lines = {}
+
+        data, node = load_yaml(self.config_path)
+        lines = key_lines(node, "versions")
+        if isinstance(data, dict) and isinstance(data.get("versions"), dict):
+            for version, entry in data["versions"].items():
+                if isinstance(entry, dict) and isinstance(entry.get("folder"), str):
+                    self.config[version] = (entry["folder"], lines.get(version))
+
+        for folder in folders:
+            data, node = load_yaml(self.conandata_path(folder))
+            if not isinstance(data, dict):
+                continue
+            self.conandata[folder] = data
+            self.sources[folder] = key_lines(node, "sources") if isinstance(data.get("sources"), dict) else {}
+            self.patches[folder] = key_lines(node, "patches") if isinstance(data.get("patches"), dict) else {}
+            self.patch_files[folder] = patch_files(node)
+            self.patch_lines[folder] = patch_lines(node)
+
+    def conandata_path(self, folder):
+        return os.path.join(self.recipe_dir, folder, "conandata.yml")
+
+    def versions(self, folder):
+        """ Versions of config.yml built from `folder` """
+        return [version for version, (f, _) in self.config.items() if f == folder]
+
+
+def index_versions(recipe_dirs, folders_index=None):
+    """ {recipe_dir: RecipeVersions} for every directory in `recipe_dirs`, reading each file once """
+    folders_index = folders_index or index_recipe_folders(recipe_dirs)
+    return {recipe_dir: RecipeVersions(recipe_dir, folders) for recipe_dir, folders in folders_index.items()}
+
+
+def index_patch_files(recipe_dir, folders):
+    """ {folder: set of `patches/...` paths relative to the folder} for every patch or diff file on disk """
+    index = {}
+    for folder in folders:
+        root = os.path.join(recipe_dir, folder)
+        found = set()
+        for dirpath, _, filenames in os.walk(os.path.join(root, "patches")):
+            for filename in filenames:
+                if filename.endswith((".patch", ".diff")):
+                    found.add(os.path.relpath(os.path.join(dirpath, filename), root).replace(os.sep, "/"))
+        index[folder] = found
+    return index
+
+
+def source_archives(entry, where=()):
+    """
+    (where, urls, sha256) for every archive of a conandata.yml `sources` entry, `where` being the keys
+    of the nested entries leading to it, like ("Linux", "x86_64") for per-platform binaries.
+    """
+    if isinstance(entry, list):
+        for i, item in enumerate(entry):
+            yield from source_archives(item, where + (str(i),))
+    elif isinstance(entry, dict):
+        if "sha256" in entry:
+            urls = entry.get("url")
+            urls = [urls] if isinstance(urls, str) else [url for url in urls or [] if isinstance(url, str)]
+            yield where, urls, entry["sha256"]
+        else:
+            for key, item in entry.items():
+                yield from source_archives(item, where + (key,))
+
+
+# An archive listed by a recipe: `where` are the keys of the nested entries leading to it, if any
+SourceReference = namedtuple("SourceReference", ["recipe", "version", "where", "urls", "file", "line"])
+
+
+def index_sources(recipes):
+    """
+    {sha256: [SourceReference]} for every archive listed by `recipes` (RecipeVersions), in the
+    `sources` of their conandata.yml and the `submodules` of their submoduledata.yml.
+    Archives used by several versions or recipes are listed once, with all their references.
+    """
+    index = {}
+    for recipe in recipes:
+        for folder in recipe.folders:
+            sections = [(recipe.conandata_path(folder), recipe.conandata.get(folder, {}).get("sources"),
+                         recipe.sources.get(folder, {}))]
+            path = os.path.join(recipe.recipe_dir, folder, "submoduledata.yml")
+            data, node = load_yaml(path)
+            if isinstance(data, dict):
+                sections.append((path, data.get("submodules"), key_lines(node, "submodules")))
+            for path, section, lines in sections:
+                if not isinstance(section, dict):
+                    continue
+                for version, entry in section.items():
+                    for where, urls, sha256 in source_archives(entry):
+                        if isinstance(sha256, str):
+                            index.setdefault(sha256.lower(), []).append(
+                                SourceReference(recipe.name, version, where, urls, path, lines.get(version)))
+    return index
@@ -0,0 +1,121 @@
+"""
+Local source archives, named after the `sha256` listed for them in conandata.yml.
+
+Any file whose name starts with the sha256 of its content is picked up, so a directory
+filled with `<sha256>` or `<sha256>.tar.gz` files works as an offline mirror.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+SHA256 = re.compile(r"[0-9a-f]{64}")
+CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE):
+    """ (sha256, size) of a file, read in fixed-size chunks so that memory use does not depend on its size """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+            size += read
+    return digest.hexdigest(), size
+
+
+def hash_mapped(path):
+    """ (sha256, size) of a file, hashed from a memory mapping of it: no copy into Python buffers """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+    return digest.hexdigest(), size
+
+
+def hash_files(paths, jobs, hash_function=hash_file):
+    """
+    Yield (path, (sha256, size) or the OSError raised) for every path, in order. Files are hashed
+    by a pool of threads: hashlib releases the GIL, so several files are hashed at the same time.
+    """
+
+    def digest(path):
+        try:
+            return path, hash_function(path)
+        except OSError as e:
+            return path, e
+
+    with ThreadPoolExecutor(jobs) as pool:
+        yield from pool.map(digest, paths)
+
+
+def index_archives(directory):
+    """ {sha256: path} for every archive found below `directory` """
+    index = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            sha256 = filename.split(".", 1)[0].lower()
+            if SHA256.fullmatch(sha256):
+                index.setdefault(sha256, os.path.join(dirpath, filename))
+    return index
+
+
+def _safe_name(name):
+    """ The member name as a relative POSIX path, or None when it would escape the destination """
+    name = name.replace("\\", "/").lstrip("/")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if not parts or ".." in parts:
+        return None
+    return "/".join(parts)
+
+
+def _members(path):
+    """ (name, open function or None for directories and links) for every member, in a single pass """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                yield info.filename, (None if info.is_dir() else lambda info=info: archive.open(info))
+    else:
+        with tarfile.open(path, "r|*") as archive:
+            for member in archive:
+                yield member.name, (lambda member=member: archive.extractfile(member)) if member.isfile() else None
+
+
+def extract(path, destination, wanted):
+    """
+    Extract the files of an archive whose path is in `wanted`, reading the archive once.
+
+    Paths are relative to the root Conan's `get(..., strip_root=True)` would extract to: the single
+    top-level folder of the archive when it has one, the archive itself otherwise. Returns that root.
+    """
+    top_levels = set()
+    nested = False
+    for name, open_member in _members(path):
+        name = _safe_name(name)
+        if name is None:
+            continue
+        top_level, _, rest = name.partition("/")
+        top_levels.add(top_level)
+        nested = nested or bool(rest)
+        if open_member is None or (name not in wanted and rest not in wanted):
+            continue
+        target = os.path.join(destination, *name.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open_member() as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+
+    if len(top_levels) == 1 and nested:
+        return os.path.join(destination, top_levels.pop())
+    return destination
@@ -0,0 +1,176 @@
+"""
+Content-addressed store of the source archives listed by the recipes, shared by all their versions.
+
+    <store>/manifest.json           {sha256: {"size": ..., "names": [...], "references": [...]}}
+    <store>/<sha256[:2]>/<sha256>   the archives
+
+Archives are stored once per sha256, whatever the number of recipes, versions or submodules
+(see open62541's submoduledata.yml) using them. A store can be given as `--archives` to
+patch_dry_run.py.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+from recipe_index import index_sources, index_versions
+from source_archives import SHA256, hash_files
+
+
+class SourceStore:
+    """
+       A directory of archives named after their sha256, and the manifest describing them
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+
+    def path(self, sha256):
+        return os.path.join(self.directory, sha256[:2], sha256)
+
+    def __contains__(self, sha256):
+        return sha256 in self.manifest
+
+    def add(self, path, sha256, size, refs=(), move=False):
+        """ Store the file at `path`, whose content hashes to `sha256`. Returns False when already stored. """
+        if sha256 in self.manifest:
+            entry = self.manifest[sha256]
+            entry["names"] = sorted(set(entry["names"]) | {os.path.basename(path)})
+            return False
+
+        target = self.path(sha256)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Written under a temporary name first, so that the store never holds a partial archive
+        partial = os.path.join(os.path.dirname(target), f".{sha256}.partial")
+        if move:
+            shutil.move(path, partial)
+        else:
+            try:
+                os.link(path, partial)
+            except OSError:
+                shutil.copyfile(path, partial)
+        os.replace(partial, target)
+        self.manifest[sha256] = {
+            "size": size,
+            "names": [os.path.basename(path)],
+            "references": sorted(refs),
+        }
+        return True
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        partial = self.manifest_path + ".partial"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(partial, self.manifest_path)
+
+
+def references(sources):
+    """ {sha256: ["name/version"]} for an index_sources() result, ignoring invalid checksums """
+    return {
+        sha256: sorted({f"{ref.recipe}/{ref.version}" for ref in refs})
+        for sha256, refs in sources.items()
+        if SHA256.fullmatch(sha256)
+    }
+
+
+def import_archives(store, directories, known, jobs, move=False, keep_unknown=False):
+    """ Add the files found in `directories` to the store. Returns the number of files per outcome. """
+    paths = []
+    for directory in directories:
+        for dirpath, _, filenames in os.walk(directory):
+            paths.extend(os.path.join(dirpath, filename) for filename in sorted(filenames))
+
+    counts = {"added": 0, "duplicate": 0, "unknown": 0, "unreadable": 0}
+    for path, result in hash_files(paths, jobs):
+        if isinstance(result, OSError):
+            print(f"Cannot read {path}: {result}", file=sys.stderr)
+            counts["unreadable"] += 1
+            continue
+        sha256, size = result
+        if sha256 not in known and not keep_unknown:
+            counts["unknown"] += 1
+        elif store.add(path, sha256, size, known.get(sha256, ()), move=move):
+            counts["added"] += 1
+        else:
+            counts["duplicate"] += 1
+    store.save()
+    return counts
+
+
+def verify(store, jobs):
+    """ [(sha256, problem)] for the archives of the store which are missing or whose content changed """
+    problems = []
+    for path, result in hash_files([store.path(sha256) for sha256 in sorted(store.manifest)], jobs):
+        sha256 = os.path.basename(path)
+        if isinstance(result, OSError):
+            problems.append((sha256, f"cannot be read: {result.strerror}"))
+        elif result[0] != sha256:
+            problems.append((sha256, f"content hashes to {result[0]}"))
+        elif result[1] != store.manifest[sha256]["size"]:
+            problems.append((sha256, f"size is {result[1]}, {store.manifest[sha256]['size']} expected"))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage a content-addressed store of source archives.")
+    parser.add_argument("--store", required=True, help="directory of the store, created if needed.")
+    parser.add_argument(
+        "--recipe",
+        action="append",
+        default=[],
+        help="recipe directory whose sources are considered, can be repeated (default: every recipe in recipes/).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of files hashed at the same time (default: number of CPUs).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="add the archives found in directories.")
+    import_parser.add_argument("directories", nargs="+")
+    import_parser.add_argument("--move", action="store_true", help="move the files instead of linking or copying them.")
+    import_parser.add_argument("--all", action="store_true", help="also store archives no recipe refers to.")
+    commands.add_parser("verify", help="hash every archive again and report the corrupted ones.")
+    commands.add_parser("missing", help="list the archives referred to by recipes which are not stored.")
+    commands.add_parser("stats", help="show how many archives are stored and how many versions they cover.")
+    args = parser.parse_args()
+
+    store = SourceStore(args.store)
+    if args.command == "verify":
+        problems = verify(store, args.jobs)
+        for sha256, problem in problems:
+            print(f"{store.path(sha256)}: {problem}")
+        print(f"{len(store.manifest)} archives verified, {len(problems)} with problems", file=sys.stderr)
+        sys.exit(1 if problems else 0)
+
+    recipe_dirs = args.recipe or sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+    sources = index_sources(index_versions(recipe_dirs).values())
+    known = references(sources)
+    if args.command == "import":
+        counts = import_archives(store, args.directories, known, args.jobs, move=args.move, keep_unknown=args.all)
+        print(", ".join(f"{count} {outcome}" for outcome, count in counts.items()))
+    elif args.command == "missing":
+        for sha256 in sorted(set(known) - set(store.manifest)):
+            ref = sources[sha256][0]
+            print(f"{sha256} {ref.urls[0] if ref.urls else '-'} {ref.recipe}/{ref.version}")
+    else:
+        stored = [sha256 for sha256 in known if sha256 in store]
+        print(f"{len(store.manifest)} archives stored, {sum(e['size'] for e in store.manifest.values())} bytes")
+        print(f"{len(stored)} of the {len(known)} archives referred to by recipes are stored,"
+              f" covering {sum(len(known[sha256]) for sha256 in stored)} of {sum(map(len, known.values()))}"
+              f" references")
+
+
+if __name__ == "__main__":
+    main()
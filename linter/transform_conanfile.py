@@ -7,6 +7,8 @@ import astroid
 from astroid.builder import AstroidBuilder
 from astroid.manager import AstroidManager
 
+from linter import conans_stubs
+
 
 def _settings_transform():
     module = AstroidBuilder(AstroidManager()).string_build(
@@ -38,15 +40,23 @@ def transform_conanfile(node):
 
     str_class = astroid.builtin_lookup("str")
     dict_class = astroid.builtin_lookup("dict")
-    info_class = astroid.MANAGER.ast_from_module_name("conans.model.info").lookup(
+    stubs = conans_stubs.load() if conans_stubs.enabled() else None
+
+    def module(name):
+        if stubs is not None:
+            # A single pre-built module with all the classes below, see linter/conans_stubs.py
+            return stubs
+        return astroid.MANAGER.ast_from_module_name(name)
+
+    info_class = module("conans.model.info").lookup(
         "ConanInfo")
-    build_requires_class = astroid.MANAGER.ast_from_module_name(
+    build_requires_class = module(
         "conans.client.graph.graph_manager").lookup("_RecipeBuildRequires")
-    file_copier_class = astroid.MANAGER.ast_from_module_name(
+    file_copier_class = module(
         "conans.client.file_copier").lookup("FileCopier")
-    file_importer_class = astroid.MANAGER.ast_from_module_name(
+    file_importer_class = module(
         "conans.client.importer").lookup("_FileImporter")
-    python_requires_class = astroid.MANAGER.ast_from_module_name(
+    python_requires_class = module(
         "conans.client.graph.python_requires").lookup("PyRequires")
 
     dynamic_fields = {
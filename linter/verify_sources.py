@@ -0,0 +1,143 @@
+"""
+Verify a local mirror of source archives against the `sha256` of every conandata.yml `sources` entry.
+
+Nested entries (per-platform binaries like recipes/cmake/binary) and submoduledata.yml files are
+included. An archive is looked up by its sha256 (see source_archives.py and source_store.py), then
+by the file names of its URLs. Each file is hashed once, by a pool of threads.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from recipe_index import index_sources, index_versions
+from source_archives import SHA256, hash_file, hash_files, hash_mapped, index_archives
+from yaml_linting import print_findings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify the sha256 of the archives of a local mirror against conandata.yml."
+    )
+    parser.add_argument(
+        "recipes",
+        nargs="*",
+        help="recipe directories to check, e.g. 'recipes/fmt' (default: every recipe in recipes/).",
+    )
+    parser.add_argument("--mirror", required=True, help="directory of the source archives.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of files hashed at the same time (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="hash memory mapped files instead of reading them in fixed-size chunks.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print the findings as a JSON document instead of GitHub annotations.",
+    )
+    args = parser.parse_args()
+
+    recipe_dirs = args.recipes or sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+    sources = index_sources(index_versions(recipe_dirs).values())
+    sources = {sha256: refs for sha256, refs in sources.items() if SHA256.fullmatch(sha256)}
+    files = locate(sources, args.mirror)
+
+    start = time.perf_counter()
+    # Largest files first, so that the pool does not end up waiting on a single one. Files which cannot be
+    # stat'ed, like broken links, go last and are reported as unreadable by the hashing
+    paths = sorted(set(files.values()), key=_size, reverse=True)
+    digests = dict(hash_files(paths, args.jobs, hash_mapped if args.mmap else hash_file))
+    seconds = time.perf_counter() - start
+
+    findings = []
+    for sha256, path in sorted(files.items()):
+        actual = digests[path]
+        if isinstance(actual, OSError):
+            problem = f"cannot be read: {actual.strerror}"
+        elif actual[0] != sha256:
+            problem = f"hashes to {actual[0]}"
+        else:
+            continue
+        for ref in sources[sha256]:
+            where = f" ({'/'.join(ref.where)})" if ref.where else ""
+            findings.append({
+                "kind": "checksum-mismatch",
+                "level": "error",
+                "title": "Source archive checksum mismatch",
+                "recipe": ref.recipe,
+                "version": ref.version,
+                "where": "/".join(ref.where),
+                "file": ref.file,
+                "line": ref.line,
+                "message": f"Archive `{path}` of version `{ref.version}`{where} {problem}, {sha256} expected.",
+            })
+
+    total = sum(digest[1] for digest in digests.values() if not isinstance(digest, OSError))
+    throughput = total / seconds / 1e9 if seconds else 0.0
+    print_findings(findings, as_json=args.json, recipes=len(recipe_dirs), archives=len(sources),
+                   verified=len(digests), missing=len(sources) - len(files), bytes=total,
+                   seconds=round(seconds, 3), gigabytes_per_second=round(throughput, 3))
+    print(f"{len(digests)} of {len(sources)} archives found and verified, {len(findings)} mismatches:"
+          f" {total / 1e9:.2f} GB in {seconds:.2f} s, {throughput:.2f} GB/s with {args.jobs} threads",
+          file=sys.stderr)
+    sys.exit(1 if findings else 0)
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return -1
+
+
+def _suffixes(path):
+    """ "a/b/c", "b/c" and "c" for "a/b/c" """
+    parts = path.strip("/").split("/")
+    return ["/".join(parts[i:]) for i in range(len(parts))]
+
+
+def locate(sources, mirror):
+    """
+    {sha256: path} for the archives of `sources` found in `mirror`: by sha256, or else by the end of
+    the path of one of their URLs, like `archive/v1.0.tar.gz`. A path end only matches when it
+    identifies a single archive of the recipes and a single file of the mirror, as `v1.0.tar.gz`
+    alone is used by many projects.
+    """
+    by_sha256 = index_archives(mirror)
+    by_suffix = {}
+    for dirpath, _, filenames in os.walk(mirror):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            for suffix in _suffixes(os.path.relpath(path, mirror).replace(os.sep, "/")):
+                by_suffix.setdefault(suffix, set()).add(path)
+
+    url_suffixes = {}
+    owners = {}
+    for sha256, refs in sources.items():
+        url_suffixes[sha256] = [suffix for ref in refs for url in ref.urls
+                                for suffix in _suffixes(url.split("://", 1)[-1].split("?", 1)[0])]
+        for suffix in set(url_suffixes[sha256]):
+            owners.setdefault(suffix, set()).add(sha256)
+
+    files = {}
+    for sha256 in sources:
+        if sha256 in by_sha256:
+            files[sha256] = by_sha256[sha256]
+            continue
+        for suffix in url_suffixes[sha256]:
+            if len(owners[suffix]) == 1 and len(by_suffix.get(suffix, ())) == 1:
+                files[sha256] = next(iter(by_suffix[suffix]))
+                break
+    return files
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Find the dependencies pinned to different versions in the requirement graph of some recipes.
+
+Starting from recipe versions, the `requires` of recipe_database.py are followed version by version:
+a requirement of zlib/1.2.11 goes to the folder config.yml builds zlib/1.2.11 from, a version range
+to the newest version of config.yml it accepts. Those taken under a condition on the recipe version,
+like `if Version(self.version) < "0.24.0":`, are only followed for the versions meeting it. Every
+dependency required with versions which do not all agree, like zlib/1.2.11 in ncbi-cxx-toolkit-public's
+NCBI_to_Conan_requires and a newer zlib elsewhere, is a conflict. For each one, the version requiring the fewest bumps, never older than the
+pinned ones, is suggested along with the requirements to bump.
+
+    python3 linter/version_conflicts.py ncbi-cxx-toolkit-public/26.0.1
+    python3 linter/version_conflicts.py --all --json
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from recipe_database import connect, default_database_path, update
+
+
+def version_key(version):
+    """ Sort key of a version: numbers compared as numbers, anything else as text """
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part)
+                 for part in re.split(r"[.\-+_]", str(version).lower()) if part)
+
+
+def _bumped(version, index):
+    """ The smallest version above every version starting like `version` up to its `index`-th number """
+    parts = [int(part) if part.isdigit() else 0 for part in version.split(".")[:index + 1]]
+    parts += [0] * (index + 1 - len(parts))
+    parts[index] += 1
+    return ".".join(map(str, parts))
+
+
+def satisfies(version, version_range):
+    """ Whether `version` is accepted by a Conan version range like `[>=1.2.11 <2]`, `[~1.2]` or `[^1.2]` """
+    key = version_key(version)
+    for alternative in version_range.strip("[]").split("||"):
+        conditions = alternative.split(",")[0].split()
+        accepted = True
+        for condition in conditions:
+            operator, bound = re.match(r"(>=|<=|>|<|=|~|\^)?(.*)", condition).groups()
+            if operator == "~":
+                accepted = accepted and version_key(bound) <= key < version_key(_bumped(bound, 1))
+            elif operator == "^":
+                accepted = accepted and version_key(bound) <= key < version_key(_bumped(bound, 0))
+            else:
+                bound_key = version_key(bound)
+                accepted = accepted and {
+                    ">=": key >= bound_key, "<=": key <= bound_key, ">": key > bound_key, "<": key < bound_key,
+                }.get(operator, key == bound_key)
+        if accepted:
+            return True
+    return False
+
+
+def accepts(required, version):
+    """ Whether a required version, exact or range, accepts `version` """
+    return satisfies(version, required) if required.startswith("[") else version_key(required) == version_key(version)
+
+
+class Resolver:
+    """
+       Follows the requirements of the database version by version, reading those of each folder once
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._requirements = {}
+        # recipe -> [(version, folder)], newest version first
+        self.versions = {}
+        for recipe, version, folder in connection.execute("SELECT recipe, version, folder FROM versions"):
+            self.versions.setdefault(recipe, []).append((version, folder))
+        for versions in self.versions.values():
+            versions.sort(key=lambda item: version_key(item[0]), reverse=True)
+
+    def resolve(self, name, required):
+        """ (version, folder) of the recipe `name` a required version leads to, or None """
+        for version, folder in self.versions.get(name, []):
+            if required is None or accepts(required, version):
+                return version, folder
+        return None
+
+    def requirements(self, name, version, folder):
+        """ The `requires` of a version of a recipe whose name and version are known, those of its folder memoized """
+        if (name, folder) not in self._requirements:
+            self._requirements[(name, folder)] = self.connection.execute(
+                "SELECT name, version, conditional, version_condition, file, line FROM requirements"
+                " WHERE recipe = ? AND folder = ? AND kind = 'requires' AND name IS NOT NULL AND version IS NOT NULL",
+                (name, folder),
+            ).fetchall()
+        return [(dependency, required, conditional, path, line)
+                for dependency, required, conditional, condition, path, line in self._requirements[(name, folder)]
+                if condition is None or satisfies(version, f"[{condition}]")]
+
+    def pins(self, name, version):
+        """ {dependency: [pin]} in the requirement graph of `name/version`, each pin a dict """
+        pins = {}
+        resolved = self.resolve(name, version)
+        if resolved is None:
+            return pins
+        seen = {(name, resolved[0])}
+        frontier = [(name, *resolved)]
+        while frontier:
+            following = []
+            for recipe, recipe_version, folder in frontier:
+                for dependency, required, conditional, path, line in self.requirements(recipe, recipe_version, folder):
+                    pins.setdefault(dependency, []).append({
+                        "by": f"{recipe}/{recipe_version}", "version": required, "conditional": bool(conditional),
+                        "file": path, "line": line,
+                    })
+                    target = self.resolve(dependency, required)
+                    if target and (dependency, target[0]) not in seen:
+                        seen.add((dependency, target[0]))
+                        following.append((dependency, *target))
+            frontier = following
+        return pins
+
+
+def _disagree(pin, other):
+    """
+    Whether two pins of a dependency require different versions. The conditional pins of the same recipe
+    version are in branches of its conanfile.py which may exclude each other, like `if self._abi_version == "2.68":`
+    """
+    if pin["by"] == other["by"] and pin["conditional"] and other["conditional"]:
+        return False
+    ranges = [it["version"] for it in (pin, other) if it["version"].startswith("[")]
+    if len(ranges) == 2:
+        return False
+    if ranges:
+        exact = other["version"] if pin["version"].startswith("[") else pin["version"]
+        return not satisfies(exact, ranges[0])
+    return version_key(pin["version"]) != version_key(other["version"])
+
+
+def conflicts(resolver, pins):
+    """ [conflict] for the dependencies whose pins do not agree, with the version to bump them to """
+    found = []
+    for dependency, dependency_pins in sorted(pins.items()):
+        exact = {pin["version"] for pin in dependency_pins if not pin["version"].startswith("[")}
+        if not exact:
+            continue
+        if not any(_disagree(pin, other) for pin, other in itertools.combinations(dependency_pins, 2)):
+            continue
+        newest_pinned = max(exact, key=version_key)
+        # Never suggest going back: the newest pinned version, or a newer one of config.yml. Version ranges
+        # are not bumped when a version they accept will do, then the fewest pins to bump wins.
+        ranges = [pin["version"] for pin in dependency_pins if pin["version"].startswith("[")]
+        candidates = [newest_pinned] + [version for version, _ in resolver.versions.get(dependency, [])
+                                        if version_key(version) > version_key(newest_pinned)]
+        target = min(candidates, key=lambda candidate: (
+            not all(satisfies(candidate, version_range) for version_range in ranges),
+            sum(not accepts(pin["version"], candidate) for pin in dependency_pins),
+        ))
+        bumps = [dict(pin, to=target) for pin in dependency_pins if not accepts(pin["version"], target)]
+        if bumps:
+            found.append({"dependency": dependency, "pins": dependency_pins, "suggested": target, "bumps": bumps})
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find conflicting version pins in the requirement graph of recipes.")
+    parser.add_argument("roots", nargs="*", help="'name' (newest version) or 'name/version'.")
+    parser.add_argument("--all", action="store_true", help="check the newest version of every recipe.")
+    parser.add_argument("--database", default=default_database_path(), help="(default: %(default)s)")
+    parser.add_argument("--no-update", action="store_true", help="query the database as it is.")
+    parser.add_argument("--json", action="store_true", help="print a JSON document.")
+    args = parser.parse_args()
+
+    connection = connect(args.database)
+    if not args.no_update:
+        recipe_dirs = sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+        update(connection, recipe_dirs, complete=True)
+
+    start = time.perf_counter()
+    resolver = Resolver(connection)
+    roots = [tuple(root.split("/", 1)) if "/" in root else (root, None) for root in args.roots]
+    if args.all:
+        roots += [(name, None) for name in sorted(resolver.versions)]
+    report = {}
+    for name, version in roots:
+        resolved = resolver.resolve(name, version)
+        if resolved is None:
+            print(f"{name}/{version or '*'}: not found in config.yml", file=sys.stderr)
+            continue
+        found = conflicts(resolver, resolver.pins(name, resolved[0]))
+        if found:
+            report[f"{name}/{resolved[0]}"] = found
+    # The same requirement may be the cause of conflicts for many roots: bump it once
+    bumps = {}
+    for found in report.values():
+        for conflict in found:
+            for bump in conflict["bumps"]:
+                bumps[(bump["file"], bump["line"])] = bump
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({"conflicts": report, "bumps": sorted(bumps.values(), key=lambda b: (b["file"], b["line"]))},
+                         indent=2))
+    else:
+        for root, found in report.items():
+            print(f"{root}:")
+            for conflict in found:
+                versions = ", ".join(sorted({pin["version"] for pin in conflict["pins"]}, key=version_key))
+                print(f"  {conflict['dependency']}: {versions} -> {conflict['suggested']}")
+                for bump in conflict["bumps"]:
+                    condition = " (conditional)" if bump["conditional"] else ""
+                    print(f"    {bump['file']}:{bump['line']}: {bump['by']} requires"
+                          f" {conflict['dependency']}/{bump['version']}{condition}")
+        print(f"{len(bumps)} requirements to bump:")
+        for (path, line), bump in sorted(bumps.items()):
+            print(f"  {path}:{line}: {bump['version']} -> {bump['to']}")
+    print(f"{len(roots)} roots, {len(report)} with conflicts, {len(bumps)} requirements to bump,"
+          f" in {elapsed * 1000:.0f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
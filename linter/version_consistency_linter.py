@@ -0,0 +1,72 @@
+import argparse
+import glob
+import os
+from recipe_index import index_versions
+from yaml_linting import print_findings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that config.yml and conandata.yml list the same versions for every recipe folder."
+    )
+    parser.add_argument(
+        "recipes",
+        nargs="*",
+        help="recipe directories to check, e.g. 'recipes/fmt' (default: every recipe in recipes/).",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print the findings as a JSON document instead of GitHub annotations.",
+    )
+    args = parser.parse_args()
+
+    recipe_dirs = args.recipes or sorted(d for d in glob.glob(os.path.join("recipes", "*")) if os.path.isdir(d))
+    findings = []
+    for recipe in index_versions(recipe_dirs).values():
+        findings.extend(check(recipe))
+
+    print_findings(findings, as_json=args.json, recipes=len(recipe_dirs))
+
+
+def check(recipe):
+    """ Findings for a recipe_index.RecipeVersions, as dicts ready to be serialized """
+    findings = []
+    for version, (folder, line) in recipe.config.items():
+        # Folders without conandata.yml (system packages) or missing folders are reported by other linters
+        if folder in recipe.sources and version not in recipe.sources[folder]:
+            findings.append({
+                "kind": "missing-sources",
+                "level": "error",
+                "title": "config.yml inconsistency",
+                "recipe": recipe.name,
+                "folder": folder,
+                "version": version,
+                "file": recipe.config_path,
+                "line": line,
+                "message": f"Version `{version}` is built from folder `{folder}`, but there are no sources for"
+                           f" this version in `{folder}/conandata.yml`.",
+            })
+
+    for folder, sources in recipe.sources.items():
+        built = set(recipe.versions(folder))
+        for version, line in sources.items():
+            if version not in built:
+                findings.append({
+                    "kind": "orphan-version",
+                    "level": "warning",
+                    "title": "conandata.yml inconsistency",
+                    "recipe": recipe.name,
+                    "folder": folder,
+                    "version": version,
+                    "file": recipe.conandata_path(folder),
+                    "line": line,
+                    "message": f"Sources are listed for version `{version}`, but config.yml does not build it"
+                               f" from folder `{folder}`. You should either remove `{version}` from this file,"
+                               f" or add it to config.yml.",
+                })
+    return findings
+
+
+if __name__ == "__main__":
+    main()
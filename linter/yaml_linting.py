@@ -7,3 +7,87 @@ def file_path(a_string):
     if not isfile(a_string):
         raise argparse.ArgumentTypeError(f"{a_string} does not point to a file")
     return a_string
+
+
+class _NotStrict(Exception):
+    pass
+
+
+def fast_load(content):
+    """
+    Parse `content` with libyaml into dicts, lists and strings, the way strictyaml reads it.
+
+    Returns None whenever strictyaml could read the document differently or reject it
+    (flow style, anchors, aliases, tags, duplicated keys, empty values, several documents...),
+    or when PyYAML was built without libyaml. Callers must then fall back to strictyaml.
+    """
+    try:
+        import yaml
+        loader = yaml.CSafeLoader
+    except (ImportError, AttributeError):
+        return None
+
+    try:
+        events = iter(list(yaml.parse(content, Loader=loader)))
+        if not isinstance(next(events), yaml.StreamStartEvent) or \
+           not isinstance(next(events), yaml.DocumentStartEvent):
+            return None
+        root = _build(next(events), events, yaml)
+        if not isinstance(next(events), yaml.DocumentEndEvent) or \
+           not isinstance(next(events), yaml.StreamEndEvent):
+            return None
+    except (yaml.YAMLError, StopIteration, _NotStrict):
+        return None
+    return root
+
+
+def _build(event, events, yaml):
+    if isinstance(event, yaml.AliasEvent) or event.anchor is not None or event.tag is not None:
+        raise _NotStrict()
+    if isinstance(event, yaml.ScalarEvent):
+        if not event.style and event.value == "":
+            raise _NotStrict()
+        return event.value
+    if event.flow_style:
+        raise _NotStrict()
+    if isinstance(event, yaml.SequenceStartEvent):
+        result = []
+        for item in events:
+            if isinstance(item, yaml.SequenceEndEvent):
+                return result
+            result.append(_build(item, events, yaml))
+    if isinstance(event, yaml.MappingStartEvent):
+        result = {}
+        for key in events:
+            if isinstance(key, yaml.MappingEndEvent):
+                return result
+            if not isinstance(key, yaml.ScalarEvent):
+                raise _NotStrict()
+            key = _build(key, events, yaml)
+            if key in result:
+                raise _NotStrict()
+            result[key] = _build(next(events), events, yaml)
+    raise _NotStrict()
+
+
+def print_findings(findings, as_json=False, **report):
+    """
+    Print findings (dicts with `level`, `file`, `line`, `title`, `message` and a `kind`) as
+    GitHub annotations, or as a JSON document with a per-kind summary and the extra `report` fields.
+    """
+    if as_json:
+        import json
+
+        summary = {}
+        for finding in findings:
+            summary[finding["kind"]] = summary.get(finding["kind"], 0) + 1
+        print(json.dumps(dict(report, summary=summary, findings=findings), indent=2))
+        return
+
+    for finding in findings:
+        line = f",line={finding['line']}" if finding["line"] else ""
+        print(
+            f"::{finding['level']} file={finding['file']}{line},"
+            f"title={finding['title']}"
+            f"::{finding['message']}".replace("\n", "%0A")
+        )
@@ -23,6 +23,19 @@ import yaml
 
 required_conan_version = ">=1.53.0"
 
+# Parsed YAML files shared by the instances of the recipe, not to be modified: {path: (mtime_ns, data)}
+_yaml_cache = {}
+
+
+def _load_yaml(path):
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        cached = _yaml_cache[path] = (mtime_ns, data)
+    return cached[1]
+
 
 # When adding (or removing) an option, also add this option to the list in
 # `rebuild-dependencies.yml` and re-run that script.
@@ -193,35 +206,16 @@ class BoostConan(ConanFile):
             dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependency_filename)
             if not os.path.isfile(dependencies_filepath):
                 raise ConanException(f"Cannot find {dependencies_filepath}")
-            with open(dependencies_filepath, encoding='utf-8') as f:
-                self._cached_dependencies = yaml.safe_load(f)
+            self._cached_dependencies = _load_yaml(dependencies_filepath)
         return self._cached_dependencies
 
     def _all_dependent_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set()
-            for dependency in dependencies:
-                new_dependencies.update(set(self._dependencies["dependencies"][dependency]))
-                new_dependencies.update(dependencies)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        # Precomputed by rebuild-dependencies.py
+        return {name, *self._dependencies["transitive_dependencies"][name]}
 
     def _all_super_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set(dependencies)
-            for module in self._dependencies["dependencies"]:
-                if dependencies.intersection(set(self._dependencies["dependencies"][module])):
-                    new_dependencies.add(module)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        # Precomputed by rebuild-dependencies.py
+        return {name, *self._dependencies["transitive_dependents"][name]}
 
     @property
     def _bcp_dir(self):
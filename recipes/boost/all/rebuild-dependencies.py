@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
 import dataclasses
 import json
 import logging
+import os
 import pprint
 import re
+import shutil
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 from conan.tools.files import chdir
@@ -94,6 +97,10 @@ class BoostDependenciesExport(object):
     libs: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
     requirements: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
     static_only: List[str] = dataclasses.field(default_factory=list)
+    # Precomputed closures of `dependencies`, so the recipe does not have to compute them:
+    # the modules a module depends on, directly or not, and the modules depending on it
+    transitive_dependencies: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
+    transitive_dependents: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
 
 
 @dataclasses.dataclass
@@ -103,31 +110,38 @@ class BoostDependencies(object):
 
 
 class BoostDependencyBuilder(object):
-    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool):
+    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool,
+                 worktree: Optional[Path] = None, boostdep: Optional[Path] = None):
         self.boost_version = boost_version
         self.boostdep_version = boostdep_version
         self.git_url = git_url
         self.tmppath = tmppath
         self.outputdir = outputdir
         self.unsafe = unsafe
-        self._boostdep = None
+        # When given, the version is checked out in this git worktree of the clone instead of the clone itself
+        self.worktree = worktree
+        self._boostdep = boostdep
 
     @property
-    def boost_path(self) -> Path:
+    def clone_path(self) -> Path:
         return self.tmppath / "boost"
 
+    @property
+    def boost_path(self) -> Path:
+        return self.worktree or self.clone_path
+
     def do_git_update(self) -> None:
-        if not self.boost_path.exists():
+        if not self.clone_path.exists():
             with chdir(self, self.tmppath):
                 print("Cloning boost git")
                 subprocess.check_call(["git", "clone", "--", self.git_url, "boost"])
-            with chdir(self, self.boost_path):
+            with chdir(self, self.clone_path):
                 print("Checking out current master")
                 subprocess.check_call(["git", "checkout", "origin/master"])
                 print("Removing master branch")
                 subprocess.check_call(["git", "branch", "-D", "master"])
         else:
-            with chdir(self, self.boost_path):
+            with chdir(self, self.clone_path):
                 print("Updating git repo")
                 subprocess.check_call(["git", "fetch", "origin"])
                 print("Removing all local changes to git repo")
@@ -150,11 +164,32 @@ class BoostDependencyBuilder(object):
                 raise
 
             print("Re-init git submodules")
-            subprocess.check_call(["git", "submodule", "update", "--init"])
+            subprocess.check_call(["git", "-c", "protocol.file.allow=always", "submodule", "update", "--init"])
 
             print("Removing unknown files/directories")
             subprocess.check_call(["git", "clean", "-d", "-f"])
 
+    def do_git_worktree_add(self) -> None:
+        # Leftovers of an interrupted run are removed first
+        self.do_git_worktree_remove()
+        print(f"Adding worktree of version {self.boost_version}")
+        subprocess.check_call(["git", "-C", str(self.clone_path), "worktree", "add", "--detach", "--force",
+                               str(self.worktree), f"boost-{self.boost_version}"])
+
+    def do_git_worktree_submodule_update(self) -> None:
+        # The worktree is new: there is nothing to de-init nor clean. The submodules are cloned from
+        # the remotes relative to the one of the clone, so a local mirror of boostorg needs no network.
+        with chdir(self, self.boost_path):
+            print(f"Init git submodules of version {self.boost_version}")
+            subprocess.check_call(["git", "-c", "protocol.file.allow=always", "submodule", "update", "--init"])
+
+    def do_git_worktree_remove(self) -> None:
+        if self.worktree.exists():
+            subprocess.check_call(["git", "-C", str(self.clone_path), "worktree", "remove", "--force", str(self.worktree)])
+        if self.worktree.exists():
+            shutil.rmtree(self.worktree)
+        subprocess.check_call(["git", "-C", str(self.clone_path), "worktree", "prune"])
+
     def do_install_boostdep(self):
         with chdir(self, self.boost_path):
             print(f"Installing boostdep/{self.boostdep_version}")
@@ -293,6 +328,24 @@ class BoostDependencyBuilder(object):
             tree = {k: [d for d in v if d not in nodeps] for k, v in tree.items() if k not in nodeps}
         return {}
 
+    @staticmethod
+    def transitive_closures(tree: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        # `tree` has no cycle (see `detect_cycles`): every module is visited after its dependencies
+        dependencies = {}
+        remaining = dict(tree)
+        while remaining:
+            ready = [k for k, v in remaining.items() if all(d in dependencies for d in v)]
+            for module in ready:
+                dependencies[module] = set(remaining.pop(module))
+                for dependency in tree[module]:
+                    dependencies[module].update(dependencies[dependency])
+        dependents = {module: set() for module in tree}
+        for module, module_dependencies in dependencies.items():
+            for dependency in module_dependencies:
+                dependents[dependency].add(module)
+        return ({k: sorted(v) for k, v in dependencies.items()},
+                {k: sorted(v) for k, v in dependents.items()})
+
     def _fix_dependencies(self, deptree: Dict[str, List[str]]) -> Dict[str, List[str]]:
         try:
             # python does not depend on graph
@@ -409,6 +462,8 @@ class BoostDependencyBuilder(object):
         tree = self.do_create_libraries(tree)
 
         tree.export.dependencies = self._fix_dependencies(tree.export.dependencies)
+        tree.export.transitive_dependencies, tree.export.transitive_dependents = \
+            self.transitive_closures(tree.export.dependencies)
 
         data = dataclasses.asdict(tree.export)
         if self.unsafe:
@@ -421,15 +476,115 @@ class BoostDependencyBuilder(object):
             yaml.dump(data, fout)
 
 
+def _build_in_worktree(builder: BoostDependencyBuilder) -> str:
+    builder.do_git_worktree_submodule_update()
+    builder.do_create_dependency_file()
+    builder.do_git_worktree_remove()
+    return builder.boost_version
+
+
+class Checkpoint(object):
+    """
+    The versions a batch finished, so that running it again after a crash resumes where it stopped
+    """
+
+    def __init__(self, path: Path, boostdep_version: str):
+        self.path = path
+        self.boostdep_version = boostdep_version
+        self.finished = set()
+        try:
+            data = json.loads(path.read_text())
+            # The dependencies found depend on boostdep
+            if data.get("boostdep_version") == boostdep_version:
+                self.finished = set(data.get("finished", []))
+        except (OSError, ValueError):
+            pass
+
+    def add(self, boost_version: str) -> None:
+        self.finished.add(boost_version)
+        partial = self.path.with_name(f"{self.path.name}.partial")
+        partial.write_text(json.dumps({"boostdep_version": self.boostdep_version, "finished": sorted(self.finished)}))
+        os.replace(partial, self.path)
+
+    def remove(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+
+def build_batch(builders: List[BoostDependencyBuilder], jobs: int, restart: bool) -> int:
+    """
+    Build the dependency files of many versions, each in its own git worktree of one clone,
+    with `jobs` processes. Returns the number of versions which failed.
+    """
+    worktrees = builders[0].tmppath / "boost-worktrees"
+    worktrees.mkdir(exist_ok=True)
+    checkpoint = Checkpoint(worktrees / "finished.json", builders[0].boostdep_version)
+    if restart:
+        checkpoint.remove()
+        checkpoint.finished = set()
+    if checkpoint.finished:
+        print(f"Resuming: {', '.join(sorted(checkpoint.finished))} already done")
+    builders = [b for b in builders if b.boost_version not in checkpoint.finished]
+    if not builders:
+        checkpoint.remove()
+        return 0
+
+    # Once for all the versions: boostdep does not depend on them
+    boostdep = builders[0]._boostdep
+    if boostdep is None:
+        builders[0].do_install_boostdep()
+        boostdep = builders[0]._boostdep
+    # Worktrees are added one by one, they lock the clone
+    for builder in builders:
+        builder.worktree = worktrees / builder.boost_version
+        builder._boostdep = boostdep
+        builder.do_git_worktree_add()
+
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_build_in_worktree, builder): builder for builder in builders}
+        for future in concurrent.futures.as_completed(futures):
+            boost_version = futures[future].boost_version
+            try:
+                future.result()
+            except Exception as e:
+                log.error("Version %s failed: %s", boost_version, e)
+                failed += 1
+                continue
+            checkpoint.add(boost_version)
+            print(f"Finished {boost_version}")
+    if not failed:
+        checkpoint.remove()
+    return failed
+
+
+def update_transitive_closures(path: Path) -> None:
+    # Only computed from the `dependencies` of the file: neither git nor boostdep are needed
+    with path.open() as fin:
+        data = yaml.safe_load(fin)
+    data["transitive_dependencies"], data["transitive_dependents"] = \
+        BoostDependencyBuilder.transitive_closures(data["dependencies"])
+    print(f"Updating {path}")
+    with path.open("w") as fout:
+        yaml.dump(BoostDependencyBuilder._sort_item(data), fout)
+
+
 def main(args=None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--verbose", dest="verbose", action="store_true", help="verbose output")
-    parser.add_argument("-t", dest="tmppath", help="temporary folder where to clone boost (default is system temporary folder)")
+    parser.add_argument("-t", dest="tmppath", type=Path, help="temporary folder where to clone boost (default is system temporary folder)")
     parser.add_argument("-d", dest="boostdep_version", default="1.82.0", type=str, help="boostdep version")
     parser.add_argument("-u", dest="git_url", default=BOOST_GIT_URL, help="boost git url")
     parser.add_argument("-U", dest="git_update", action="store_true", help="update the git repo")
     parser.add_argument("-o", dest="outputdir", default=None, type=Path, help="output dependency dir")
     parser.add_argument("-x", dest="unsafe", action="store_true", help="unsafe fast(er) operation")
+    parser.add_argument("-c", dest="closures_only", action="store_true",
+                        help="only update the transitive closures of the existing dependency files")
+    parser.add_argument("-j", dest="jobs", type=int, default=None,
+                        help="batch mode: build the versions in parallel with JOBS processes, each in its own git worktree "
+                             "of the clone, resuming where an interrupted batch stopped")
+    parser.add_argument("-r", dest="restart", action="store_true", help="batch mode: forget the versions an interrupted batch finished")
+    parser.add_argument("-b", dest="boostdep", type=Path, default=None, help="boostdep executable to use instead of installing it with conan")
 
     version_group = parser.add_mutually_exclusive_group(required=True)
     version_group.add_argument("-v", dest="boost_version", help="boost version")
@@ -457,6 +612,31 @@ def main(args=None) -> int:
     else:
         boost_versions = [ns.boost_version]
 
+    if ns.closures_only:
+        for boost_version in boost_versions:
+            update_transitive_closures(ns.outputdir / f"dependencies-{boost_version}.yml")
+        return 0
+
+    if ns.jobs:
+        builders = [
+            BoostDependencyBuilder(
+                boost_version=boost_version,
+                boostdep_version=ns.boostdep_version,
+                git_url=ns.git_url,
+                outputdir=ns.outputdir,
+                tmppath=ns.tmppath,
+                unsafe=ns.unsafe,
+                boostdep=ns.boostdep,
+            )
+            for boost_version in boost_versions
+        ]
+        if not ns.git_update and not builders[0].clone_path.exists():
+            log.error("Boost directory does not exist. Re-execute this script with -U to run 'git update'.")
+            return 1
+        if ns.git_update:
+            builders[0].do_git_update()
+        return 1 if build_batch(builders, ns.jobs, ns.restart) else 0
+
     for boost_version in boost_versions:
         print(f"Starting {boost_version}")
         boost_collector = BoostDependencyBuilder(
@@ -466,6 +646,7 @@ def main(args=None) -> int:
             outputdir=ns.outputdir,
             tmppath=ns.tmppath,
             unsafe=ns.unsafe,
+            boostdep=ns.boostdep,
         )
 
         if not ns.git_update and not boost_collector.boost_path.exists():
@@ -478,7 +659,8 @@ def main(args=None) -> int:
 
         boost_collector.do_git_submodule_update()
 
-        boost_collector.do_install_boostdep()
+        if ns.boostdep is None:
+            boost_collector.do_install_boostdep()
 
         boost_collector.do_create_dependency_file()
     return 0
@@ -1,5 +1,4 @@
 import functools
-import glob
 import os
 
 from conan import ConanFile
@@ -11,7 +10,7 @@ from conan.tools.files import apply_conandata_patches, copy, export_conandata_pa
 from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
+from helpers import BuildFileCache, find_build_files, parse_proto_libraries
 
 required_conan_version = ">=1.60.0 <2 || >=2.0.5"
 
@@ -92,28 +91,31 @@ class GoogleAPIS(ConanFile):
 
     @functools.lru_cache(1)
     def _parse_proto_libraries(self):
-        # Generate the libraries to build dynamically
+        # Generate the libraries to build dynamically. The parsed BUILD.bazel files are kept in the build folder,
+        # by the sha256 of their content, for package() or a later build to reuse them
+        cache = BuildFileCache(os.path.join(self.build_folder, "proto_libraries.json"))
+        build_files, source_files = find_build_files(self.source_folder, ["google", "grafeas"])
         proto_libraries = []
-        for filename in glob.iglob(os.path.join(self.source_folder, 'google', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
-
-        for filename in glob.iglob(os.path.join(self.source_folder, 'grafeas', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
+        for filename in build_files:
+            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error, cache)
+        cache.save()
 
         # Validate that all files exist and all dependencies are found
-        all_deps = [f"{it.qname}:{it.name}" for it in proto_libraries]
-        all_deps += ["protobuf::libprotobuf"]
+        all_deps = {f"{it.qname}:{it.name}" for it in proto_libraries}
+        all_deps.add("protobuf::libprotobuf")
         for it in proto_libraries:
-            it.validate(self.source_folder, all_deps)
+            it.validate(self.source_folder, all_deps, source_files)
 
         # Mark the libraries we need recursively (C++ context)
         all_dict = {f"{it.qname}:{it.name}": it for it in proto_libraries}
+        activated = set()
 
         def activate_library(proto_library):
             proto_library.is_used = True
             for it_dep in proto_library.deps:
-                if it_dep == "protobuf::libprotobuf":
+                if it_dep == "protobuf::libprotobuf" or it_dep in activated:
                     continue
+                activated.add(it_dep)
                 activate_library(all_dict[it_dep])
 
         for it in filter(lambda u: u.is_used, proto_libraries):
@@ -9,7 +9,7 @@ from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import get, collect_libs, copy
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
+from helpers import BuildFileCache, parse_proto_libraries
 
 required_conan_version = ">=1.60.0 <2.0 || >=2.0.5"
 
@@ -96,22 +96,27 @@ class GRPCProto(ConanFile):
 
     @functools.lru_cache(1)
     def _parse_proto_libraries(self):
-        # Generate the libraries to build dynamically
-        proto_libraries = parse_proto_libraries(os.path.join(self.source_folder, 'BUILD.bazel'), self.source_folder, self.output.error)
+        # Generate the libraries to build dynamically. The parsed BUILD.bazel file is kept in the build folder,
+        # by the sha256 of its content, for a later build to reuse it
+        cache = BuildFileCache(os.path.join(self.build_folder, "proto_libraries.json"))
+        proto_libraries = parse_proto_libraries(os.path.join(self.source_folder, 'BUILD.bazel'), self.source_folder, self.output.error, cache)
+        cache.save()
 
         # Validate that all files exist and all dependencies are found
-        all_deps = [it.cmake_target for it in proto_libraries]
-        all_deps += ["googleapis::googleapis", "protobuf::libprotobuf"]
+        all_deps = {it.cmake_target for it in proto_libraries}
+        all_deps.update(["googleapis::googleapis", "protobuf::libprotobuf"])
         for it in proto_libraries:
             it.validate(self.source_folder, all_deps)
 
         # Mark the libraries we need recursively (C++ context)
         all_dict = {it.cmake_target: it for it in proto_libraries}
+        activated = set()
         def activate_library(proto_library):
             proto_library.is_used = True
             for it_dep in proto_library.deps:
-                if it_dep in ["googleapis::googleapis", "protobuf::libprotobuf"]:
+                if it_dep in ["googleapis::googleapis", "protobuf::libprotobuf"] or it_dep in activated:
                     continue
+                activated.add(it_dep)
                 activate_library(all_dict[it_dep])
 
         for it in filter(lambda u: u.is_used, proto_libraries):
@@ -1,4 +1,7 @@
+import hashlib
+import json
 import os
+import posixpath
 import re
 import textwrap
 
@@ -18,16 +21,16 @@ class _ProtoLibrary:
         self.deps = set(["protobuf::libprotobuf"])  # Add to all libraries even if not explicitly set
         self.is_used = True
 
-    def validate(self, source_folder, all_deps):
-        # Check all files exists
+    def validate(self, source_folder, all_deps, source_files=None):
+        # Check all files exists, among source_files (relative to source_folder) when known
         for it in self.srcs:
-            assert os.path.exists(os.path.join(source_folder, it)), f"{self.name} - file '{it}' doesn't exist"
-        # Check all deps exists
+            exists = it in source_files if source_files is not None else os.path.exists(os.path.join(source_folder, it))
+            assert exists, f"{self.name} - file '{it}' doesn't exist"
+        # Check all deps exists, all_deps being a set
         for it in self.deps:
             assert it in all_deps, f"{self.name} - dep '{it}' not found"
 
     def dumps(self):
-        import json
         return json.dumps({
             "name": self.name,
             "srcs": self.srcs,
@@ -76,76 +79,174 @@ class _ProtoLibrary:
         return content
 
 
-def parse_proto_libraries(filename, source_folder, error):
+# Top level statements of BUILD.bazel files start a line, with the variable they assign or the rule they call
+_STARLARK_STATEMENT = re.compile(r"^([A-Za-z_]\w*)[ \t]*(=(?!=)|\()", re.MULTILINE)
+# Starlark tokens, skipping the blanks, new lines and comments before them
+_STARLARK_TOKEN = re.compile(r'''
+    (?:\s+|\\\r?\n|\#[^\n]*)*
+    ( [rRbB]{0,2}(?:"""(?:\\.|[^\\])*?"""|\'\'\'(?:\\.|[^\\])*?\'\'\'|"(?:\\.|[^\\"\n])*"|'(?:\\.|[^\\'\n])*')
+    | \w+
+    | \*\*|//|==|!=|<=|>=|[-+*/%&|^]=|->
+    | [^\w\s]
+    )
+''', re.VERBOSE | re.DOTALL)
+_PROTO_RULES = ("proto_library", "cc_proto_library")
+
+# Version of the parsed rules, as saved in the files of BuildFileCache
+_CACHE_FORMAT = 1
+
+
+def _split(tokens, separator):
+    """ Parts of `tokens` between the `separator` tokens outside of brackets """
+    parts = [[]]
+    depth = 0
+    for token in tokens:
+        if token in ("(", "[", "{"):
+            depth += 1
+        elif token in (")", "]", "}"):
+            depth -= 1
+        elif token == separator and depth == 0:
+            parts.append([])
+            continue
+        parts[-1].append(token)
+    return parts
+
+
+def _is_string(token):
+    return len(token) >= 2 and token[-1] in "\"'"
+
+
+def _string(token):
+    prefix = len(token) - len(token.lstrip("rRbB"))
+    quotes = 3 if token[prefix:prefix + 3] in ('"""', "'''") else 1
+    value = token[prefix + quotes:-quotes]
+    if "\\" not in value or "r" in token[:prefix].lower():
+        return value
+    return value.encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+def _evaluate(tokens, variables):
+    """ Value of an expression made of strings, lists of strings and variables joined by +, None for other ones """
+    value = None
+    for index, operand in enumerate(_split(tokens, "+")):
+        if len(operand) == 1 and _is_string(operand[0]):
+            operand_value = _string(operand[0])
+        elif len(operand) == 1:
+            operand_value = variables.get(operand[0])
+        elif len(operand) >= 2 and operand[0] == "[" and operand[-1] == "]":
+            items = [item for item in _split(operand[1:-1], ",") if item]
+            if not all(len(item) == 1 and _is_string(item[0]) for item in items):
+                return None
+            operand_value = [_string(item[0]) for item in items]
+        else:
+            return None
+        if index == 0:
+            value = operand_value
+        elif value is not None and type(value) is type(operand_value):
+            value = value + operand_value
+        else:
+            return None
+    return value
+
+
+def parse_build_file(content):
+    """
+    Rules of _PROTO_RULES called in a BUILD.bazel file: [{"rule", "name", "srcs", "deps"}], whose `srcs` and
+    `deps` are the strings of the file, [] when not given, None when they are not lists of strings.
+
+    Only the top level statements assigning a variable or calling one of these rules are tokenized.
+    """
+    rules = []
+    variables = {}
+    statements = [(match.start(), match.group(1), match.group(2)) for match in _STARLARK_STATEMENT.finditer(content)]
+    statements.append((len(content), None, None))
+    index = 0
+    while index < len(statements) - 1:
+        start, name, kind = statements[index]
+        index += 1
+        if kind == "(" and name not in _PROTO_RULES:
+            continue
+        tokens = _STARLARK_TOKEN.findall(content, start, statements[index][0])
+        # A statement goes on until its brackets are closed, even over lines looking like other statements
+        while sum(map(tokens.count, "([{")) > sum(map(tokens.count, ")]}")) and index < len(statements) - 1:
+            tokens += _STARLARK_TOKEN.findall(content, statements[index][0], statements[index + 1][0])
+            index += 1
+
+        if kind == "=":
+            variables[name] = _evaluate(tokens[2:], variables)
+        elif tokens[-1] == ")":
+            attributes = {}
+            for argument in _split(tokens[2:-1], ","):
+                if len(argument) >= 2 and argument[1] == "=":
+                    attributes[argument[0]] = _evaluate(argument[2:], variables)
+            rules.append({
+                "rule": name,
+                "name": attributes.get("name"),
+                "srcs": attributes.get("srcs", []),
+                "deps": attributes.get("deps", []),
+            })
+    return rules
+
+
+class BuildFileCache:
+    """
+    Rules of the BUILD.bazel files already parsed by parse_build_file, keyed by the sha256 of their content,
+    and kept in a JSON file so that other steps of the build, in other processes, can reuse them
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._rules = {}
+        self._changed = False
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("format") == _CACHE_FORMAT:
+                self._rules = cache["rules"]
+
+    def rules(self, content):
+        key = hashlib.sha256(content).hexdigest()
+        if key not in self._rules:
+            self._rules[key] = parse_build_file(content.decode("utf-8"))
+            self._changed = True
+        return self._rules[key]
+
+    def save(self):
+        if self._changed:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"format": _CACHE_FORMAT, "rules": self._rules}))
+            self._changed = False
+
+
+def parse_proto_libraries(filename, source_folder, error, cache=None):
     # Generate the libraries to build dynamically
-    re_name = re.compile(r'name = "(.*)"')
-    re_srcs_oneline = re.compile(r'srcs = \["(.*)"\],')
-    re_deps_oneline = re.compile(r'deps = \["(.*)"\],')
-    re_add_varname = re.compile(r'] \+ (.*),')
-
-    proto_libraries = []
+    with open(filename, "rb") as f:
+        content = f.read()
+    rules = cache.rules(content) if cache else parse_build_file(content.decode("utf-8"))
 
-    basedir = os.path.dirname(filename)
-    proto_library = None
+    current_folder_str = os.path.relpath(os.path.dirname(filename), source_folder).replace('\\', '/')  # We need forward slashes because of Windows
 
-    def parsing_sources(line):
-        proto_path = os.path.relpath(os.path.join(basedir, line.strip(",").strip("\"")), source_folder).replace('\\', '/')
-        proto_library.srcs.append(proto_path)
-
-    def parsing_deps(line):
-        line = line.strip(",").strip("\"")
+    def to_dep(line):
         if line.startswith("@com_google_protobuf//:"):
-            proto_library.deps.add("protobuf::libprotobuf")
+            return "protobuf::libprotobuf"
         elif line.startswith("@com_google_googleapis//"):
-            proto_library.deps.add("googleapis::googleapis")
+            return "googleapis::googleapis"
         elif line.startswith(":"):
-            proto_library.deps.add(grpc_target_name(line[1:]))
-        else:
-            error(f"Unrecognized dep: {line} -- {os.path.relpath(filename, source_folder)}")
-
-    with open(filename, 'r') as f:
-        action = None
-        parsing_variable = None
-        variables = {}
-        for line in f.readlines():
-            line = line.strip()
-
-            if line == "proto_library(":
-                assert proto_library == None
-                proto_library = _ProtoLibrary()
-            elif parsing_variable != None:
-                if line == "]":
-                    parsing_variable = None
-                else:
-                    parsing_variable(line)
-            elif proto_library != None:
-                if line.startswith("name ="):
-                    proto_library.name = re_name.search(line).group(1)
-                elif line.startswith("srcs = "):
-                    m = re_srcs_oneline.search(line)
-                    if m:
-                        parsing_sources(m.group(1))
-                    else:
-                        action = parsing_sources
-                elif line.startswith("deps = "):
-                    m = re_deps_oneline.search(line)
-                    if m:
-                        parsing_deps(m.group(1))
-                    else:
-                        action = parsing_deps
-                elif line.startswith("visibility = "):
-                    pass
-                elif line == ")":
-                    proto_libraries.append(proto_library)
-                    proto_library = None
-                    action = None
-                elif line == "],":
-                    action = None 
-                elif line.startswith("] + "):
-                    varname = re_add_varname.search(line).group(1)
-                    for it in variables[varname]:
-                        action(it) 
-                elif action:
-                    action(line)
+            return grpc_target_name(line[1:])
+        error(f"Unrecognized dep: {line} -- {os.path.relpath(filename, source_folder)}")
+        return None
 
+    proto_libraries = []
+    for rule in rules:
+        if rule["rule"] != "proto_library":
+            continue
+        if rule["name"] is None or rule["srcs"] is None or rule["deps"] is None:
+            error(f"Unsupported {rule['rule']}: {rule['name']} -- {os.path.relpath(filename, source_folder)}")
+            continue
+        proto_library = _ProtoLibrary()
+        proto_library.name = rule["name"]
+        for src in rule["srcs"]:
+            proto_library.srcs.append(posixpath.normpath(f"{current_folder_str}/{src}"))
+        proto_library.deps.update(dep for dep in map(to_dep, rule["deps"]) if dep)
+        proto_libraries.append(proto_library)
     return proto_libraries
@@ -4,12 +4,24 @@ from conan.tools.build import check_min_cppstd
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get
 from conan.tools.scm import Version
-import functools
 import os
 import yaml
 
 required_conan_version = ">=1.53.0"
 
+# Parsed YAML files shared by the instances of the recipe, not to be modified: {path: (mtime_ns, data)}
+_yaml_cache = {}
+
+
+def _load_yaml(path):
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        cached = _yaml_cache[path] = (mtime_ns, data)
+    return cached[1]
+
 
 class MoltenVKConan(ConanFile):
     name = "moltenvk"
@@ -45,13 +57,11 @@ class MoltenVKConan(ConanFile):
         return f"dependencies-{self.version}.yml"
 
     @property
-    @functools.lru_cache(1)
     def _dependencies_versions(self):
         dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
         if not os.path.isfile(dependencies_filepath):
             raise ConanException(f"Cannot find {dependencies_filepath}")
-        cached_dependencies = yaml.safe_load(open(dependencies_filepath))
-        return cached_dependencies
+        return _load_yaml(dependencies_filepath)
 
     @property
     def _min_cppstd(self):
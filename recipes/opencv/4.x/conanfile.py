@@ -90,6 +90,413 @@ OPENCV_EXTRA_MODULES_OPTIONS = (
     "xphoto",
 )
 
+# Modules of OpenCV and their internal dependency graph, the same for every instance of a version:
+# - mandatory_options: options which must be enabled to build the module
+# - requires: requirements of the module. Those starting with "?" are conditional: "?opencv_<module>"
+#   if the other module is built, "?<name>" the requirements of a group of _opencv_modules
+# - system_libs & frameworks: [(condition of _opencv_modules, [names])]
+# - no_option: built without an option of the same name, if the `built_with` condition is true, if any
+OPENCV_MODULES = {
+    # Main modules
+    "calib3d": {
+        "mandatory_options": ["features2d", "flann", "imgproc"],
+        "requires": ["opencv_core", "opencv_features2d", "opencv_flann", "opencv_imgproc", "?eigen", "?ipp"],
+    },
+    "core": {
+        "no_option": True,
+        "requires": ["zlib::zlib", "?parallel", "?eigen", "?ipp"],
+        "system_libs": [
+            ("android", ["dl", "m", "log"]),
+            ("freebsd", ["m", "pthread"]),
+            ("linux", ["dl", "m", "pthread", "rt"]),
+        ],
+        "frameworks": [
+            ("macos_opencl", ["OpenCL"]),
+        ],
+    },
+    "dnn": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?protobuf", "?vulkan", "?ipp"],
+    },
+    "features2d": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_imgproc", "?opencv_flann", "?eigen", "?ipp"],
+    },
+    "flann": {
+        "requires": ["opencv_core", "?ipp"],
+    },
+    "gapi": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_imgproc", "ade::ade"],
+        "system_libs": [
+            ("windows", ["ws2_32", "wsock32"]),
+        ],
+    },
+    "highgui": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?opencv_imgcodecs", "?opencv_videoio", "?gtk", "?qt",
+                     "?xkbcommon", "?wayland", "?ipp"],
+        "system_libs": [
+            ("windows", ["comctl32", "gdi32", "ole32", "setupapi", "ws2_32", "vfw32"]),
+        ],
+        "frameworks": [
+            ("macos", ["Cocoa"]),
+        ],
+    },
+    "imgcodecs": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_imgproc", "zlib::zlib", "?imageformats", "?ipp"],
+        "frameworks": [
+            ("apple", ["CoreFoundation", "CoreGraphics"]),
+            ("ios", ["UIKit"]),
+            ("macos", ["AppKit"]),
+        ],
+    },
+    "imgproc": {
+        "requires": ["opencv_core", "?ipp"],
+    },
+    "ml": {
+        "requires": ["opencv_core", "?ipp"],
+    },
+    "objdetect": {
+        "mandatory_options": ["calib3d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "?quirc", "?ipp"],
+    },
+    "photo": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_imgproc", "?opencv_cudaarithm", "?opencv_cudaimgproc", "?ipp"],
+    },
+    "stitching": {
+        "mandatory_options": ["calib3d", "features2d", "flann", "imgproc"],
+        "requires": ["opencv_calib3d", "opencv_features2d", "opencv_flann", "opencv_imgproc", "?opencv_xfeatures2d",
+                     "?opencv_cudaarithm", "?opencv_cudawarping", "?opencv_cudafeatures2d", "?opencv_cudalegacy",
+                     "?opencv_cudaimgproc", "?eigen", "?ipp"],
+    },
+    "video": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_imgproc", "?opencv_calib3d", "?ipp"],
+    },
+    "videoio": {
+        "mandatory_options": ["imgcodecs", "imgproc"],
+        "requires": ["opencv_imgcodecs", "opencv_imgproc", "?ffmpeg", "?ipp"],
+        "system_libs": [
+            ("android_mediandk", ["mediandk"]),
+        ],
+        "frameworks": [
+            ("apple", ["Accelerate", "AVFoundation", "CoreGraphics", "CoreMedia", "CoreVideo", "QuartzCore"]),
+            ("ios", ["CoreImage", "UIKit"]),
+            ("macos", ["Cocoa"]),
+        ],
+    },
+    # Extra modules
+    "alphamat": {
+        "mandatory_options": ["with_eigen", "imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "aruco": {
+        "mandatory_options": ["calib3d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "?ipp"],
+    },
+    "barcode": {
+        "mandatory_options": ["dnn", "imgproc"],
+        "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc", "?ipp"],
+    },
+    "bgsegm": {
+        "mandatory_options": ["calib3d", "imgproc", "video"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_video", "?ipp"],
+    },
+    "bioinspired": {
+        "requires": ["opencv_core", "?ipp"],
+    },
+    "ccalib": {
+        "mandatory_options": ["calib3d", "features2d", "highgui", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_highgui", "opencv_imgproc", "?ipp"],
+    },
+    "cudaarithm": {
+        "mandatory_options": ["with_cuda"],
+        "requires": ["opencv_core", "opencv_cudev", "?ipp"],
+    },
+    "cudabgsegm": {
+        "mandatory_options": ["with_cuda", "video"],
+        "requires": ["opencv_video", "?ipp"],
+    },
+    "cudacodec": {
+        "mandatory_options": ["with_cuda", "videoio"],
+        "requires": ["opencv_core", "opencv_videoio", "?ipp"],
+    },
+    "cudafeatures2d": {
+        "mandatory_options": ["with_cuda", "features2d", "cudafilters", "cudawarping"],
+        "requires": ["opencv_features2d", "opencv_cudafilters", "opencv_cudawarping", "?ipp"],
+    },
+    "cudafilters": {
+        "mandatory_options": ["with_cuda", "imgproc", "cudaarithm"],
+        "requires": ["opencv_imgproc", "opencv_cudaarithm", "?ipp"],
+    },
+    "cudaimgproc": {
+        "mandatory_options": ["with_cuda", "imgproc"],
+        "requires": ["opencv_imgproc", "opencv_cudev", "?opencv_cudaarithm", "?opencv_cudafilters", "?ipp"],
+    },
+    "cudalegacy": {
+        "mandatory_options": ["with_cuda", "video"],
+        "requires": ["opencv_core", "opencv_video", "?opencv_calib3d", "?opencv_imgproc", "?opencv_objdetect",
+                     "?opencv_cudaarithm", "?opencv_cudafilters", "?opencv_cudaimgproc", "?ipp"],
+    },
+    "cudaobjdetect": {
+        "mandatory_options": ["with_cuda", "objdetect", "cudaarithm", "cudawarping"],
+        "requires": ["opencv_objdetect", "opencv_cudaarithm", "opencv_cudawarping", "?opencv_cudalegacy", "?ipp"],
+    },
+    "cudaoptflow": {
+        "mandatory_options": ["with_cuda", "video", "cudaarithm", "cudaimgproc", "cudawarping", "optflow"],
+        "requires": ["opencv_video", "opencv_cudaarithm", "cudaimgproc", "opencv_cudawarping", "opencv_optflow",
+                     "?opencv_cudalegacy", "?ipp"],
+    },
+    "cudastereo": {
+        "mandatory_options": ["with_cuda", "calib3d"],
+        "requires": ["opencv_calib3d", "opencv_cudev", "?ipp"],
+    },
+    "cudawarping": {
+        "mandatory_options": ["with_cuda", "imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "opencv_cudev", "?ipp"],
+    },
+    "cudev": {
+        "no_option": True,
+        "built_with": "with_cuda",
+        "requires": ["?ipp"],
+    },
+    "cvv": {
+        "mandatory_options": ["with_qt", "features2d", "imgproc"],
+        "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "qt::qt", "?ipp"],
+    },
+    "datasets": {
+        "mandatory_options": ["flann", "imgcodecs", "ml"],
+        "requires": ["opencv_core", "opencv_flann", "opencv_imgcodecs", "opencv_ml", "?ipp"],
+    },
+    "dnn_objdetect": {
+        "mandatory_options": ["dnn", "imgproc"],
+        "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc", "?ipp"],
+    },
+    "dnn_superres": {
+        "mandatory_options": ["dnn", "imgproc"],
+        "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc", "?ipp"],
+    },
+    "dpm": {
+        "mandatory_options": ["imgproc", "objdetect"],
+        "requires": ["opencv_core", "opencv_imgproc", "opencv_objdetect", "?ipp"],
+    },
+    "face": {
+        "mandatory_options": ["calib3d", "imgproc", "objdetect", "photo"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_objdetect", "opencv_photo", "?ipp"],
+    },
+    "freetype": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "freetype::freetype", "harfbuzz::harfbuzz", "?ipp"],
+    },
+    "fuzzy": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "hdf": {
+        "requires": ["opencv_core", "hdf5::hdf5", "?ipp"],
+    },
+    "hfs": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "img_hash": {
+        "is_part_of_world": False,
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "intensity_transform": {
+        "requires": ["opencv_core", "?ipp"],
+    },
+    "line_descriptor": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_imgproc", "?ipp"],
+    },
+    "mcc": {
+        "mandatory_options": ["calib3d", "dnn", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_dnn", "opencv_imgproc", "?ipp"],
+    },
+    "optflow": {
+        "mandatory_options": ["calib3d", "flann", "imgcodecs", "imgproc", "video", "ximgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_flann", "opencv_imgcodecs", "opencv_imgproc",
+                     "opencv_video", "opencv_ximgproc", "?ipp"],
+    },
+    "ovis": {
+        "mandatory_options": ["calib3d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "ogre::ogre", "?ipp"],
+    },
+    "phase_unwrapping": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "plot": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "quality": {
+        "mandatory_options": ["imgproc", "ml"],
+        "requires": ["opencv_core", "opencv_imgproc", "opencv_ml", "?ipp"],
+    },
+    "rapid": {
+        "mandatory_options": ["calib3d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "?ipp"],
+    },
+    "reg": {
+        "mandatory_options": ["imgproc"],
+        "requires": ["opencv_core", "opencv_imgproc", "?ipp"],
+    },
+    "rgbd": {
+        "mandatory_options": ["calib3d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "?eigen", "?ipp"],
+    },
+    "saliency": {
+        "mandatory_options": ["features2d", "imgproc"],
+        "requires": ["opencv_features2d", "opencv_imgproc", "?ipp"],
+    },
+    "sfm": {
+        "is_part_of_world": False,
+        "mandatory_options": ["with_eigen", "calib3d", "features2d", "imgcodecs", "xfeatures2d"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgcodecs", "opencv_xfeatures2d",
+                     "correspondence", "multiview", "numeric", "glog::glog", "gflags::gflags", "?eigen", "?ipp"],
+    },
+    "shape": {
+        "mandatory_options": ["calib3d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "?ipp"],
+    },
+    "stereo": {
+        "mandatory_options": ["features2d", "imgproc", "tracking"],
+        "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "opencv_tracking", "?ipp"],
+    },
+    "structured_light": {
+        "mandatory_options": ["calib3d", "imgproc", "phase_unwrapping"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_phase_unwrapping", "?ipp"],
+    },
+    "superres": {
+        "mandatory_options": ["imgproc", "video", "optflow"],
+        "requires": ["opencv_imgproc", "opencv_video", "opencv_optflow", "?opencv_videoio", "?ipp",
+                     "?opencv_cudaarithm", "?opencv_cudafilters", "?opencv_cudawarping", "?opencv_cudaimgproc",
+                     "?opencv_cudaoptflow", "?opencv_cudacodec"],
+    },
+    "surface_matching": {
+        "mandatory_options": ["flann"],
+        "requires": ["opencv_core", "opencv_flann", "?ipp"],
+    },
+    "text": {
+        "mandatory_options": ["dnn", "features2d", "imgproc", "ml"],
+        "requires": ["opencv_core", "opencv_dnn", "opencv_features2d", "opencv_imgproc", "opencv_ml",
+                     "?tesseract", "?ipp"],
+    },
+    "tracking": {
+        "mandatory_options": ["imgproc", "video"],
+        "requires": ["opencv_core", "opencv_imgproc", "opencv_video", "?opencv_dnn", "?ipp"],
+    },
+    "videostab": {
+        "mandatory_options": ["calib3d", "features2d", "imgproc", "photo", "video"],
+        "requires": ["opencv_calib3d", "opencv_features2d", "opencv_imgproc", "opencv_photo", "opencv_video",
+                     "?opencv_videoio", "?ipp", "?opencv_cudawarping", "?opencv_cudaoptflow"],
+    },
+    "viz": {
+        "requires": ["opencv_core", "vtk::vtk", "?ipp"],
+    },
+    "wechat_qrcode": {
+        "mandatory_options": ["dnn", "imgproc"],
+        "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc", "?ipp"],
+    },
+    "xfeatures2d": {
+        "mandatory_options": ["calib3d", "features2d", "imgproc"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgproc", "?ipp", "?opencv_cudaarithm"],
+    },
+    "ximgproc": {
+        "mandatory_options": ["calib3d", "imgcodecs", "imgproc", "video"],
+        "requires": ["opencv_core", "opencv_calib3d", "opencv_imgcodecs", "opencv_imgproc", "opencv_video",
+                     "?eigen", "?ipp"],
+    },
+    "xobjdetect": {
+        "mandatory_options": ["imgcodecs", "imgproc", "objdetect"],
+        "requires": ["opencv_core", "opencv_imgcodecs", "opencv_imgproc", "opencv_objdetect", "?ipp"],
+    },
+    "xphoto": {
+        "mandatory_options": ["imgproc", "photo"],
+        "requires": ["opencv_core", "opencv_imgproc", "opencv_photo", "?ipp"],
+    },
+    # Extra targets (without prefix in their target & lib name)
+    "ippiw": {
+        "is_part_of_world": False,
+        "no_option": True,
+        "built_with": "ippiw",
+    },
+    "numeric": {
+        "is_part_of_world": False,
+        "no_option": True,
+        "built_with": "sfm",
+        "requires": ["?eigen", "?ipp"],
+    },
+    "correspondence": {
+        "is_part_of_world": False,
+        "no_option": True,
+        "built_with": "sfm",
+        "requires": ["opencv_imgcodecs", "multiview", "glog::glog", "?eigen", "?ipp"],
+    },
+    "multiview": {
+        "is_part_of_world": False,
+        "no_option": True,
+        "built_with": "sfm",
+        "requires": ["numeric", "glog::glog", "?eigen", "?ipp"],
+    },
+}
+
+# Changes of OPENCV_MODULES in some versions: (first version, version after the last one, module, field, values)
+OPENCV_MODULES_CHANGES = (
+    ("4.3.0", None, "gapi", "requires", ["?opencv_video"]),
+    ("4.5.2", None, "gapi", "requires", ["?opencv_calib3d"]),
+    ("4.5.4", None, "objdetect", "requires", ["?opencv_dnn"]),
+    ("4.5.1", None, "video", "requires", ["?opencv_dnn"]),
+    ("4.4.0", None, "intensity_transform", "mandatory_options", ["imgproc"]),
+    ("4.4.0", None, "intensity_transform", "requires", ["opencv_imgproc"]),
+    (None, "4.3.0", "stereo", "mandatory_options", ["calib3d", "video"]),
+    (None, "4.3.0", "stereo", "requires", ["opencv_calib3d", "opencv_video"]),
+    ("4.7.0", None, "aruco", "mandatory_options", ["objdetect"]),
+    ("4.7.0", None, "aruco", "requires", ["opencv_objdetect"]),
+    ("4.7.0", None, "cudacodec", "mandatory_options", ["cudaarithm", "cudawarping"]),
+    ("4.7.0", None, "cudacodec", "requires", ["opencv_cudaarithm", "opencv_cudawarping"]),
+    ("4.7.0", None, "wechat_qrcode", "mandatory_options", ["objdetect"]),
+    ("4.7.0", None, "wechat_qrcode", "requires", ["opencv_objdetect"]),
+    (None, "4.7.0", "cudacodec", "requires", ["opencv_cudev"]),
+    (None, "4.8.0", "dnn", "mandatory_options", ["with_protobuf"]),
+)
+
+# {version: (OPENCV_MODULES of the version, its modules sorted so that every module comes before its mandatory options)}
+_opencv_modules_graphs = {}
+
+
+def _opencv_modules_graph(version):
+    if version not in _opencv_modules_graphs:
+        modules = {name: dict(values) for name, values in OPENCV_MODULES.items()}
+        for first, after_last, module, field, values in OPENCV_MODULES_CHANGES:
+            if (first is None or Version(version) >= first) and (after_last is None or Version(version) < after_last):
+                modules[module][field] = modules[module].get(field, []) + values
+
+        order = []
+        visited = set()
+
+        def visit(module, visiting):
+            # Depth first: a module is appended after all its mandatory options, the order is reversed below
+            if module in visiting:
+                raise ConanException(f"Cycle in the mandatory options of opencv modules: {' -> '.join(visiting + [module])}")
+            if module not in visited:
+                visited.add(module)
+                for mandatory_option in modules.get(module, {}).get("mandatory_options", []):
+                    visit(mandatory_option, visiting + [module])
+                if module in modules:
+                    order.append(module)
+
+        for module in modules:
+            visit(module, [])
+        _opencv_modules_graphs[version] = (modules, order[::-1])
+    return _opencv_modules_graphs[version]
+
 class OpenCVConan(ConanFile):
     name = "opencv"
     license = "Apache-2.0"
@@ -351,8 +758,14 @@ class OpenCVConan(ConanFile):
             if not self._has_with_wayland_option:
                 self.options.with_gtk = True
 
+    @property
+    def _opencv_modules_graph(self):
+        """ (modules of this version, as in OPENCV_MODULES, sorted so that a module comes before its mandatory options) """
+        return _opencv_modules_graph(str(self.version))
+
     @property
     def _opencv_modules(self):
+        """ OPENCV_MODULES of this version evaluated for the final options and settings of this instance """
         def imageformats_deps():
             components = []
             if self.options.get_safe("with_avif"):
@@ -379,18 +792,6 @@ class OpenCVConan(ConanFile):
                 components.append("gdcm::gdcm")
             return components
 
-        def eigen():
-            return ["eigen::eigen"] if self.options.with_eigen else []
-
-        def ffmpeg():
-            components = []
-            if self.options.get_safe("with_ffmpeg"):
-                components = ["ffmpeg::avcodec", "ffmpeg::avformat", "ffmpeg::avutil", "ffmpeg::swscale"]
-            return components
-
-        def gtk():
-            return ["gtk::gtk"] if self.options.get_safe("with_gtk") else []
-
         def ipp():
             if self.options.with_ipp == "intel-ipp":
                 return ["intel-ipp::intel-ipp"]
@@ -398,562 +799,98 @@ class OpenCVConan(ConanFile):
                 return ["ippiw"]
             return []
 
-        def parallel():
-            return ["onetbb::onetbb"] if self.options.parallel == "tbb" else []
-
-        def protobuf():
-            return ["protobuf::protobuf"] if self.options.get_safe("with_protobuf") else []
-
-        def qt():
-            return ["qt::qt"] if self.options.get_safe("with_qt") else []
-
-        def quirc():
-            return ["quirc::quirc"] if self.options.get_safe("with_quirc") else []
-
-        def tesseract():
-            return ["tesseract::tesseract"] if self.options.get_safe("with_tesseract") else []
-
-        def vulkan():
-            return ["vulkan-headers::vulkan-headers"] if self.options.get_safe("with_vulkan") else []
-
-        def wayland():
-            return ["wayland::wayland-client", "wayland::wayland-cursor"] if self.options.get_safe("with_wayland") else []
-
-        def xkbcommon():
-            return ["xkbcommon::libxkbcommon"] if self.options.get_safe("with_wayland") else []
-
-        def opencv_calib3d():
-            return ["opencv_calib3d"] if self.options.calib3d else []
-
-        def opencv_cudaarithm():
-            return ["opencv_cudaarithm"] if self.options.cudaarithm else []
-
-        def opencv_cudacodec():
-            return ["opencv_cudacodec"] if self.options.cudacodec else []
-
-        def opencv_cudafeatures2d():
-            return ["opencv_cudafeatures2d"] if self.options.cudafeatures2d else []
-
-        def opencv_cudafilters():
-            return ["opencv_cudafilters"] if self.options.cudafilters else []
-
-        def opencv_cudaimgproc():
-            return ["opencv_cudaimgproc"] if self.options.cudaimgproc else []
-
-        def opencv_cudalegacy():
-            return ["opencv_cudalegacy"] if self.options.cudalegacy else []
-
-        def opencv_cudaoptflow():
-            return ["opencv_cudaoptflow"] if self.options.cudaoptflow else []
-
-        def opencv_cudawarping():
-            return ["opencv_cudawarping"] if self.options.cudawarping else []
-
-        def opencv_dnn():
-            return ["opencv_dnn"] if self.options.dnn else []
-
-        def opencv_flann():
-            return ["opencv_flann"] if self.options.flann else []
-
-        def opencv_imgcodecs():
-            return ["opencv_imgcodecs"] if self.options.imgcodecs else []
-
-        def opencv_imgproc():
-            return ["opencv_imgproc"] if self.options.imgproc else []
-
-        def opencv_objdetect():
-            return ["opencv_objdetect"] if self.options.objdetect else []
-
-        def opencv_video():
-            return ["opencv_video"] if self.options.video else []
-
-        def opencv_videoio():
-            return ["opencv_videoio"] if self.options.videoio else []
-
-        def opencv_xfeatures2d():
-            return ["opencv_xfeatures2d"] if self.options.xfeatures2d else []
-
-        opencv_modules = {
-            # Main modules
-            "calib3d": {
-                "is_built": self.options.calib3d,
-                "mandatory_options": ["features2d", "flann", "imgproc"],
-                "requires": ["opencv_core", "opencv_features2d", "opencv_flann", "opencv_imgproc"] + eigen() + ipp(),
-            },
-            "core": {
-                "is_built": True,
-                "no_option": True,
-                "requires": ["zlib::zlib"] + parallel() + eigen() + ipp(),
-                "system_libs": [
-                    (self.settings.os == "Android", ["dl", "m", "log"]),
-                    (self.settings.os == "FreeBSD", ["m", "pthread"]),
-                    (self.settings.os == "Linux", ["dl", "m", "pthread", "rt"]),
-                ],
-                "frameworks": [
-                    (self.settings.os == "Macos" and self.options.get_safe("with_opencl"), ["OpenCL"]),
-                ],
-            },
-            "dnn": {
-                "is_built": self.options.dnn,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + protobuf() + vulkan() + ipp(),
-            },
-            "features2d": {
-                "is_built": self.options.features2d,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + opencv_flann() + eigen() + ipp(),
-            },
-            "flann": {
-                "is_built": self.options.flann,
-                "requires": ["opencv_core"] + ipp(),
-            },
-            "gapi": {
-                "is_built": self.options.gapi,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc", "ade::ade"],
-                "system_libs": [
-                    (self.settings.os == "Windows", ["ws2_32", "wsock32"]),
-                ],
-            },
-            "highgui": {
-                "is_built": self.options.highgui,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + opencv_imgcodecs() +
-                            opencv_videoio() + gtk() + qt() + xkbcommon() + wayland() + ipp(),
-                "system_libs": [
-                    (self.settings.os == "Windows", ["comctl32", "gdi32", "ole32", "setupapi", "ws2_32", "vfw32"]),
-                ],
-                "frameworks": [
-                    (self.settings.os == "Macos", ["Cocoa"]),
-                ],
-            },
-            "imgcodecs": {
-                "is_built": self.options.imgcodecs,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc", "zlib::zlib"] + imageformats_deps() + ipp(),
-                "frameworks": [
-                    (is_apple_os(self), ["CoreFoundation", "CoreGraphics"]),
-                    (self.settings.os == "iOS", ["UIKit"]),
-                    (self.settings.os == "Macos", ["AppKit"]),
-                ],
-            },
-            "imgproc": {
-                "is_built": self.options.imgproc,
-                "requires": ["opencv_core"] + ipp(),
-            },
-            "ml": {
-                "is_built": self.options.ml,
-                "requires": ["opencv_core"] + ipp(),
-            },
-            "objdetect": {
-                "is_built": self.options.objdetect,
-                "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + quirc() + ipp(),
-            },
-            "photo": {
-                "is_built": self.options.photo,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + opencv_cudaarithm() + opencv_cudaimgproc() + ipp(),
-            },
-            "stitching": {
-                "is_built": self.options.stitching,
-                "mandatory_options": ["calib3d", "features2d", "flann", "imgproc"],
-                "requires": ["opencv_calib3d", "opencv_features2d", "opencv_flann", "opencv_imgproc"] +
-                            opencv_xfeatures2d() + opencv_cudaarithm() + opencv_cudawarping() +
-                            opencv_cudafeatures2d() + opencv_cudalegacy() + opencv_cudaimgproc() + eigen() + ipp(),
-            },
-            "video": {
-                "is_built": self.options.video,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + opencv_calib3d() + ipp(),
-            },
-            "videoio": {
-                "is_built": self.options.videoio,
-                "mandatory_options": ["imgcodecs", "imgproc"],
-                "requires": ["opencv_imgcodecs", "opencv_imgproc"] + ffmpeg() + ipp(),
-                "system_libs": [
-                    (self.settings.os == "Android" and int(str(self.settings.os.api_level)) > 20, ["mediandk"]),
-                ],
-                "frameworks": [
-                    (is_apple_os(self), ["Accelerate", "AVFoundation", "CoreGraphics", "CoreMedia", "CoreVideo", "QuartzCore"]),
-                    (self.settings.os == "iOS", ["CoreImage", "UIKit"]),
-                    (self.settings.os == "Macos", ["Cocoa"]),
-                ],
-            },
-            # Extra modules
-            "alphamat": {
-                "is_built": self.options.get_safe("alphamat"),
-                "mandatory_options": ["with_eigen", "imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "aruco": {
-                "is_built": self.options.aruco,
-                "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp(),
-            },
-            "barcode": {
-                "is_built": self.options.get_safe("barcode"),
-                "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
-            },
-            "bgsegm": {
-                "is_built": self.options.bgsegm,
-                "mandatory_options": ["calib3d", "imgproc", "video"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_video"] + ipp(),
-            },
-            "bioinspired": {
-                "is_built": self.options.bioinspired,
-                "requires": ["opencv_core"] + ipp(),
-            },
-            "ccalib": {
-                "is_built": self.options.ccalib,
-                "mandatory_options": ["calib3d", "features2d", "highgui", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_highgui", "opencv_imgproc"] + ipp(),
-            },
-            "cudaarithm": {
-                "is_built": self.options.cudaarithm,
-                "mandatory_options": ["with_cuda"],
-                "requires": ["opencv_core", "opencv_cudev"] + ipp(),
-            },
-            "cudabgsegm": {
-                "is_built": self.options.cudabgsegm,
-                "mandatory_options": ["with_cuda", "video"],
-                "requires": ["opencv_video"] + ipp(),
-            },
-            "cudacodec": {
-                "is_built": self.options.cudacodec,
-                "mandatory_options": ["with_cuda", "videoio"],
-                "requires": ["opencv_core", "opencv_videoio"] + ipp(),
-            },
-            "cudafeatures2d": {
-                "is_built": self.options.cudafeatures2d,
-                "mandatory_options": ["with_cuda", "features2d", "cudafilters", "cudawarping"],
-                "requires": ["opencv_features2d", "opencv_cudafilters", "opencv_cudawarping"] + ipp(),
-            },
-            "cudafilters": {
-                "is_built": self.options.cudafilters,
-                "mandatory_options": ["with_cuda", "imgproc", "cudaarithm"],
-                "requires": ["opencv_imgproc", "opencv_cudaarithm"] + ipp(),
-            },
-            "cudaimgproc": {
-                "is_built": self.options.cudaimgproc,
-                "mandatory_options": ["with_cuda", "imgproc"],
-                "requires": ["opencv_imgproc", "opencv_cudev"] + opencv_cudaarithm() + opencv_cudafilters() + ipp(),
-            },
-            "cudalegacy": {
-                "is_built": self.options.cudalegacy,
-                "mandatory_options": ["with_cuda", "video"],
-                "requires": ["opencv_core", "opencv_video"] + opencv_calib3d() + opencv_imgproc() + opencv_objdetect() +
-                            opencv_cudaarithm() + opencv_cudafilters() + opencv_cudaimgproc() + ipp(),
-            },
-            "cudaobjdetect": {
-                "is_built": self.options.cudaobjdetect,
-                "mandatory_options": ["with_cuda", "objdetect", "cudaarithm", "cudawarping"],
-                "requires": ["opencv_objdetect", "opencv_cudaarithm", "opencv_cudawarping"] + opencv_cudalegacy() + ipp(),
-            },
-            "cudaoptflow": {
-                "is_built": self.options.cudaoptflow,
-                "mandatory_options": ["with_cuda", "video", "cudaarithm", "cudaimgproc", "cudawarping", "optflow"],
-                "requires": ["opencv_video", "opencv_cudaarithm", "cudaimgproc", "opencv_cudawarping",
-                             "opencv_optflow"] + opencv_cudalegacy() + ipp(),
-            },
-            "cudastereo": {
-                "is_built": self.options.cudastereo,
-                "mandatory_options": ["with_cuda", "calib3d"],
-                "requires": ["opencv_calib3d", "opencv_cudev"] + ipp(),
-            },
-            "cudawarping": {
-                "is_built": self.options.cudawarping,
-                "mandatory_options": ["with_cuda", "imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_cudev"] + ipp(),
-            },
-            "cudev": {
-                "is_built": self.options.with_cuda,
-                "no_option": True,
-                "requires": ipp(),
-            },
-            "cvv": {
-                "is_built": self.options.cvv,
-                "mandatory_options": ["with_qt", "features2d", "imgproc"],
-                "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "qt::qt"] + ipp(),
-            },
-            "datasets": {
-                "is_built": self.options.datasets,
-                "mandatory_options": ["flann", "imgcodecs", "ml"],
-                "requires": ["opencv_core", "opencv_flann", "opencv_imgcodecs", "opencv_ml"] + ipp(),
-            },
-            "dnn_objdetect": {
-                "is_built": self.options.dnn_objdetect,
-                "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
-            },
-            "dnn_superres": {
-                "is_built": self.options.dnn_superres,
-                "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
-            },
-            "dpm": {
-                "is_built": self.options.dpm,
-                "mandatory_options": ["imgproc", "objdetect"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_objdetect"] + ipp(),
-            },
-            "face": {
-                "is_built": self.options.face,
-                "mandatory_options": ["calib3d", "imgproc", "objdetect", "photo"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_objdetect", "opencv_photo"] + ipp(),
-            },
-            "freetype": {
-                "is_built": self.options.freetype,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc", "freetype::freetype", "harfbuzz::harfbuzz"] + ipp(),
-            },
-            "fuzzy": {
-                "is_built": self.options.fuzzy,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "hdf": {
-                "is_built": self.options.hdf,
-                "requires": ["opencv_core", "hdf5::hdf5"] + ipp(),
-            },
-            "hfs": {
-                "is_built": self.options.hfs,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "img_hash": {
-                "is_built": self.options.img_hash,
-                "is_part_of_world": False,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "intensity_transform": {
-                "is_built": self.options.get_safe("intensity_transform"),
-                "requires": ["opencv_core"] + ipp(),
-            },
-            "line_descriptor": {
-                "is_built": self.options.line_descriptor,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_imgproc"] + ipp(),
-            },
-            "mcc": {
-                "is_built": self.options.get_safe("mcc"),
-                "mandatory_options": ["calib3d", "dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_dnn", "opencv_imgproc"] + ipp(),
-            },
-            "optflow": {
-                "is_built": self.options.optflow,
-                "mandatory_options": ["calib3d", "flann", "imgcodecs", "imgproc", "video", "ximgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_flann", "opencv_imgcodecs", "opencv_imgproc",
-                             "opencv_video", "opencv_ximgproc"] + ipp(),
-            },
-            "ovis": {
-                "is_built": self.options.ovis,
-                "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "ogre::ogre"] + ipp(),
-            },
-            "phase_unwrapping": {
-                "is_built": self.options.phase_unwrapping,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "plot": {
-                "is_built": self.options.plot,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "quality": {
-                "is_built": self.options.quality,
-                "mandatory_options": ["imgproc", "ml"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_ml"] + ipp(),
-            },
-            "rapid": {
-                "is_built": self.options.get_safe("rapid"),
-                "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp(),
-            },
-            "reg": {
-                "is_built": self.options.reg,
-                "mandatory_options": ["imgproc"],
-                "requires": ["opencv_core", "opencv_imgproc"] + ipp(),
-            },
-            "rgbd": {
-                "is_built": self.options.rgbd,
-                "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + eigen() + ipp(),
-            },
-            "saliency": {
-                "is_built": self.options.saliency,
-                "mandatory_options": ["features2d", "imgproc"],
-                "requires": ["opencv_features2d", "opencv_imgproc"] + ipp(),
-            },
-            "sfm": {
-                "is_built": self.options.sfm,
-                "is_part_of_world": False,
-                "mandatory_options": ["with_eigen", "calib3d", "features2d", "imgcodecs", "xfeatures2d"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgcodecs", "opencv_xfeatures2d",
-                             "correspondence", "multiview", "numeric", "glog::glog", "gflags::gflags"] + eigen() + ipp(),
-            },
-            "shape": {
-                "is_built": self.options.shape,
-                "mandatory_options": ["calib3d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc"] + ipp(),
-            },
-            "stereo": {
-                "is_built": self.options.stereo,
-                "mandatory_options": ["features2d", "imgproc", "tracking"],
-                "requires": ["opencv_core", "opencv_features2d", "opencv_imgproc", "opencv_tracking"] + ipp(),
-            },
-            "structured_light": {
-                "is_built": self.options.structured_light,
-                "mandatory_options": ["calib3d", "imgproc", "phase_unwrapping"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgproc", "opencv_phase_unwrapping"] + ipp(),
-            },
-            "superres": {
-                "is_built": self.options.get_safe("superres"),
-                "mandatory_options": ["imgproc", "video", "optflow"],
-                "requires": ["opencv_imgproc", "opencv_video", "opencv_optflow"] + opencv_videoio() + ipp() +
-                            opencv_cudaarithm() + opencv_cudafilters() + opencv_cudawarping() + opencv_cudaimgproc() +
-                            opencv_cudaoptflow() + opencv_cudacodec(),
-            },
-            "surface_matching": {
-                "is_built": self.options.surface_matching,
-                "mandatory_options": ["flann"],
-                "requires": ["opencv_core", "opencv_flann"] + ipp(),
-            },
-            "text": {
-                "is_built": self.options.text,
-                "mandatory_options": ["dnn", "features2d", "imgproc", "ml"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_features2d", "opencv_imgproc", "opencv_ml"] +
-                            tesseract() + ipp(),
-            },
-            "tracking": {
-                "is_built": self.options.tracking,
-                "mandatory_options": ["imgproc", "video"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_video"] + opencv_dnn() + ipp(),
-            },
-            "videostab": {
-                "is_built": self.options.videostab,
-                "mandatory_options": ["calib3d", "features2d", "imgproc", "photo", "video"],
-                "requires": ["opencv_calib3d", "opencv_features2d", "opencv_imgproc", "opencv_photo", "opencv_video"] +
-                            opencv_videoio() + ipp() + opencv_cudawarping() + opencv_cudaoptflow(),
-            },
-            "viz": {
-                "is_built": self.options.viz,
-                "requires": ["opencv_core", "vtk::vtk"] + ipp(),
-            },
-            "wechat_qrcode": {
-                "is_built": self.options.get_safe("wechat_qrcode"),
-                "mandatory_options": ["dnn", "imgproc"],
-                "requires": ["opencv_core", "opencv_dnn", "opencv_imgproc"] + ipp(),
-            },
-            "xfeatures2d": {
-                "is_built": self.options.xfeatures2d,
-                "mandatory_options": ["calib3d", "features2d", "imgproc"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_features2d", "opencv_imgproc"] + ipp() + opencv_cudaarithm(),
-            },
-            "ximgproc": {
-                "is_built": self.options.ximgproc,
-                "mandatory_options": ["calib3d", "imgcodecs", "imgproc", "video"],
-                "requires": ["opencv_core", "opencv_calib3d", "opencv_imgcodecs", "opencv_imgproc", "opencv_video"] +
-                            eigen() + ipp(),
-            },
-            "xobjdetect": {
-                "is_built": self.options.xobjdetect,
-                "mandatory_options": ["imgcodecs", "imgproc", "objdetect"],
-                "requires": ["opencv_core", "opencv_imgcodecs", "opencv_imgproc", "opencv_objdetect"] + ipp(),
-            },
-            "xphoto": {
-                "is_built": self.options.xphoto,
-                "mandatory_options": ["imgproc", "photo"],
-                "requires": ["opencv_core", "opencv_imgproc", "opencv_photo"] + ipp(),
-            },
-            # Extra targets (without prefix in their target & lib name)
-            "ippiw": {
-                "is_built": self.options.with_ipp == "opencv-icv" and not self.options.shared,
-                "is_part_of_world": False,
-                "no_option": True,
-            },
-            "numeric": {
-                "is_built": self.options.sfm,
-                "is_part_of_world": False,
-                "no_option": True,
-                "requires": eigen() + ipp(),
-            },
-            "correspondence": {
-                "is_built": self.options.sfm,
-                "is_part_of_world": False,
-                "no_option": True,
-                "requires": ["opencv_imgcodecs", "multiview", "glog::glog"] + eigen() + ipp(),
-            },
-            "multiview": {
-                "is_built": self.options.sfm,
-                "is_part_of_world": False,
-                "no_option": True,
-                "requires": ["numeric", "glog::glog"] + eigen() + ipp(),
-            },
+        # Conditional requirements of OPENCV_MODULES ("?<name>"), other than "?opencv_<module>"
+        optional_requires = {
+            "eigen": ["eigen::eigen"] if self.options.with_eigen else [],
+            "ffmpeg": ["ffmpeg::avcodec", "ffmpeg::avformat", "ffmpeg::avutil", "ffmpeg::swscale"]
+                      if self.options.get_safe("with_ffmpeg") else [],
+            "gtk": ["gtk::gtk"] if self.options.get_safe("with_gtk") else [],
+            "imageformats": imageformats_deps(),
+            "ipp": ipp(),
+            "parallel": ["onetbb::onetbb"] if self.options.parallel == "tbb" else [],
+            "protobuf": ["protobuf::protobuf"] if self.options.get_safe("with_protobuf") else [],
+            "qt": ["qt::qt"] if self.options.get_safe("with_qt") else [],
+            "quirc": ["quirc::quirc"] if self.options.get_safe("with_quirc") else [],
+            "tesseract": ["tesseract::tesseract"] if self.options.get_safe("with_tesseract") else [],
+            "vulkan": ["vulkan-headers::vulkan-headers"] if self.options.get_safe("with_vulkan") else [],
+            "wayland": ["wayland::wayland-client", "wayland::wayland-cursor"] if self.options.get_safe("with_wayland") else [],
+            "xkbcommon": ["xkbcommon::libxkbcommon"] if self.options.get_safe("with_wayland") else [],
+        }
+        # Conditions of the system_libs & frameworks of OPENCV_MODULES, and of the modules without option
+        conditions = {
+            "android": self.settings.os == "Android",
+            "android_mediandk": self.settings.os == "Android" and int(str(self.settings.os.api_level)) > 20,
+            "apple": is_apple_os(self),
+            "freebsd": self.settings.os == "FreeBSD",
+            "ios": self.settings.os == "iOS",
+            "ippiw": self.options.with_ipp == "opencv-icv" and not self.options.shared,
+            "linux": self.settings.os == "Linux",
+            "macos": self.settings.os == "Macos",
+            "macos_opencl": self.settings.os == "Macos" and self.options.get_safe("with_opencl"),
+            "sfm": self.options.sfm,
+            "windows": self.settings.os == "Windows",
+            "with_cuda": self.options.with_cuda,
         }
 
-        if Version(self.version) >= "4.3.0":
-            opencv_modules["gapi"].setdefault("requires", []).extend(opencv_video())
-        if Version(self.version) >= "4.5.2":
-            opencv_modules["gapi"].setdefault("requires", []).extend(opencv_calib3d())
-        if Version(self.version) >= "4.5.4":
-            opencv_modules["objdetect"].setdefault("requires", []).extend(opencv_dnn())
-        if Version(self.version) >= "4.5.1":
-            opencv_modules["video"].setdefault("requires", []).extend(opencv_dnn())
-        if Version(self.version) >= "4.4.0":
-            opencv_modules["intensity_transform"].setdefault("mandatory_options", []).append("imgproc")
-            opencv_modules["intensity_transform"].setdefault("requires", []).append("opencv_imgproc")
-        if Version(self.version) < "4.3.0":
-            opencv_modules["stereo"].setdefault("mandatory_options", []).extend(["calib3d", "video"])
-            opencv_modules["stereo"].setdefault("requires", []).extend(["opencv_calib3d", "opencv_video"])
-        if Version(self.version) >= "4.7.0":
-            opencv_modules["aruco"].setdefault("mandatory_options", []).append("objdetect")
-            opencv_modules["aruco"].setdefault("requires", []).append("opencv_objdetect")
-            opencv_modules["cudacodec"].setdefault("mandatory_options", []).extend(["cudaarithm", "cudawarping"])
-            opencv_modules["cudacodec"].setdefault("requires", []).extend(["opencv_cudaarithm", "opencv_cudawarping"])
-            opencv_modules["wechat_qrcode"].setdefault("mandatory_options", []).append("objdetect")
-            opencv_modules["wechat_qrcode"].setdefault("requires", []).append("opencv_objdetect")
-        else:
-            opencv_modules["cudacodec"].setdefault("requires", []).append("opencv_cudev")
-        if Version(self.version) < "4.8.0":
-            opencv_modules["dnn"].setdefault("mandatory_options", []).append("with_protobuf")
+        def requires(module_requires):
+            evaluated = []
+            for requirement in module_requires:
+                if not requirement.startswith("?"):
+                    evaluated.append(requirement)
+                elif requirement.startswith("?opencv_"):
+                    if self.options.get_safe(requirement[len("?opencv_"):]):
+                        evaluated.append(requirement[1:])
+                else:
+                    evaluated.extend(optional_requires[requirement[1:]])
+            return evaluated
 
+        opencv_modules = {}
+        for module, values in self._opencv_modules_graph[0].items():
+            if values.get("no_option"):
+                is_built = conditions[values["built_with"]] if "built_with" in values else True
+            else:
+                is_built = self.options.get_safe(module)
+            opencv_modules[module] = {
+                "is_built": is_built,
+                "is_part_of_world": values.get("is_part_of_world", True),
+                "requires": requires(values.get("requires", [])),
+                "system_libs": [(conditions[condition], libs) for condition, libs in values.get("system_libs", [])],
+                "frameworks": [(conditions[condition], libs) for condition, libs in values.get("frameworks", [])],
+            }
         return opencv_modules
 
-    def _get_mandatory_disabled_options(self, opencv_modules):
+    def _get_mandatory_disabled_options(self):
+        opencv_modules, sorted_modules = self._opencv_modules_graph
         direct_options_to_enable = {}
-        transitive_options_to_enable = {}
-
-        # Check which direct options have to be enabled
-        base_options = [option for option, values in opencv_modules.items()
-                        if not values.get("no_option") and self.options.get_safe(option)]
-        for base_option in base_options:
-            for mandatory_option in opencv_modules.get(base_option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
-                    direct_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
-
-        # Now traverse the graph to check which transitive options have to be enabled
-        def collect_transitive_options(base_option, option):
-            for mandatory_option in opencv_modules.get(option, {}).get("mandatory_options", []):
+        # {disabled option: enabled modules requiring it, directly or through other disabled options}
+        options_to_enable = {}
+
+        # Modules come before their mandatory options, so that the enabled modules requiring a disabled option
+        # are all known when its own mandatory options are visited
+        for option in sorted_modules:
+            values = opencv_modules[option]
+            if not self.options.get_safe(option):
+                base_options = options_to_enable.get(option)
+            elif not values.get("no_option"):
+                base_options = {option}
+            else:
+                base_options = None
+            if not base_options:
+                continue
+            for mandatory_option in values.get("mandatory_options", []):
                 if not self.options.get_safe(mandatory_option):
-                    if mandatory_option not in transitive_options_to_enable:
-                        transitive_options_to_enable[mandatory_option] = set()
-                        collect_transitive_options(base_option, mandatory_option)
-                    if base_option not in direct_options_to_enable.get(mandatory_option, set()):
-                        transitive_options_to_enable[mandatory_option].add(base_option)
-
-        for base_option in base_options:
-            collect_transitive_options(base_option, base_option)
+                    options_to_enable.setdefault(mandatory_option, set()).update(base_options)
+                    if option in base_options:
+                        direct_options_to_enable.setdefault(mandatory_option, set()).add(option)
 
         return {
             "direct": direct_options_to_enable,
-            "transitive": transitive_options_to_enable,
+            "transitive": {option: base_options - direct_options_to_enable.get(option, set())
+                           for option, base_options in options_to_enable.items()},
         }
 
-    def _solve_internal_dependency_graph(self, opencv_modules):
-        disabled_options = self._get_mandatory_disabled_options(opencv_modules)
+    def _solve_internal_dependency_graph(self):
+        disabled_options = self._get_mandatory_disabled_options()
         direct_options_to_enable = disabled_options["direct"]
         transitive_options_to_enable = disabled_options["transitive"]
 
@@ -1004,7 +941,7 @@ class OpenCVConan(ConanFile):
                         "cudaarithm", "cudabgsegm", "cudacodec", "cudafeatures2d", "cudafilters", "cudaimgproc",
                         "cudalegacy", "cudaobjdetect", "cudaoptflow", "cudastereo", "cudawarping",
                     ])
-                for option, values in self._opencv_modules.items():
+                for option, values in self._opencv_modules_graph[0].items():
                     if option not in filtered_options and not values.get("no_option"):
                         try:
                             if hasattr(self.options, option):
@@ -1028,7 +965,7 @@ class OpenCVConan(ConanFile):
             self.options.gapi = self.options.with_ade
 
         # Call this first before any further manipulation of options based on other options
-        self._solve_internal_dependency_graph(self._opencv_modules)
+        self._solve_internal_dependency_graph()
 
         if not self.options.dnn:
             self.options.rm_safe("dnn_cuda")
@@ -1162,8 +1099,8 @@ class OpenCVConan(ConanFile):
         del self.info.options.contrib_sfm
         del self.info.options.with_ade
 
-    def _check_mandatory_options(self, opencv_modules):
-        disabled_options = self._get_mandatory_disabled_options(opencv_modules)
+    def _check_mandatory_options(self):
+        disabled_options = self._get_mandatory_disabled_options()
         direct_disabled_mandatory_options = disabled_options["direct"]
         transitive_disabled_mandatory_options = disabled_options["transitive"]
 
@@ -1187,7 +1124,7 @@ class OpenCVConan(ConanFile):
             raise ConanInvalidConfiguration(message)
 
     def validate(self):
-        self._check_mandatory_options(self._opencv_modules)
+        self._check_mandatory_options()
         if self.settings.compiler.get_safe("cppstd"):
             check_min_cppstd(self, 11)
         if self.options.shared and is_msvc(self) and is_msvc_static_runtime(self):
@@ -1572,7 +1509,7 @@ class OpenCVConan(ConanFile):
         self._create_cmake_module_variables(os.path.join(self.package_folder, self._module_vars_rel_path))
 
         # TODO: to remove in conan v2 once cmake_find_package* generators removed
-        targets_mapping = {self._cmake_target(k): f"opencv::{self._cmake_target(k)}" for k in self._opencv_modules.keys()}
+        targets_mapping = {self._cmake_target(k): f"opencv::{self._cmake_target(k)}" for k in self._opencv_modules_graph[0]}
         if self.options.world:
             targets_mapping.update({"opencv_world": "opencv::opencv_world"})
         self._create_cmake_module_alias_targets(
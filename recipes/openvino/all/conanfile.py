@@ -4,12 +4,25 @@ from conan.tools.build import check_min_cppstd, cross_building
 from conan.tools.scm import Version
 from conan.tools.cmake import CMake, CMakeToolchain, CMakeDeps, cmake_layout
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rmdir
-import functools
 import os
 import yaml
 
 required_conan_version = ">=1.60.0 <2.0 || >=2.0.8"
 
+# Parsed YAML files shared by the instances of the recipe, not to be modified: {path: (mtime_ns, data)}
+_yaml_cache = {}
+
+
+def _load_yaml(path):
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        cached = _yaml_cache[path] = (mtime_ns, data)
+    return cached[1]
+
+
 class OpenvinoConan(ConanFile):
     name = "openvino"
 
@@ -70,13 +83,11 @@ class OpenvinoConan(ConanFile):
         return f"dependencies-{self.version}.yml"
 
     @property
-    @functools.lru_cache(1)
     def _dependencies_versions(self):
         dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
         if not os.path.isfile(dependencies_filepath):
             raise ConanException(f"Cannot find {dependencies_filepath}")
-        cached_dependencies = yaml.safe_load(open(dependencies_filepath, encoding='UTF-8'))
-        return cached_dependencies
+        return _load_yaml(dependencies_filepath)
 
     def _require(self, dependency):
         if dependency not in self._dependencies_versions:
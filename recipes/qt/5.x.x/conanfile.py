@@ -8,15 +8,28 @@ from conan.tools.files import chdir, copy, get, load, replace_in_file, rm, rmdir
 from conan.tools.gnu import PkgConfigDeps
 from conan.tools.microsoft import is_msvc, msvc_runtime_flag, is_msvc_static_runtime, VCVars
 from conan.tools.scm import Version
-import configparser
 import glob
 import itertools
+import json
 import os
 import textwrap
 import shutil
 
 required_conan_version = ">=1.60.0 <2 || >=2.0.5"
 
+# Parsed JSON files shared by the instances of the recipe, not to be modified: {path: (mtime_ns, data)}
+_json_cache = {}
+
+
+def _load_json(path):
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        cached = _json_cache[path] = (mtime_ns, data)
+    return cached[1]
+
 
 class QtConan(ConanFile):
     _submodules = ["qtsvg", "qtdeclarative", "qtactiveqt", "qtscript", "qtmultimedia", "qttools", "qtxmlpatterns",
@@ -129,7 +142,7 @@ class QtConan(ConanFile):
         return getattr(self, "settings_build", self.settings)
 
     def export(self):
-        copy(self, f"qtmodules{self.version}.conf", self.recipe_folder, self.export_folder)
+        copy(self, f"qtmodules{self.version}.json", self.recipe_folder, self.export_folder)
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -235,38 +248,22 @@ class QtConan(ConanFile):
         if self.options.multiconfiguration:
             del self.settings.build_type
 
-        config = configparser.ConfigParser()
-        config.read(os.path.join(self.recipe_folder, f"qtmodules{self.version}.conf"))
-        submodules_tree = {}
-        assert config.sections(), f"no qtmodules.conf file for version {self.version}"
-        for s in config.sections():
-            section = str(s)
-            assert section.startswith("submodule ")
-            assert section.count('"') == 2
-            modulename = section[section.find('"') + 1: section.rfind('"')]
-            status = str(config.get(section, "status"))
-            if status not in ("obsolete", "ignore"):
-                submodules_tree[modulename] = {"status": status,
-                                "path": str(config.get(section, "path")), "depends": []}
-                if config.has_option(section, "depends"):
-                    submodules_tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
-
-        for m in submodules_tree:
-            assert m in ["qtbase", "qtqa", "qtrepotools"] or m in self._submodules, "module %s is not present in recipe options : (%s)" % (m, ",".join(self._submodules))
+        # Compiled from qtmodules<version>.conf by linter/compile_qtmodules.py
+        modules = _load_json(os.path.join(self.recipe_folder, f"qtmodules{self.version}.json"))["modules"]
+        submodules_tree = {name: module for name, module in modules.items() if module["status"] not in ("obsolete", "ignore")}
+        for name in submodules_tree:
+            assert name in ["qtbase", "qtqa", "qtrepotools"] or name in self._submodules, "module %s is not present in recipe options : (%s)" % (name, ",".join(self._submodules))
 
         for m in self._submodules:
             if m not in submodules_tree:
                 delattr(self.options, m)
 
-        def _enablemodule(mod):
-            if mod != "qtbase":
-                setattr(self.options, mod, True)
-            for req in submodules_tree[mod]["depends"]:
-                _enablemodule(req)
-
         for module in self._submodules:
             if self.options.get_safe(module):
-                _enablemodule(module)
+                # the module and all the modules it depends on, directly or not
+                for mod in [module] + submodules_tree[module]["all_depends"]:
+                    if mod != "qtbase":
+                        setattr(self.options, mod, True)
 
         for module in self._submodules:
             if module in self.options and not self.options.get_safe(module):
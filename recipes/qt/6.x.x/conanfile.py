@@ -1,5 +1,5 @@
-import configparser
 import glob
+import json
 import os
 import textwrap
 
@@ -16,6 +16,19 @@ from conan.errors import ConanInvalidConfiguration
 
 required_conan_version = ">=1.55.0"
 
+# Parsed JSON files shared by the instances of the recipe, not to be modified: {path: (mtime_ns, data)}
+_json_cache = {}
+
+
+def _load_json(path):
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        cached = _json_cache[path] = (mtime_ns, data)
+    return cached[1]
+
 
 class QtConan(ConanFile):
     _submodules = ["qtsvg", "qtdeclarative", "qttools", "qttranslations", "qtdoc",
@@ -128,35 +141,23 @@ class QtConan(ConanFile):
 
     @property
     def _get_module_tree(self):
-        if self._submodules_tree:
-            return self._submodules_tree
-        config = configparser.ConfigParser()
-        config.read(os.path.join(self.recipe_folder, f"qtmodules{self.version}.conf"))
-        self._submodules_tree = {}
-        assert config.sections(), f"no qtmodules.conf file for version {self.version}"
-        for s in config.sections():
-            section = str(s)
-            assert section.startswith("submodule ")
-            assert section.count('"') == 2
-            modulename = section[section.find('"') + 1: section.rfind('"')]
-            if modulename in ["qtbase", "qtqa", "qtrepotools"]:
-                continue
-            status = str(config.get(section, "status"))
-            if status not in ["obsolete", "ignore", "additionalLibrary"]:
-                assert modulename in self._submodules, f"module {modulename} not in self._submodules"
-                self._submodules_tree[modulename] = {"status": status,
-                                "path": str(config.get(section, "path")), "depends": []}
-                if config.has_option(section, "depends"):
-                    self._submodules_tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
-
-
+        if self._submodules_tree is None:
+            # Compiled from qtmodules<version>.conf by linter/compile_qtmodules.py
+            modules = _load_json(os.path.join(self.recipe_folder, f"qtmodules{self.version}.json"))["modules"]
+            self._submodules_tree = {}
+            for name, module in modules.items():
+                if name in ["qtbase", "qtqa", "qtrepotools"]:
+                    continue
+                if module["status"] not in ["obsolete", "ignore", "additionalLibrary"]:
+                    assert name in self._submodules, f"module {name} not in self._submodules"
+                    self._submodules_tree[name] = module
         return self._submodules_tree
 
     def export_sources(self):
         export_conandata_patches(self)
 
     def export(self):
-        copy(self, f"qtmodules{self.version}.conf", self.recipe_folder, self.export_folder)
+        copy(self, f"qtmodules{self.version}.json", self.recipe_folder, self.export_folder)
 
     def config_options(self):
         if self.settings.os not in ["Linux", "FreeBSD"]:
@@ -212,17 +213,13 @@ class QtConan(ConanFile):
         if self.options.multiconfiguration:
             del self.settings.build_type
 
-        def _enablemodule(mod):
-            if mod != "qtbase":
-                setattr(self.options, mod, True)
-                for req in self._get_module_tree[mod]["depends"]:
-                    _enablemodule(req)
-
         # enable all modules which are
         # - required by a module explicitely enabled by the consumer
         for module in self._get_module_tree:
             if getattr(self.options, module):
-                _enablemodule(module)
+                for mod in [module] + self._get_module_tree[module]["all_depends"]:
+                    if mod != "qtbase":
+                        setattr(self.options, mod, True)
 
         # disable all modules which are:
         # - not explicitely enabled by the consumer and
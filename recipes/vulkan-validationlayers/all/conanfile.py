@@ -7,7 +7,6 @@ from conan.tools.env import VirtualBuildEnv
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, mkdir, rename, replace_in_file, rm
 from conan.tools.gnu import PkgConfigDeps
 from conan.tools.scm import Version
-import functools
 import glob
 import os
 import shutil
@@ -15,6 +14,19 @@ import yaml
 
 required_conan_version = ">=1.55.0"
 
+# Parsed YAML files shared by the instances of the recipe, not to be modified: {path: (mtime_ns, data)}
+_yaml_cache = {}
+
+
+def _load_yaml(path):
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        cached = _yaml_cache[path] = (mtime_ns, data)
+    return cached[1]
+
 
 class VulkanValidationLayersConan(ConanFile):
     name = "vulkan-validationlayers"
@@ -43,13 +55,11 @@ class VulkanValidationLayersConan(ConanFile):
         return f"dependencies-{self.version}.yml"
 
     @property
-    @functools.lru_cache(1)
     def _dependencies_versions(self):
         dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependencies_filename)
         if not os.path.isfile(dependencies_filepath):
             raise ConanException(f"Cannot find {dependencies_filepath}")
-        cached_dependencies = yaml.safe_load(open(dependencies_filepath))
-        return cached_dependencies
+        return _load_yaml(dependencies_filepath)
 
     @property
     def _needs_wayland_for_build(self):